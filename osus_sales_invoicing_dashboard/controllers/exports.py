@@ -1,5 +1,5 @@
 # -*- coding: utf-8 -*-
-from odoo import http, fields
+from odoo import http
 from odoo.http import request
 import io
 import csv
@@ -50,23 +50,12 @@ class OsusDashboardExportController(http.Controller):
         rec = self._get_rec()
         if not rec:
             return request.not_found()
-        order_ids = request.env['sale.order'].sudo().search(rec._get_order_domain()).ids
         headers = ['Agent', 'Lines', 'Total', 'Paid', 'Outstanding', 'Status']
         rows = []
-        if order_ids:
-            groups = request.env['commission.line'].sudo().read_group(
-                [('sale_order_id', 'in', order_ids), ('commission_category', '=', 'internal')],
-                ['commission_amount', 'paid_amount', 'id:count', 'partner_id'],
-                ['partner_id']
-            )
-            for g in groups:
-                name = (g.get('partner_id') or ['', ''])[1] or 'Agent'
-                total = float(g.get('commission_amount', 0.0) or 0.0)
-                paid = float(g.get('paid_amount', 0.0) or 0.0)
-                out = max(total - paid, 0.0)
-                status = 'Paid' if out == 0 else ('Partial' if paid > 0 else 'Pending')
-                count = int(g.get('id_count', 0) or g.get('__count', 0) or 0)
-                rows.append([name, count, total, paid, out, status])
+        for c in rec._get_dataset()['commission_totals']:
+            out = max(c['total'] - c['paid'], 0.0)
+            status = 'Paid' if out == 0 else ('Partial' if c['paid'] > 0 else 'Pending')
+            rows.append([c['name'], c['count'], c['total'], c['paid'], out, status])
         return self._csv_response('agent_commissions.csv', headers, rows)
 
     @http.route(['/osus_dashboard/export/detailed_orders'], type='http', auth='user')
@@ -74,32 +63,13 @@ class OsusDashboardExportController(http.Controller):
         rec = self._get_rec()
         if not rec:
             return request.not_found()
-        today = fields.Date.context_today(request.env.user)
-        orders = request.env['sale.order'].sudo().search(rec._get_order_domain(), order='booking_date desc, id desc')
         headers = ['Order', 'Booking Date', 'Type', 'Customer', 'Salesperson', 'Status', 'Amount', 'Invoiced', 'Outstanding', 'Invoice Status', 'Payment Status', 'Days Since', 'Action Required']
         rows = []
-        for o in orders:
-            invs = o.invoice_ids.filtered(lambda inv: inv.move_type == 'out_invoice' and inv.state == 'posted')
-            invoiced = sum(invs.mapped('amount_total'))
-            outstanding = sum(invs.mapped('amount_residual'))
-            if invoiced and outstanding == 0:
-                pay_status = 'Paid'
-            elif invoiced and outstanding > 0:
-                overdue = any([inv.invoice_date_due and inv.invoice_date_due < today and (inv.amount_residual or 0) > 0 for inv in invs])
-                pay_status = 'Overdue' if overdue else 'Pending'
-            else:
-                pay_status = '-'
-            days_since = (today - (o.booking_date or today)).days if o.booking_date else 0
-            if o.invoice_status == 'to invoice':
-                action = 'Invoice Pending'
-            elif invoiced and outstanding > 0:
-                action = 'Payment Overdue' if 'Overdue' in pay_status else 'Payment Pending'
-            else:
-                action = '-'
+        for r in rec._get_detailed_order_rows():
             rows.append([
-                o.name, o.booking_date or '', o.sale_order_type_id.name or '', o.partner_id.name or '',
-                getattr(o, 'agent1_partner_id').name if hasattr(o, 'agent1_partner_id') and o.agent1_partner_id else '',
-                o.state, o.amount_total, invoiced, outstanding, o.invoice_status, pay_status, days_since, action
+                r['name'], r['booking_date'] or '', r['type'], r['customer'], r['salesperson'],
+                r['state'], r['amount'], r['invoiced'], r['outstanding'], r['invoice_status'],
+                r['pay_status'], r['days_since'], r['action']
             ])
         return self._csv_response('detailed_orders.csv', headers, rows)
 
@@ -108,36 +78,8 @@ class OsusDashboardExportController(http.Controller):
         rec = self._get_rec()
         if not rec:
             return request.not_found()
-        today = fields.Date.context_today(request.env.user)
-        domain = rec._get_invoice_domain(include_payment_filter=False, unpaid_only=True)
-        invs = request.env['account.move'].sudo().search(domain)
-        buckets = {
-            'current': {'label': 'Current (Not Due)', 'count': 0, 'amount': 0.0},
-            '1_30': {'label': '1-30 Days', 'count': 0, 'amount': 0.0},
-            '31_60': {'label': '31-60 Days', 'count': 0, 'amount': 0.0},
-            '61_90': {'label': '61-90 Days', 'count': 0, 'amount': 0.0},
-            '90_plus': {'label': '90+ Days Overdue', 'count': 0, 'amount': 0.0},
-        }
-        for inv in invs:
-            amt = inv.amount_residual or 0.0
-            due = inv.invoice_date_due
-            if not due or due >= today:
-                key = 'current'
-            else:
-                delta = (today - due).days
-                if delta <= 30:
-                    key = '1_30'
-                elif delta <= 60:
-                    key = '31_60'
-                elif delta <= 90:
-                    key = '61_90'
-                else:
-                    key = '90_plus'
-            buckets[key]['count'] += 1
-            buckets[key]['amount'] += amt
         headers = ['Aging Bucket', 'Count', 'Amount']
         rows = []
-        for key in ['current','1_30','31_60','61_90','90_plus']:
-            b = buckets[key]
+        for b in rec._get_invoice_aging_buckets():
             rows.append([b['label'], b['count'], b['amount']])
         return self._csv_response('invoice_aging.csv', headers, rows)
@@ -1,3 +1,4 @@
 # -*- coding: utf-8 -*-
 from . import sales_invoicing_dashboard
 from . import sale_order
+from . import account_move
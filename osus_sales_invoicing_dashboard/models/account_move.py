@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from odoo import api, fields, models
+
+
+class AccountMove(models.Model):
+    _inherit = 'account.move'
+
+    sale_order_ids = fields.Many2many(
+        'sale.order', 'osus_account_move_sale_order_rel', 'move_id', 'order_id',
+        string='Sale Orders',
+        compute='_compute_sale_order_ids',
+        store=True,
+        help='Sale orders invoiced by this move, used by the dashboard invoice filters',
+    )
+
+    @api.depends('line_ids.sale_line_ids')
+    def _compute_sale_order_ids(self):
+        for move in self:
+            move.sale_order_ids = move.line_ids.sale_line_ids.order_id
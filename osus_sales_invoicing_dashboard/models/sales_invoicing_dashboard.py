@@ -1,6 +1,23 @@
 # -*- coding: utf-8 -*-
 from odoo import api, fields, models
-from datetime import date
+from odoo.tools import SQL
+from datetime import date, timedelta
+
+# Invoice aging buckets: key, label, (min days overdue, max days overdue), None when open ended
+AGING_BUCKETS = [
+    ('current', 'Current (Not Due)', (None, 0)),
+    ('1_30', '1-30 Days', (1, 30)),
+    ('31_60', '31-60 Days', (31, 60)),
+    ('61_90', '61-90 Days', (61, 90)),
+    ('90_plus', '90+ Days Overdue', (91, None)),
+]
+
+
+class DatasetMemo:
+    """Datasets built during one dashboard refresh, by filter state"""
+
+    def __init__(self):
+        self.datasets = {}
 
 
 class SalesInvoicingDashboard(models.Model):
@@ -195,6 +212,9 @@ class SalesInvoicingDashboard(models.Model):
     chart_agent_performance = fields.Json(
         string='Agent Performance', compute='_compute_chart_agent_performance'
     )
+    chart_invoice_aging = fields.Json(
+        string='Invoice Aging Chart', compute='_compute_chart_invoice_aging'
+    )
 
     # Tabular data (HTML renders)
     table_order_type_html = fields.Html(string='Order Type Analysis', compute='_compute_table_order_type_html', sanitize=False)
@@ -242,13 +262,134 @@ class SalesInvoicingDashboard(models.Model):
             ('state', '=', 'posted'),
             ('move_type', 'in', ['out_invoice', 'out_refund']),
         ]
-        order_ids = []
         order_domain = self._get_order_domain()
-        if order_domain:
-            orders = self.env['sale.order'].search(order_domain)
-            order_ids = orders.ids
-            if order_ids:
-                domain.append(('line_ids.sale_line_ids.order_id', 'in', order_ids))
+        if order_domain and self.env['sale.order'].search_count(order_domain, limit=1):
+            domain.append(('sale_order_ids', 'any', order_domain))
+        if unpaid_only:
+            domain.append(('payment_state', 'in', ['not_paid', 'partial', 'in_payment']))
+        if include_payment_filter and self.payment_status_filter and self.payment_status_filter != 'all':
+            domain.append(('payment_state', '=', self.payment_status_filter))
+        return domain
+
+    # --------------------
+    # Shared dataset
+    # --------------------
+    def _with_shared_dataset(self):
+        """Records computing their fields from one dataset per filter state"""
+        if self.env.context.get('osus_dashboard_datasets'):
+            return self
+        return self.with_context(osus_dashboard_datasets=DatasetMemo())
+
+    def web_read(self, specification):
+        return super(SalesInvoicingDashboard, self._with_shared_dataset()).web_read(specification)
+
+    def onchange(self, values, field_names, fields_spec):
+        return super(SalesInvoicingDashboard, self._with_shared_dataset()).onchange(values, field_names, fields_spec)
+
+    def _get_dataset(self):
+        """Orders, invoices and commissions matching the filters. Built once per
+        refresh and shared by all the KPIs, charts and tables"""
+        self.ensure_one()
+        order_domain = self._get_order_domain()
+        memo = self.env.context.get('osus_dashboard_datasets')
+        if memo is None:
+            return self._build_dataset(order_domain)
+        key = (repr(order_domain), self.env.uid, self.env.su)
+        if key not in memo.datasets:
+            memo.datasets[key] = self._build_dataset(order_domain)
+        return memo.datasets[key]
+
+    def _build_dataset(self, order_domain):
+        """The ids of the orders are kept for the lookups per order, the queries
+        filter the orders and invoices with the domains, as sub-queries"""
+        order_ids = self.env['sale.order'].search(order_domain).ids
+        # Without matching orders, invoices aren't filtered by order
+        invoice_domain = [
+            ('state', '=', 'posted'),
+            ('move_type', 'in', ['out_invoice', 'out_refund']),
+        ]
+        if order_ids:
+            invoice_domain.append(('sale_order_ids', 'any', order_domain))
+        invoice_totals = {}
+        commission_totals = []
+        if order_ids:
+            # Posted customer invoices totals per order
+            invoice_totals = self._get_order_invoice_totals(
+                invoice_domain + [('move_type', '=', 'out_invoice')]
+            )
+            # Internal commissions (staff/agents) totals per agent
+            commission_groups = self.env['commission.line']._read_group(
+                [('sale_order_id', 'any', order_domain), ('commission_category', '=', 'internal')],
+                ['partner_id'],
+                ['__count', 'commission_amount:sum', 'paid_amount:sum'],
+            )
+            commission_totals = [
+                {
+                    'name': partner.display_name or 'Agent',
+                    'count': count,
+                    'total': total or 0.0,
+                    'paid': paid or 0.0,
+                }
+                for partner, count, total, paid in commission_groups
+            ]
+        return {
+            'order_ids': order_ids,
+            'order_domain': order_domain,
+            'invoice_domain': invoice_domain,
+            'invoice_totals': invoice_totals,
+            'commission_totals': commission_totals,
+        }
+
+    def _get_order_invoice_totals(self, invoice_domain):
+        """Invoiced, outstanding and paid amounts of the invoices per order. An
+        invoice of several orders is split between them in proportion to the
+        amount of its lines of each order, so it is only counted once"""
+        AccountMove = self.env['account.move']
+        # The query reads the tables, pending changes are written first
+        self.env['account.move.line'].flush_model(['price_total', 'sale_line_ids', 'move_id'])
+        self.env['sale.order.line'].flush_model(['order_id'])
+        AccountMove.flush_model(['amount_total', 'amount_residual', 'payment_state'] + [
+            leaf[0] for leaf in invoice_domain if isinstance(leaf, (list, tuple))
+        ])
+        invoice_query = AccountMove._search(invoice_domain)
+        self.env.cr.execute(SQL(
+            """
+            WITH order_shares AS (
+                SELECT line.move_id, sale_line.order_id, SUM(line.price_total) AS amount
+                  FROM account_move_line line
+                  JOIN sale_order_line_invoice_rel rel ON rel.invoice_line_id = line.id
+                  JOIN sale_order_line sale_line ON sale_line.id = rel.order_line_id
+                 WHERE line.move_id IN %s
+              GROUP BY line.move_id, sale_line.order_id
+            ), order_weights AS (
+                SELECT move_id, order_id, COALESCE(
+                           amount / NULLIF(SUM(amount) OVER (PARTITION BY move_id), 0),
+                           1.0 / COUNT(*) OVER (PARTITION BY move_id)
+                       ) AS weight
+                  FROM order_shares
+            )
+            SELECT order_weights.order_id,
+                   SUM(move.amount_total * order_weights.weight),
+                   SUM(move.amount_residual * order_weights.weight),
+                   SUM(move.amount_total * order_weights.weight) FILTER (WHERE move.payment_state = 'paid')
+              FROM order_weights
+              JOIN account_move move ON move.id = order_weights.move_id
+          GROUP BY order_weights.order_id
+            """,
+            invoice_query.subselect(),
+        ))
+        return {
+            order_id: {
+                'invoiced': float(invoiced or 0.0),
+                'outstanding': float(outstanding or 0.0),
+                'paid': float(paid or 0.0),
+            }
+            for order_id, invoiced, outstanding, paid in self.env.cr.fetchall()
+        }
+
+    def _get_dataset_invoice_domain(self, include_payment_filter=True, unpaid_only=False):
+        """Same as _get_invoice_domain, on the invoices of the dataset"""
+        domain = list(self._get_dataset()['invoice_domain'])
         if unpaid_only:
             domain.append(('payment_state', 'in', ['not_paid', 'partial', 'in_payment']))
         if include_payment_filter and self.payment_status_filter and self.payment_status_filter != 'all':
@@ -293,82 +434,90 @@ class SalesInvoicingDashboard(models.Model):
         'partner_id',
     )
     def _compute_metrics(self):
-        # Invalidate cache to ensure fresh data from DB on every computation
-        self.env.invalidate_all()
+        SaleOrder = self.env['sale.order']
+        AccountMove = self.env['account.move']
+        unpaid_states = ['not_paid', 'partial', 'in_payment']
         for rec in self:
-            order_domain = rec._get_order_domain()
-
-            matching_orders = self.env['sale.order'].search(order_domain)
-            order_ids = matching_orders.ids
+            dataset = rec._get_dataset()
+            order_ids = dataset['order_ids']
+            conversion_date = rec.booking_date_to or fields.Date.context_today(self)
 
             # Total booked sales (confirmed orders in range)
-            rec.total_booked_sales = sum(matching_orders.mapped('amount_total'))
-
-            # Posted invoices count and total amount (filtered by selected orders and payment status if provided)
-            posted_domain = [
-                ('state', '=', 'posted'),
-                ('move_type', 'in', ['out_invoice', 'out_refund']),
-            ]
-            if order_ids:
-                posted_domain.append(('line_ids.sale_line_ids.order_id', 'in', order_ids))
-            if rec.payment_status_filter and rec.payment_status_filter != 'all':
-                posted_domain.append(('payment_state', '=', rec.payment_status_filter))
-            
-            posted_invoices = self.env['account.move'].search(posted_domain)
-            rec.posted_invoice_count = len(posted_invoices)
-            rec.total_invoiced_amount = sum(posted_invoices.mapped('amount_total'))
-
-            # Orders to invoice count and total pending amount (respecting filters, but always focusing 'to invoice')
-            pending_domain = list(order_domain)
-            # If invoice_status_filter is 'all', focus on 'to invoice'
-            if rec.invoice_status_filter == 'all':
-                # Replace any existing invoice_status in order_domain
-                pending_domain = [d for d in pending_domain if not (isinstance(d, tuple) and d[0] == 'invoice_status')]
-                pending_domain.append(('invoice_status', '=', 'to invoice'))
-            
-            pending_orders = self.env['sale.order'].search(pending_domain)
-            rec.pending_to_invoice_order_count = len(pending_orders)
-            rec.total_pending_amount = sum(pending_orders.mapped('amount_to_invoice'))
-
-            # Unpaid invoices count (filtered by orders and payment status)
-            unpaid_domain = [
-                ('state', '=', 'posted'),
-                ('move_type', 'in', ['out_invoice', 'out_refund']),
-                ('payment_state', 'in', ['not_paid', 'partial', 'in_payment']),
+            order_groups = SaleOrder._read_group(
+                dataset['order_domain'], ['currency_id'], ['amount_total:sum']
+            )
+            rec.total_booked_sales = sum(
+                rec._convert_to_company_currency(currency, amount, conversion_date)
+                for currency, amount in order_groups
+            )
+            # Posted invoices count and total amount (filtered by selected orders and payment status if provided),
+            # unpaid invoices are read from the same groups
+            invoice_groups = AccountMove._read_group(
+                rec._get_dataset_invoice_domain(),
+                ['currency_id', 'payment_state'],
+                ['__count', 'amount_total:sum', 'amount_residual:sum'],
+            )
+            # Without payment status filter, unpaid invoices are the not fully paid ones
+            # With it, they are the invoices of the selected payment status
+            unpaid_groups = [
+                group for group in invoice_groups
+                if (rec.payment_status_filter and rec.payment_status_filter != 'all') or group[1] in unpaid_states
             ]
-            if order_ids:
-                unpaid_domain.append(('line_ids.sale_line_ids.order_id', 'in', order_ids))
-            if rec.payment_status_filter and rec.payment_status_filter != 'all':
-                # Override the payment_state list with the selected filter
-                unpaid_domain = [d for d in unpaid_domain if not (isinstance(d, tuple) and d[0] == 'payment_state')]
-                unpaid_domain.append(('payment_state', '=', rec.payment_status_filter))
-            unpaid_invoices = self.env['account.move'].search(unpaid_domain)
-            rec.unpaid_invoice_count = len(unpaid_invoices)
+            rec.posted_invoice_count = sum(count for __, __, count, __, __ in invoice_groups)
+            rec.total_invoiced_amount = sum(
+                rec._convert_to_company_currency(currency, amount, conversion_date)
+                for currency, __, __, amount, __ in invoice_groups
+            )
+            rec.unpaid_invoice_count = sum(count for __, __, count, __, __ in unpaid_groups)
 
             # Amount to collect / collected
-            rec.amount_to_collect = sum(unpaid_invoices.mapped('amount_residual'))
+            rec.amount_to_collect = sum(
+                rec._convert_to_company_currency(currency, residual, conversion_date)
+                for currency, __, __, __, residual in unpaid_groups
+            )
             rec.amount_collected = rec.total_invoiced_amount - rec.amount_to_collect
 
+            # Orders to invoice count and total pending amount (respecting filters, but always focusing 'to invoice')
+            # If invoice_status_filter is 'all', focus on 'to invoice', otherwise the
+            # orders are already filtered on their invoice status
+            pending_domain = dataset['order_domain']
+            if rec.invoice_status_filter == 'all':
+                pending_domain = pending_domain + [('invoice_status', '=', 'to invoice')]
+            # amount_to_invoice isn't stored, it is the total of the pending orders
+            # minus their invoiced amounts of the dataset
+            [(pending_order_ids, pending_total)] = SaleOrder._read_group(
+                pending_domain, [], ['id:array_agg', 'amount_total:sum']
+            )
+            pending_order_ids = pending_order_ids or []
+            rec.pending_to_invoice_order_count = len(pending_order_ids)
+            rec.total_pending_amount = (pending_total or 0.0) - sum(
+                dataset['invoice_totals'].get(order_id, {}).get('invoiced', 0.0)
+                for order_id in pending_order_ids
+            )
+
             # Commission due (commission_ax): pending/partial on confirmed/processed
             commission_due_total = 0.0
             if order_ids:
                 cl_domain = [
-                    ('sale_order_id', 'in', order_ids),
+                    ('sale_order_id', 'any', dataset['order_domain']),
                     ('state', 'in', ['confirmed', 'processed']),
                     ('payment_status', 'in', ['pending', 'partial']),
                 ]
-                CommissionLine = self.env['commission.line']
-                lines = CommissionLine.search(cl_domain)
-                company = self.env.company
-                for line in lines:
-                    # Convert outstanding_amount to company currency
-                    line_currency = line.currency_id or company.currency_id
-                    amount = line.outstanding_amount
-                    commission_due_total += line_currency._convert(
-                        amount, company.currency_id, company, rec.booking_date_to or fields.Date.context_today(self)
-                    )
+                commission_groups = self.env['commission.line']._read_group(
+                    cl_domain, ['currency_id'], ['outstanding_amount:sum']
+                )
+                commission_due_total = sum(
+                    rec._convert_to_company_currency(currency, amount, conversion_date)
+                    for currency, amount in commission_groups
+                )
             rec.commission_due = commission_due_total
 
+    def _convert_to_company_currency(self, currency, amount, conversion_date):
+        """Convert an aggregated amount of the currency to the company currency"""
+        company = self.env.company
+        currency = currency or company.currency_id
+        return currency._convert(amount or 0.0, company.currency_id, company, conversion_date)
+
     @api.depends(
         'sales_order_type_id',
         'booking_date_from',
@@ -376,10 +525,9 @@ class SalesInvoicingDashboard(models.Model):
         'invoice_status_filter',
     )
     def _compute_chart_sales_by_type(self):
-        self.env.invalidate_all()
         palette = ['#0060df', '#00a651', '#f0ad4e', '#d9534f', '#5bc0de', '#7b7b7b']
         for rec in self:
-            domain = rec._get_order_domain()
+            domain = rec._get_dataset()['order_domain']
             groups = self.env['sale.order'].read_group(
                 domain, ['amount_total'], ['sale_order_type_id'], orderby='amount_total DESC'
             )
@@ -410,13 +558,12 @@ class SalesInvoicingDashboard(models.Model):
         'invoice_status_filter',
     )
     def _compute_chart_booking_trend(self):
-        self.env.invalidate_all()
         palette = ['#0060df']
         for rec in self:
             labels = []
             data = []
             try:
-                domain = rec._get_order_domain()
+                domain = rec._get_dataset()['order_domain']
                 groups = self.env['sale.order'].read_group(
                     domain,
                     ['amount_total'],
@@ -460,10 +607,9 @@ class SalesInvoicingDashboard(models.Model):
         'partner_id',
     )
     def _compute_chart_payment_state(self):
-        self.env.invalidate_all()
         palette = ['#5bc0de', '#f0ad4e', '#d9534f', '#00a651']
         for rec in self:
-            domain = rec._get_invoice_domain(include_payment_filter=False, unpaid_only=False)
+            domain = rec._get_dataset_invoice_domain(include_payment_filter=False, unpaid_only=False)
             groups = self.env['account.move'].read_group(
                 domain,
                 ['amount_total', 'payment_state'],
@@ -498,7 +644,6 @@ class SalesInvoicingDashboard(models.Model):
             }
 
     def _compute_chart_sales_funnel(self):
-        self.env.invalidate_all()
         for rec in self:
             data = [
                 float(rec.total_booked_sales or 0.0),
@@ -517,9 +662,8 @@ class SalesInvoicingDashboard(models.Model):
             }
 
     def _compute_chart_top_customers(self):
-        self.env.invalidate_all()
         for rec in self:
-            domain = rec._get_invoice_domain(include_payment_filter=False, unpaid_only=True)
+            domain = rec._get_dataset_invoice_domain(include_payment_filter=False, unpaid_only=True)
             groups = self.env['account.move'].read_group(
                 domain, ['amount_residual', 'partner_id'], ['partner_id']
             )
@@ -539,30 +683,15 @@ class SalesInvoicingDashboard(models.Model):
             }
 
     def _compute_chart_agent_performance(self):
-        self.env.invalidate_all()
         for rec in self:
-            order_ids = self.env['sale.order'].search(rec._get_order_domain()).ids
             labels, total_vals, paid_vals, out_vals = [], [], [], []
-            if order_ids:
-                # Only internal commissions (staff/agents)
-                cl_domain = [('sale_order_id', 'in', order_ids), ('commission_category', '=', 'internal')]
-                groups = self.env['commission.line'].read_group(
-                    cl_domain,
-                    ['commission_amount', 'paid_amount', 'partner_id', 'currency_id'],
-                    ['partner_id']
-                )
-                company = self.env.company
-                for g in groups:
-                    partner = (g.get('partner_id') or ['', ''])
-                    name = partner[1] or 'Agent'
-                    labels.append(name)
-                    # Convert sums to company currency (approx: use first line currency if mixed)
-                    amt = float(g.get('commission_amount', 0.0) or 0.0)
-                    paid = float(g.get('paid_amount', 0.0) or 0.0)
-                    # No currency aggregation in read_group; fallback assumes company currency
-                    total_vals.append(amt)
-                    paid_vals.append(paid)
-                    out_vals.append(max(amt - paid, 0.0))
+            # Only internal commissions (staff/agents)
+            for c in rec._get_dataset()['commission_totals']:
+                labels.append(c['name'])
+                # No currency aggregation; sums are assumed in company currency
+                total_vals.append(c['total'])
+                paid_vals.append(c['paid'])
+                out_vals.append(max(c['total'] - c['paid'], 0.0))
             rec.chart_agent_performance = {
                 'labels': labels,
                 'datasets': [
@@ -572,52 +701,156 @@ class SalesInvoicingDashboard(models.Model):
                 ],
             }
 
+    def _compute_chart_invoice_aging(self):
+        palette = ['#00a651', '#5bc0de', '#f0ad4e', '#e67e22', '#d9534f']
+        for rec in self:
+            buckets = rec._get_invoice_aging_buckets()
+            rec.chart_invoice_aging = {
+                'labels': [b['label'] for b in buckets],
+                'datasets': [{
+                    'label': 'Outstanding',
+                    'data': [b['amount'] for b in buckets],
+                    'backgroundColor': palette,
+                    'borderColor': palette,
+                    'borderWidth': 1,
+                }],
+            }
+
     # --------------------
     # Helper dataset builders
     # --------------------
     def _get_order_type_rows(self):
-        domain = self._get_order_domain()
-        groups = self.env['sale.order'].read_group(
-            domain, ['amount_total', 'id:count'], ['sale_order_type_id']
+        dataset = self._get_dataset()
+        groups = self.env['sale.order']._read_group(
+            dataset['order_domain'],
+            ['sale_order_type_id', 'invoice_status'],
+            ['amount_total:sum', 'id:array_agg'],
         )
+        type_rows = {}
+        for order_type, invoice_status, amount, order_ids in groups:
+            row = type_rows.setdefault(order_type, {
+                'name': order_type.name or 'Unspecified',
+                'count': 0,
+                'total_sales': 0.0,
+                'to_invoice': 0.0,
+                'invoiced': 0.0,
+                'outstanding': 0.0,
+            })
+            row['count'] += len(order_ids)
+            row['total_sales'] += amount or 0.0
+            if invoice_status == 'to invoice':
+                row['to_invoice'] += amount or 0.0
+            for order_id in order_ids:
+                totals = dataset['invoice_totals'].get(order_id)
+                if totals:
+                    row['invoiced'] += totals['invoiced']
+                    row['outstanding'] += totals['outstanding']
         rows = []
-        for g in groups:
-            type_name = (g.get('sale_order_type_id') or ['', ''])[1] or 'Unspecified'
-            type_domain = list(domain)
-            if g.get('sale_order_type_id'):
-                type_domain.append(('sale_order_type_id', '=', g['sale_order_type_id'][0]))
-            else:
-                type_domain.append(('sale_order_type_id', '=', False))
-            orders = self.env['sale.order'].search(type_domain)
-            total_sales = sum(orders.mapped('amount_total'))
-            to_invoice = sum(orders.filtered(lambda o: o.invoice_status == 'to invoice').mapped('amount_total'))
-            invoices = orders.mapped('invoice_ids').filtered(lambda inv: inv.move_type == 'out_invoice' and inv.state == 'posted')
-            invoiced = sum(invoices.mapped('amount_total'))
-            outstanding = sum(invoices.mapped('amount_residual'))
-            collected = max(invoiced - outstanding, 0.0)
-            rate = (collected / invoiced * 100.0) if invoiced else 0.0
+        for row in type_rows.values():
+            collected = max(row['invoiced'] - row['outstanding'], 0.0)
+            rate = (collected / row['invoiced'] * 100.0) if row['invoiced'] else 0.0
             status = 'Good' if rate >= 90 else ('Attention' if rate >= 70 else 'Critical')
             color = 'success' if rate >= 90 else ('warning' if rate >= 70 else 'danger')
+            rows.append(dict(row, collected=collected, rate=rate, status=status, status_color=color))
+        return rows
+
+    def _get_detailed_order_rows(self, limit=None):
+        today = fields.Date.context_today(self)
+        dataset = self._get_dataset()
+        orders = self.env['sale.order'].search(
+            dataset['order_domain'], order='booking_date desc, id desc', limit=limit
+        )
+        # Posted customer invoices totals per order come with the dataset
+        overdue_order_ids = set()
+        if orders:
+            overdue_domain = dataset['invoice_domain'] + [
+                ('move_type', '=', 'out_invoice'),
+                ('invoice_date_due', '<', today),
+                ('amount_residual', '>', 0),
+            ]
+            if limit:
+                overdue_domain.append(('sale_order_ids', 'in', orders.ids))
+            overdue_order_ids = {
+                order.id for [order] in self.env['account.move']._read_group(overdue_domain, ['sale_order_ids'])
+            }
+        has_agent = 'agent1_partner_id' in self.env['sale.order']._fields
+        rows = []
+        for o in orders:
+            totals = dataset['invoice_totals'].get(o.id, {})
+            invoiced = totals.get('invoiced', 0.0)
+            outstanding = totals.get('outstanding', 0.0)
+            # payment status heuristic
+            if invoiced and outstanding == 0:
+                pay_status = 'Paid'
+            elif invoiced and outstanding > 0:
+                pay_status = 'Overdue' if o.id in overdue_order_ids else 'Pending'
+            else:
+                pay_status = '-'
+            days_since = (today - (o.booking_date or today)).days if o.booking_date else 0
+            if o.invoice_status == 'to invoice':
+                action = 'Invoice Pending'
+            elif invoiced and outstanding > 0:
+                action = 'Payment Overdue' if 'Overdue' in pay_status else 'Payment Pending'
+            else:
+                action = '-'
             rows.append({
-                'name': type_name,
-                'count': len(orders),
-                'total_sales': total_sales,
-                'to_invoice': to_invoice,
+                'name': o.name,
+                'booking_date': o.booking_date,
+                'type': o.sale_order_type_id.name or '',
+                'customer': o.partner_id.name or '',
+                'salesperson': (o.agent1_partner_id.name or '') if has_agent else '',
+                'state': o.state,
+                'amount': o.amount_total,
                 'invoiced': invoiced,
                 'outstanding': outstanding,
-                'collected': collected,
-                'rate': rate,
-                'status': status,
-                'status_color': color,
+                'invoice_status': o.invoice_status,
+                'pay_status': pay_status,
+                'days_since': days_since,
+                'action': action,
             })
         return rows
 
+    def _get_invoice_aging_buckets(self):
+        """Count and residual amount of the unpaid invoices per aging bucket,
+        computed with a single query, one FILTER aggregate per bucket"""
+        today = fields.Date.context_today(self)
+        AccountMove = self.env['account.move']
+        # The query reads the invoices, pending changes are written first
+        AccountMove.flush_model(['amount_residual', 'payment_state', 'invoice_date_due', 'state', 'move_type', 'sale_order_ids'])
+        query = AccountMove._where_calc(self._get_dataset_invoice_domain(include_payment_filter=False, unpaid_only=True))
+        AccountMove._apply_ir_rules(query, 'read')
+        residual = AccountMove._read_group_select('amount_residual:sum', query)
+        columns = []
+        for __, __, (min_days, max_days) in AGING_BUCKETS:
+            if min_days is None:
+                # Not due yet, or without due date
+                bucket_domain = ['|', ('invoice_date_due', '=', False), ('invoice_date_due', '>=', today)]
+            else:
+                bucket_domain = [('invoice_date_due', '<=', today - timedelta(days=min_days))]
+                if max_days is not None:
+                    bucket_domain.append(('invoice_date_due', '>=', today - timedelta(days=max_days)))
+            condition = AccountMove._where_calc(bucket_domain, active_test=False).where_clause
+            columns += [
+                SQL('COUNT(*) FILTER (WHERE %s)', condition),
+                SQL('%s FILTER (WHERE %s)', residual, condition),
+            ]
+        self.env.cr.execute(query.select(*columns))
+        row = self.env.cr.fetchone()
+        return [
+            {
+                'key': key,
+                'label': label,
+                'count': row[2 * index],
+                'amount': row[2 * index + 1] or 0.0,
+            }
+            for index, (key, label, __) in enumerate(AGING_BUCKETS)
+        ]
+
     def _fmt_money(self, amount):
         curr = self.env.company.currency_id
         return f"{curr.symbol or ''}{amount:,.2f}"
 
     def _compute_table_order_type_html(self):
-        self.env.invalidate_all()
         for rec in self:
             rows = rec._get_order_type_rows()
             html = [
@@ -673,9 +906,7 @@ class SalesInvoicingDashboard(models.Model):
             rec.table_order_type_html = ''.join(html)
 
     def _compute_table_agent_commission_html(self):
-        self.env.invalidate_all()
         for rec in self:
-            order_ids = self.env['sale.order'].search(rec._get_order_domain()).ids
             html = [
                 '<table class="table table-sm table-striped table-hover">',
                 '<thead><tr>',
@@ -686,32 +917,22 @@ class SalesInvoicingDashboard(models.Model):
             total_amount = 0.0
             total_paid = 0.0
             total_outstanding = 0.0
-            if order_ids:
-                groups = self.env['commission.line'].read_group(
-                    [('sale_order_id', 'in', order_ids), ('commission_category', '=', 'internal')],
-                    ['commission_amount', 'paid_amount', 'id:count', 'partner_id'],
-                    ['partner_id']
-                )
-                for g in groups:
-                    name = (g.get('partner_id') or ['', ''])[1] or 'Agent'
-                    total = float(g.get('commission_amount', 0.0) or 0.0)
-                    paid = float(g.get('paid_amount', 0.0) or 0.0)
-                    out = max(total - paid, 0.0)
-                    status = 'Paid' if out == 0 else ('Partial' if paid > 0 else 'Pending')
-                    color = 'success' if out == 0 else ('warning' if paid > 0 else 'danger')
-                    count = int(g.get('id_count', 0) or g.get('__count', 0) or 0)
-                    html.append('<tr>')
-                    html.append(f'<td>{name}</td>')
-                    html.append(f'<td>{count}</td>')
-                    html.append(f'<td>{rec._fmt_money(total)}</td>')
-                    html.append(f'<td>{rec._fmt_money(paid)}</td>')
-                    html.append(f'<td>{rec._fmt_money(out)}</td>')
-                    html.append(f'<td><span class="badge badge-{color}">{status}</span></td>')
-                    html.append('</tr>')
-                    total_lines += count
-                    total_amount += total
-                    total_paid += paid
-                    total_outstanding += out
+            for c in rec._get_dataset()['commission_totals']:
+                out = max(c['total'] - c['paid'], 0.0)
+                status = 'Paid' if out == 0 else ('Partial' if c['paid'] > 0 else 'Pending')
+                color = 'success' if out == 0 else ('warning' if c['paid'] > 0 else 'danger')
+                html.append('<tr>')
+                html.append(f'<td>{c["name"]}</td>')
+                html.append(f'<td>{c["count"]}</td>')
+                html.append(f'<td>{rec._fmt_money(c["total"])}</td>')
+                html.append(f'<td>{rec._fmt_money(c["paid"])}</td>')
+                html.append(f'<td>{rec._fmt_money(out)}</td>')
+                html.append(f'<td><span class="badge badge-{color}">{status}</span></td>')
+                html.append('</tr>')
+                total_lines += c['count']
+                total_amount += c['total']
+                total_paid += c['paid']
+                total_outstanding += out
             html.append('</tbody></table>')
             footer = [
                 '<tfoot><tr>',
@@ -727,10 +948,8 @@ class SalesInvoicingDashboard(models.Model):
             rec.table_agent_commission_html = ''.join(html)
 
     def _compute_table_detailed_orders_html(self):
-        self.env.invalidate_all()
-        today = fields.Date.context_today(self)
         for rec in self:
-            orders = self.env['sale.order'].search(rec._get_order_domain(), order='booking_date desc, id desc', limit=50)
+            rows = rec._get_detailed_order_rows(limit=50)
             html = [
                 '<table class="table table-sm table-striped table-hover">',
                 '<thead><tr>',
@@ -743,45 +962,26 @@ class SalesInvoicingDashboard(models.Model):
             tot_amount = 0.0
             tot_invoiced = 0.0
             tot_outstanding = 0.0
-            for o in orders:
-                invs = o.invoice_ids.filtered(lambda inv: inv.move_type == 'out_invoice' and inv.state == 'posted')
-                invoiced = sum(invs.mapped('amount_total'))
-                outstanding = sum(invs.mapped('amount_residual'))
-                # payment status heuristic
-                if invoiced and outstanding == 0:
-                    pay_status = 'Paid'
-                elif invoiced and outstanding > 0:
-                    # overdue check
-                    overdue = any([inv.invoice_date_due and inv.invoice_date_due < today and (inv.amount_residual or 0) > 0 for inv in invs])
-                    pay_status = 'Overdue' if overdue else 'Pending'
-                else:
-                    pay_status = '-'
-                days_since = (today - (o.booking_date or today)).days if o.booking_date else 0
-                if o.invoice_status == 'to invoice':
-                    action = 'Invoice Pending'
-                elif invoiced and outstanding > 0:
-                    action = 'Payment Overdue' if 'Overdue' in pay_status else 'Payment Pending'
-                else:
-                    action = '-'
+            for r in rows:
                 html.append('<tr>')
-                html.append(f'<td>{o.name}</td>')
-                html.append(f'<td>{o.booking_date or ""}</td>')
-                html.append(f'<td>{o.sale_order_type_id.name or ""}</td>')
-                html.append(f'<td>{o.partner_id.name or ""}</td>')
-                html.append(f'<td>{getattr(o, "agent1_partner_id").name if hasattr(o, "agent1_partner_id") and o.agent1_partner_id else ""}</td>')
-                html.append(f'<td>{o.state}</td>')
-                html.append(f'<td>{rec._fmt_money(o.amount_total)}</td>')
-                html.append(f'<td>{rec._fmt_money(invoiced)}</td>')
-                html.append(f'<td>{rec._fmt_money(outstanding)}</td>')
-                html.append(f'<td>{o.invoice_status}</td>')
-                html.append(f'<td>{pay_status}</td>')
-                html.append(f'<td>{days_since}</td>')
-                html.append(f'<td>{action}</td>')
+                html.append(f'<td>{r["name"]}</td>')
+                html.append(f'<td>{r["booking_date"] or ""}</td>')
+                html.append(f'<td>{r["type"]}</td>')
+                html.append(f'<td>{r["customer"]}</td>')
+                html.append(f'<td>{r["salesperson"]}</td>')
+                html.append(f'<td>{r["state"]}</td>')
+                html.append(f'<td>{rec._fmt_money(r["amount"])}</td>')
+                html.append(f'<td>{rec._fmt_money(r["invoiced"])}</td>')
+                html.append(f'<td>{rec._fmt_money(r["outstanding"])}</td>')
+                html.append(f'<td>{r["invoice_status"]}</td>')
+                html.append(f'<td>{r["pay_status"]}</td>')
+                html.append(f'<td>{r["days_since"]}</td>')
+                html.append(f'<td>{r["action"]}</td>')
                 html.append('</tr>')
                 tot_orders += 1
-                tot_amount += float(o.amount_total or 0.0)
-                tot_invoiced += float(invoiced or 0.0)
-                tot_outstanding += float(outstanding or 0.0)
+                tot_amount += float(r['amount'] or 0.0)
+                tot_invoiced += float(r['invoiced'] or 0.0)
+                tot_outstanding += float(r['outstanding'] or 0.0)
             html.append('</tbody></table>')
             footer = [
                 '<tfoot><tr>',
@@ -799,46 +999,16 @@ class SalesInvoicingDashboard(models.Model):
             rec.table_detailed_orders_html = ''.join(html)
 
     def _compute_table_invoice_aging_html(self):
-        self.env.invalidate_all()
-        today = fields.Date.context_today(self)
         for rec in self:
-            domain = rec._get_invoice_domain(include_payment_filter=False, unpaid_only=True)
-            invs = self.env['account.move'].search(domain)
-            buckets = {
-                'current': {'label': 'Current (Not Due)', 'count': 0, 'amount': 0.0},
-                '1_30': {'label': '1-30 Days', 'count': 0, 'amount': 0.0},
-                '31_60': {'label': '31-60 Days', 'count': 0, 'amount': 0.0},
-                '61_90': {'label': '61-90 Days', 'count': 0, 'amount': 0.0},
-                '90_plus': {'label': '90+ Days Overdue', 'count': 0, 'amount': 0.0},
-            }
-            total_amt = 0.0
-            total_count = 0
-            for inv in invs:
-                amt = inv.amount_residual or 0.0
-                total_amt += amt
-                due = inv.invoice_date_due
-                if not due or due >= today:
-                    key = 'current'
-                else:
-                    delta = (today - due).days
-                    if delta <= 30:
-                        key = '1_30'
-                    elif delta <= 60:
-                        key = '31_60'
-                    elif delta <= 90:
-                        key = '61_90'
-                    else:
-                        key = '90_plus'
-                buckets[key]['count'] += 1
-                buckets[key]['amount'] += amt
-                total_count += 1
+            buckets = rec._get_invoice_aging_buckets()
+            total_amt = sum(b['amount'] for b in buckets)
+            total_count = sum(b['count'] for b in buckets)
 
             html = [
                 '<table class="table table-sm table-striped table-hover">',
                 '<thead><tr><th>Aging Bucket</th><th>Count</th><th>Amount</th><th>% of Total</th></tr></thead><tbody>'
             ]
-            for key in ['current','1_30','31_60','61_90','90_plus']:
-                b = buckets[key]
+            for b in buckets:
                 pct = (b['amount'] / total_amt * 100.0) if total_amt else 0.0
                 html.append('<tr>')
                 html.append(f'<td>{b["label"]}</td>')
@@ -866,45 +1036,47 @@ class SalesInvoicingDashboard(models.Model):
         """Compute additional performance metrics"""
         for record in self:
             domain = record._get_order_domain()
-            
-            # Get all sales orders
-            orders = self.env['sale.order'].search(domain)
-            orders_count = len(orders)
-            
+            order_domain = record._get_dataset()['order_domain']
+
+            # Count and total of the orders per invoice status, without loading them
+            order_groups = self.env['sale.order']._read_group(
+                order_domain, ['invoice_status'], ['__count', 'amount_total:sum']
+            )
+            orders_count = sum(count for __, count, __ in order_groups)
+
             # Average Order Value
             if orders_count > 0:
-                record.average_order_value = sum(orders.mapped('amount_total')) / orders_count
+                record.average_order_value = sum(total for __, __, total in order_groups) / orders_count
             else:
                 record.average_order_value = 0.0
-            
+
             # Conversion Rate (confirmed orders / total orders including quotes)
-            all_orders_domain = domain.copy()
             if ('state', '=', 'sale') in domain:
-                domain_without_state = [d for d in all_orders_domain if d != ('state', '=', 'sale')]
-                all_orders = self.env['sale.order'].search(domain_without_state)
-                total_count = len(all_orders)
+                domain_without_state = [d for d in order_domain if d != ('state', '=', 'sale')]
+                total_count = self.env['sale.order'].search_count(domain_without_state)
                 if total_count > 0:
                     record.conversion_rate = (orders_count / total_count) * 100
                 else:
                     record.conversion_rate = 0.0
             else:
                 record.conversion_rate = 0.0
-            
+
             # Orders and Invoices Count
             record.total_orders_count = orders_count
-            
-            invoices = self.env['account.move'].search([
-                ('move_type', '=', 'out_invoice'),
-                ('invoice_date', '>=', record.booking_date_from),
-                ('invoice_date', '<=', record.booking_date_to),
-                ('state', '=', 'posted')
-            ])
-            record.total_invoices_count = len(invoices)
-            
+
+            invoice_domain = record._get_dataset_invoice_domain() + [('move_type', '=', 'out_invoice')]
+            if record.booking_date_from:
+                invoice_domain.append(('invoice_date', '>=', record.booking_date_from))
+            if record.booking_date_to:
+                invoice_domain.append(('invoice_date', '<=', record.booking_date_to))
+            record.total_invoices_count = self.env['account.move'].search_count(invoice_domain)
+
             # Pending orders (booked but not fully invoiced)
-            pending = orders.filtered(lambda o: o.invoice_status in ['to invoice', 'invoiced'])
-            record.pending_orders_count = len(pending)
-            
+            record.pending_orders_count = sum(
+                count for invoice_status, count, __ in order_groups
+                if invoice_status in ['to invoice', 'invoiced']
+            )
+
             # Collection Efficiency
             if record.total_invoiced_amount > 0:
                 record.collection_efficiency = (record.amount_collected / record.total_invoiced_amount) * 100
@@ -949,26 +1121,22 @@ class SalesInvoicingDashboard(models.Model):
     def _compute_table_product_analysis_html(self):
         """Generate product/service analysis table"""
         for rec in self:
-            domain = rec._get_order_domain()
-            orders = self.env['sale.order'].search(domain)
-            
+            order_domain = rec._get_dataset()['order_domain']
+
             # Group by product
             product_data = {}
-            for order in orders:
-                for line in order.order_line:
-                    if not line.product_id:
-                        continue
-                    product_name = line.product_id.name
-                    if product_name not in product_data:
-                        product_data[product_name] = {
-                            'qty': 0,
-                            'amount': 0,
-                            'orders': set()
-                        }
-                    product_data[product_name]['qty'] += line.product_uom_qty
-                    product_data[product_name]['amount'] += line.price_subtotal
-                    product_data[product_name]['orders'].add(order.id)
-            
+            line_groups = self.env['sale.order.line']._read_group(
+                [('order_id', 'any', order_domain), ('product_id', '!=', False)],
+                ['product_id'],
+                ['product_uom_qty:sum', 'price_subtotal:sum', 'order_id:array_agg'],
+            )
+            for product, qty, amount, order_ids in line_groups:
+                # Products sharing a name are shown on one row
+                data = product_data.setdefault(product.name, {'qty': 0, 'amount': 0, 'orders': set()})
+                data['qty'] += qty or 0
+                data['amount'] += amount or 0
+                data['orders'].update(order_ids)
+
             # Convert to list and sort by amount
             products = [
                 {
@@ -1006,29 +1174,20 @@ class SalesInvoicingDashboard(models.Model):
                 rec.table_daily_sales_html = '<p>Please select a date range</p>'
                 continue
                 
-            domain = rec._get_order_domain()
-            orders = self.env['sale.order'].search(domain)
-            
-            # Group by date
-            daily_data = {}
-            for order in orders:
-                if order.booking_date:
-                    date_str = order.booking_date.strftime('%Y-%m-%d')
-                    if date_str not in daily_data:
-                        daily_data[date_str] = {
-                            'count': 0,
-                            'amount': 0
-                        }
-                    daily_data[date_str]['count'] += 1
-                    daily_data[date_str]['amount'] += order.amount_total
-            
-            # Sort by date descending
+            order_domain = rec._get_dataset()['order_domain']
+
+            # Group by date, latest first
+            day_groups = self.env['sale.order']._read_group(
+                order_domain + [('booking_date', '!=', False)],
+                ['booking_date:day'],
+                ['__count', 'amount_total:sum'],
+                order='booking_date:day desc',
+            )
             daily_list = [
-                {'date': date, 'count': data['count'], 'amount': data['amount']}
-                for date, data in daily_data.items()
+                {'date': day.strftime('%Y-%m-%d'), 'count': count, 'amount': amount or 0}
+                for day, count, amount in day_groups
             ]
-            daily_list.sort(key=lambda x: x['date'], reverse=True)
-            
+
             # Generate HTML
             html = ['<table class="table table-sm table-striped">']
             html.append('<thead class="table-dark">')
@@ -1051,35 +1210,30 @@ class SalesInvoicingDashboard(models.Model):
     def _compute_table_customer_activity_html(self):
         """Generate customer activity summary table"""
         for rec in self:
-            domain = rec._get_order_domain()
-            orders = self.env['sale.order'].search(domain)
-            
+            dataset = rec._get_dataset()
+
             # Group by customer
             customer_data = {}
-            for order in orders:
-                customer = order.partner_id
-                if not customer:
-                    continue
-                    
-                cust_id = customer.id
-                if cust_id not in customer_data:
-                    customer_data[cust_id] = {
-                        'name': customer.name,
-                        'orders': 0,
-                        'amount': 0,
-                        'invoiced': 0,
-                        'paid': 0
-                    }
-                
-                customer_data[cust_id]['orders'] += 1
-                customer_data[cust_id]['amount'] += order.amount_total
-                
-                # Get invoices for this order
-                for invoice in order.invoice_ids.filtered(lambda i: i.state == 'posted'):
-                    customer_data[cust_id]['invoiced'] += invoice.amount_total
-                    if invoice.payment_state == 'paid':
-                        customer_data[cust_id]['paid'] += invoice.amount_total
-            
+            customer_groups = self.env['sale.order']._read_group(
+                dataset['order_domain'] + [('partner_id', '!=', False)],
+                ['partner_id'],
+                ['__count', 'amount_total:sum', 'id:array_agg'],
+            )
+            for customer, count, amount, order_ids in customer_groups:
+                customer_data[customer.id] = {
+                    'name': customer.name,
+                    'orders': count,
+                    'amount': amount or 0,
+                    'invoiced': 0,
+                    'paid': 0
+                }
+                # Posted invoices totals of the customer orders
+                for order_id in order_ids:
+                    totals = dataset['invoice_totals'].get(order_id)
+                    if totals:
+                        customer_data[customer.id]['invoiced'] += totals['invoiced']
+                        customer_data[customer.id]['paid'] += totals['paid']
+
             # Convert to list and sort by amount
             customers = [
                 {
@@ -1129,9 +1283,8 @@ class SalesInvoicingDashboard(models.Model):
             order_domain.append(('booking_date', '>=', self.booking_date_from))
         if self.booking_date_to:
             order_domain.append(('booking_date', '<=', self.booking_date_to))
-        orders = self.env['sale.order'].search(order_domain)
-        if orders:
-            domain.append(('line_ids.sale_line_ids.order_id', 'in', orders.ids))
+        if self.env['sale.order'].search_count(order_domain, limit=1):
+            domain.append(('sale_order_ids', 'any', order_domain))
         if self.payment_status_filter and self.payment_status_filter != 'all':
             domain.append(('payment_state', '=', self.payment_status_filter))
         action['domain'] = domain
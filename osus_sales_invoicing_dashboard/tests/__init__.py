@@ -0,0 +1,3 @@
+# -*- coding: utf-8 -*-
+from . import test_dashboard_metrics
+from . import test_account_move
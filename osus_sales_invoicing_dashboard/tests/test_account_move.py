@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+from odoo.tests.common import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestAccountMoveSaleOrders(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.partner = cls.env['res.partner'].create({'name': 'Linked Customer'})
+        product = cls.env['product.product'].create({
+            'name': 'Linked Service',
+            'type': 'service',
+            'list_price': 100.0,
+            'invoice_policy': 'order',
+            'taxes_id': [(5, 0, 0)],
+        })
+        cls.orders = cls.env['sale.order'].create([{
+            'partner_id': cls.partner.id,
+            'order_line': [(0, 0, {'product_id': product.id, 'product_uom_qty': 1})],
+        } for __ in range(2)])
+        cls.orders.action_confirm()
+        cls.invoice = cls.orders._create_invoices()
+
+    def test_sale_order_ids(self):
+        self.assertEqual(self.invoice.sale_order_ids, self.orders)
+        self.invoice.action_post()
+        dashboard = self.env['osus.sales.invoicing.dashboard'].create({
+            'booking_date_from': False,
+            'booking_date_to': False,
+            'partner_id': self.partner.id,
+        })
+        self.assertEqual(self.env['account.move'].search(dashboard._get_invoice_domain()), self.invoice)
+
+        self.invoice.button_draft()
+        self.invoice.invoice_line_ids.filtered(
+            lambda line: line.sale_line_ids.order_id == self.orders[0]
+        ).unlink()
+        self.assertEqual(self.invoice.sale_order_ids, self.orders[1])
+        self.invoice.button_cancel()
+        self.assertEqual(self.invoice.sale_order_ids, self.orders[1])
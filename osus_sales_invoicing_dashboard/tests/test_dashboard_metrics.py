@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+from datetime import timedelta
+from unittest.mock import patch
+
+from odoo import fields
+from odoo.tests.common import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestDashboardMetrics(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.partner = cls.env['res.partner'].create({'name': 'Dashboard Customer'})
+        cls.product = cls.env['product.product'].create({
+            'name': 'Dashboard Service',
+            'type': 'service',
+            'list_price': 100.0,
+            'invoice_policy': 'order',
+            'taxes_id': [(5, 0, 0)],
+        })
+        cls.dashboard = cls.env['osus.sales.invoicing.dashboard'].create({
+            'booking_date_from': False,
+            'booking_date_to': False,
+            'partner_id': cls.partner.id,
+        })
+
+    def _create_orders(self, count, invoiced=0):
+        orders = self.env['sale.order'].create([{
+            'partner_id': self.partner.id,
+            'order_line': [(0, 0, {'product_id': self.product.id, 'product_uom_qty': 1})],
+        } for __ in range(count)])
+        orders.action_confirm()
+        if invoiced:
+            # One invoice per order
+            orders[:invoiced]._create_invoices(grouped=True).action_post()
+        return orders
+
+    def _compute_metrics_queries(self, compute_method='_compute_metrics'):
+        self.env.invalidate_all()
+        queries = self.env.cr.sql_log_count
+        getattr(self.dashboard, compute_method)()
+        return self.env.cr.sql_log_count - queries
+
+    def test_metrics(self):
+        self._create_orders(3, invoiced=2)
+        self.dashboard._compute_metrics()
+        self.assertEqual(self.dashboard.total_booked_sales, 300.0)
+        self.assertEqual(self.dashboard.posted_invoice_count, 2)
+        self.assertEqual(self.dashboard.total_invoiced_amount, 200.0)
+        self.assertEqual(self.dashboard.unpaid_invoice_count, 2)
+        self.assertEqual(self.dashboard.amount_to_collect, 200.0)
+        self.assertEqual(self.dashboard.amount_collected, 0.0)
+        self.assertEqual(self.dashboard.pending_to_invoice_order_count, 1)
+        self.assertEqual(self.dashboard.total_pending_amount, 100.0)
+
+    def test_metrics_query_count(self):
+        """The metrics are computed with the same queries whatever the order volume"""
+        self._create_orders(5, invoiced=3)
+        small_volume = self._compute_metrics_queries()
+        self._create_orders(50, invoiced=30)
+        # The orders don't fit in one prefetch batch anymore
+        with patch('odoo.models.PREFETCH_MAX', 20):
+            self.assertEqual(self._compute_metrics_queries(), small_volume)
+
+    def test_performance_metrics(self):
+        self._create_orders(3, invoiced=2)
+        self.dashboard._compute_performance_metrics()
+        self.assertEqual(self.dashboard.average_order_value, 100.0)
+        self.assertEqual(self.dashboard.total_orders_count, 3)
+        self.assertEqual(self.dashboard.total_invoices_count, 2)
+        self.assertEqual(self.dashboard.pending_orders_count, 3)
+
+    def test_performance_metrics_query_count(self):
+        """The performance metrics don't load the orders nor the invoices"""
+        self._create_orders(5, invoiced=3)
+        small_volume = self._compute_metrics_queries('_compute_performance_metrics')
+        self._create_orders(50, invoiced=30)
+        with patch('odoo.models.PREFETCH_MAX', 20):
+            self.assertEqual(self._compute_metrics_queries('_compute_performance_metrics'), small_volume)
+
+    def test_tables(self):
+        orders = self._create_orders(3, invoiced=2)
+        self.dashboard._compute_table_product_analysis_html()
+        self.assertIn('<td>Dashboard Service</td><td>3</td><td>3</td>', self.dashboard.table_product_analysis_html)
+        self.dashboard._compute_table_customer_activity_html()
+        self.assertIn(
+            '<td>Dashboard Customer</td><td>3</td><td>%s</td><td>%s</td>' % (
+                self.dashboard._fmt_money(300.0), self.dashboard._fmt_money(200.0)),
+            self.dashboard.table_customer_activity_html,
+        )
+        rows = {row['name']: row for row in self.dashboard._get_detailed_order_rows()}
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[orders[0].name]['invoiced'], 100.0)
+        self.assertEqual(rows[orders[0].name]['pay_status'], 'Pending')
+        self.assertEqual(rows[orders[2].name]['action'], 'Invoice Pending')
+
+    def test_tables_invoice_of_several_orders(self):
+        """An invoice of several orders is split between them, not counted once per order"""
+        orders = self._create_orders(3)
+        orders[0].order_line.product_uom_qty = 3
+        invoice = orders[:2]._create_invoices()
+        invoice.action_post()
+        self.assertEqual(invoice.sale_order_ids, orders[:2])
+        self.dashboard._compute_table_customer_activity_html()
+        self.assertIn(
+            '<td>Dashboard Customer</td><td>3</td><td>%s</td><td>%s</td>' % (
+                self.dashboard._fmt_money(500.0), self.dashboard._fmt_money(400.0)),
+            self.dashboard.table_customer_activity_html,
+        )
+        rows = {row['name']: row for row in self.dashboard._get_detailed_order_rows()}
+        self.assertEqual(rows[orders[0].name]['invoiced'], 300.0)
+        self.assertEqual(rows[orders[1].name]['invoiced'], 100.0)
+        self.assertEqual(rows[orders[1].name]['outstanding'], 100.0)
+        self.assertEqual(rows[orders[2].name]['invoiced'], 0.0)
+
+    def test_invoice_aging(self):
+        invoices = self._create_orders(3)._create_invoices(grouped=True)
+        today = fields.Date.context_today(self.dashboard)
+        for invoice, days in zip(invoices, (0, 45, 120)):
+            invoice.write({
+                'invoice_date': today - timedelta(days=days),
+                'invoice_date_due': today - timedelta(days=days),
+            })
+        invoices.action_post()
+        buckets = {b['key']: (b['count'], b['amount']) for b in self.dashboard._get_invoice_aging_buckets()}
+        self.assertEqual(buckets, {
+            'current': (1, 100.0),
+            '1_30': (0, 0.0),
+            '31_60': (1, 100.0),
+            '61_90': (0, 0.0),
+            '90_plus': (1, 100.0),
+        })
+        self.dashboard._compute_chart_invoice_aging()
+        self.assertEqual(self.dashboard.chart_invoice_aging['datasets'][0]['data'], [100.0, 0.0, 100.0, 0.0, 100.0])
+
+    def test_shared_dataset(self):
+        """All the fields read in one refresh are computed from one dataset"""
+        self._create_orders(3, invoiced=2)
+        Dashboard = self.registry['osus.sales.invoicing.dashboard']
+        self.env.invalidate_all()
+        with patch.object(Dashboard, '_build_dataset', autospec=True, side_effect=Dashboard._build_dataset) as build_dataset:
+            [values] = self.dashboard.web_read({
+                'total_booked_sales': {},
+                'posted_invoice_count': {},
+                'chart_sales_by_type': {},
+                'chart_payment_state': {},
+                'chart_agent_performance': {},
+                'table_order_type_html': {},
+                'table_detailed_orders_html': {},
+                'table_customer_activity_html': {},
+            })
+        self.assertEqual(build_dataset.call_count, 1)
+        self.assertEqual(values['total_booked_sales'], 300.0)
+        self.assertEqual(values['posted_invoice_count'], 2)
+        self.assertEqual(values['chart_sales_by_type']['datasets'][0]['data'], [300.0])
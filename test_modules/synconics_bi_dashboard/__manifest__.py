@@ -91,6 +91,7 @@ Transform your data into compelling dashboard visualizations
         "wizard/mail_compose_message_views.xml",
         "views/dashboard_view.xml",
         "data/dashboard_data.xml",
+        "data/dashboard_cron.xml",
         "views/dashboard_chart_view.xml",
         "views/res_users_view.xml",
     ],
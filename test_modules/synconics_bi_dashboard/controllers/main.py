@@ -0,0 +1,146 @@
+import base64
+import csv
+import io
+import json
+import logging
+import os
+import tempfile
+
+import xlsxwriter
+from odoo import _, api, http
+from odoo.exceptions import UserError
+from odoo.http import content_disposition, request
+from odoo.tools import html_escape
+
+_logger = logging.getLogger(__name__)
+
+CSV_BATCH_ROWS = 1000
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def iter_csv_chunks(rows):
+    """
+    Encode the rows as CSV, yielding the output every CSV_BATCH_ROWS rows
+    """
+    output = io.StringIO()
+    writer = csv.writer(output)
+    for index, row in enumerate(rows, 1):
+        writer.writerow(row)
+        if index % CSV_BATCH_ROWS == 0:
+            yield output.getvalue().encode("utf-8")
+            output.seek(0)
+            output.truncate()
+    if output.tell():
+        yield output.getvalue().encode("utf-8")
+
+
+def iter_xlsx_chunks(rows, sheet_name):
+    """
+    Write the rows in a constant memory workbook, rows are flushed to disk as
+    soon as they are written, then stream the file
+    """
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    try:
+        workbook = xlsxwriter.Workbook(
+            path,
+            {
+                "constant_memory": True,
+                "default_date_format": "yyyy-mm-dd",
+                "remove_timezone": True,
+            },
+        )
+        worksheet = workbook.add_worksheet(sheet_name[:31])
+        header_format = workbook.add_format({"bold": True, "border": 1})
+        for row_index, row in enumerate(rows):
+            cell_format = header_format if not row_index else None
+            for col_index, value in enumerate(row):
+                try:
+                    worksheet.write(row_index, col_index, value, cell_format)
+                except TypeError:
+                    worksheet.write_string(
+                        row_index, col_index, str(value), cell_format
+                    )
+        workbook.close()
+        with open(path, "rb") as xlsx_file:
+            while True:
+                chunk = xlsx_file.read(STREAM_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+    finally:
+        os.unlink(path)
+
+
+class DashboardChartExport(http.Controller):
+    @http.route(
+        "/synconics_bi_dashboard/export/<string:file_type>",
+        type="http",
+        auth="user",
+        methods=["POST"],
+    )
+    def export_chart(self, file_type, chart_id, name, chart_type, print_vals="{}"):
+        """
+        Download the chart data as a CSV or Excel file, standard lists are
+        streamed row by row
+        """
+        try:
+            if file_type not in ("csv", "xlsx"):
+                raise UserError(_("Unsupported file type!"))
+            chart = request.env["dashboard.chart"].browse(int(chart_id)).exists()
+            if not chart:
+                raise UserError(_("This chart does not exist anymore!"))
+            print_vals = json.loads(print_vals or "{}")
+            if chart._is_streamed_export(chart_type, print_vals):
+                body = self._stream_list_export(chart, file_type, name)
+            else:
+                export = chart.export_excel if file_type == "xlsx" else chart.export_csv
+                res = export(name, chart_type, print_vals)
+                if res.get("error"):
+                    raise UserError(
+                        _("No data is available for downloading the file at this time!")
+                    )
+                body = [base64.b64decode(res["file_content"])]
+        except Exception as e:
+            _logger.warning("Error while exporting chart %s", chart_id, exc_info=True)
+            error = {
+                "code": 200,
+                "message": "Odoo Server Error",
+                "data": http.serialize_exception(e),
+            }
+            return request.make_response(html_escape(json.dumps(error)))
+        content_type = (
+            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            if file_type == "xlsx"
+            else "text/csv; charset=utf-8"
+        )
+        return request.make_response(
+            body,
+            headers=[
+                ("Content-Type", content_type),
+                ("Content-Disposition", content_disposition(f"{name}.{file_type}")),
+            ],
+        )
+
+    def _stream_list_export(self, chart, file_type, name):
+        """
+        The response body is consumed once the request cursor is closed, rows
+        are read on a dedicated cursor while the file is being sent
+        """
+        registry, uid, context = (
+            request.env.registry,
+            request.env.uid,
+            request.env.context,
+        )
+        chart_id = chart.id
+
+        def iter_rows():
+            with registry.cursor() as cr:
+                env = api.Environment(cr, uid, context)
+                yield from env["dashboard.chart"].browse(
+                    chart_id
+                )._iter_list_export_rows()
+
+        if file_type == "xlsx":
+            return iter_xlsx_chunks(iter_rows(), name)
+        return iter_csv_chunks(iter_rows())
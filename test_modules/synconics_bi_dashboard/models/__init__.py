@@ -1,3 +1,4 @@
+from . import base
 from . import dashboard
 from . import ir_model
 from . import ir_ui_menu
@@ -5,3 +6,6 @@ from . import res_users
 from . import list_field
 from . import dashboard_action
 from . import dashboard_chart
+from . import chart_snapshot
+from . import chart_stat
+from . import chart_cache_version
@@ -0,0 +1,51 @@
+from odoo import api, models
+
+from .chart_cache import chart_data_cache
+
+
+class Base(models.AbstractModel):
+    _inherit = "base"
+
+    def _invalidate_dashboard_chart_cache(self):
+        """
+        Drop the charts cached by this worker from this model. The changed
+        models are checked once before commit: the change counters of the ones
+        charts are cached from are incremented, so that the other workers stop
+        serving their copies.
+        """
+        if not self.pool.ready:
+            return
+        chart_data_cache.invalidate_model(self.env.cr.dbname, self._name)
+        precommit = self.env.cr.precommit
+        model_names = precommit.data.get("dashboard_chart_cache")
+        if model_names is None:
+            model_names = precommit.data["dashboard_chart_cache"] = set()
+            env = self.env
+
+            @precommit.add
+            def bump_chart_cache_versions():
+                cached_model_names = (
+                    model_names & env["dashboard.chart"]._get_cached_model_names()
+                )
+                if cached_model_names:
+                    env["dashboard.chart.cache.version"]._bump_versions_after_commit(
+                        cached_model_names
+                    )
+
+        model_names.add(self._name)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        records._invalidate_dashboard_chart_cache()
+        return records
+
+    def _write(self, vals):
+        # Stored fields are written here when flushed, also when recomputed
+        res = super()._write(vals)
+        self._invalidate_dashboard_chart_cache()
+        return res
+
+    def unlink(self):
+        self._invalidate_dashboard_chart_cache()
+        return super().unlink()
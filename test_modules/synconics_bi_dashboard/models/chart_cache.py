@@ -0,0 +1,161 @@
+import copy
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+
+class ChartDataCache:
+    """
+    In-process LRU cache of chart payloads.
+    Entries expire after their TTL and are dropped as soon as records of one
+    of the models they were computed from are created, written or deleted.
+    Each entry keeps the change counters of its models read before it was
+    computed, changes made in other workers are detected when they differ.
+    """
+
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._model_keys = defaultdict(set)
+        self._lock = threading.RLock()
+        self.hits = defaultdict(int)
+        self.misses = defaultdict(int)
+
+    def get(self, key, versions=()):
+        """
+        Return a copy of the cached value or None, key must start with
+        (dbname, chart_id)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and (entry[0] < time.monotonic() or entry[2] != versions):
+                self._discard(key)
+                entry = None
+            if not entry:
+                self.misses[key[:2]] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits[key[:2]] += 1
+            return copy.deepcopy(entry[3])
+
+    def set(self, key, value, model_names, ttl, max_size=None, versions=()):
+        """
+        Store a copy of value for ttl seconds
+        """
+        with self._lock:
+            if max_size:
+                self.max_size = max_size
+            self._discard(key)
+            self._entries[key] = (
+                time.monotonic() + ttl,
+                tuple(model_names),
+                tuple(versions),
+                copy.deepcopy(value),
+            )
+            for model_name in model_names:
+                self._model_keys[(key[0], model_name)].add(key)
+            while len(self._entries) > self.max_size:
+                self._discard(next(iter(self._entries)))
+
+    def is_watched(self, dbname, model_name):
+        return (dbname, model_name) in self._model_keys
+
+    def invalidate_model(self, dbname, model_name):
+        """
+        Drop entries computed from the records of the model
+        """
+        with self._lock:
+            for key in list(self._model_keys.get((dbname, model_name), ())):
+                self._discard(key)
+
+    def invalidate_chart(self, dbname, chart_ids):
+        chart_keys = {(dbname, chart_id) for chart_id in chart_ids}
+        with self._lock:
+            for key in [key for key in self._entries if key[:2] in chart_keys]:
+                self._discard(key)
+
+    def get_stats(self, dbname, chart_ids):
+        """
+        Return (hits, misses) of the charts
+        """
+        with self._lock:
+            return (
+                sum(self.hits[(dbname, chart_id)] for chart_id in chart_ids),
+                sum(self.misses[(dbname, chart_id)] for chart_id in chart_ids),
+            )
+
+    def reset_stats(self, dbname, chart_ids):
+        with self._lock:
+            for chart_id in chart_ids:
+                self.hits.pop((dbname, chart_id), None)
+                self.misses.pop((dbname, chart_id), None)
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if not entry:
+            return
+        for model_name in entry[1]:
+            keys = self._model_keys.get((key[0], model_name))
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._model_keys[(key[0], model_name)]
+
+
+class LRUCache:
+    """
+    Small thread safe LRU cache, used for the evaluated chart domains and the
+    rendered chart images. When max_bytes is set, the total length of the
+    cached values is kept under it too.
+    """
+
+    def __init__(self, max_size, max_bytes=None):
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, key, compute=None):
+        """
+        Return the cached value, on a miss compute(key) is cached and returned
+        when given, None otherwise
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                return value
+        if compute is None:
+            return None
+        value = compute(key)
+        self.set(key, value)
+        return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._discard(key)
+            if self.max_bytes and len(value) > self.max_bytes:
+                return
+            self._entries[key] = value
+            if self.max_bytes:
+                self.size_bytes += len(value)
+            while len(self._entries) > self.max_size or (
+                self.max_bytes and self.size_bytes > self.max_bytes
+            ):
+                self._discard(next(iter(self._entries)))
+
+    def discard(self, keys):
+        with self._lock:
+            for key in keys:
+                self._discard(key)
+
+    def _discard(self, key):
+        value = self._entries.pop(key, None)
+        if value is not None and self.max_bytes:
+            self.size_bytes -= len(value)
+
+
+chart_data_cache = ChartDataCache()
+domain_cache = LRUCache(max_size=512)
+rendered_image_cache = LRUCache(max_size=128, max_bytes=32 * 1024 * 1024)
@@ -0,0 +1,96 @@
+from odoo import api, fields, models, tools
+from odoo.tools import SQL
+
+from .chart_cache import chart_data_cache
+
+
+class DashboardChartCacheVersion(models.Model):
+    """
+    Changes of the models charts are cached from, appended after commit. The
+    last id of a model is its change counter: concurrent writers only insert
+    rows, they don't wait on a shared row lock.
+    """
+
+    _name = "dashboard.chart.cache.version"
+    _description = "Dashboard Chart Cache Version"
+    _log_access = False
+
+    model = fields.Char(string="Model", required=True)
+
+    def init(self):
+        tools.create_index(
+            self.env.cr,
+            "dashboard_chart_cache_version_model_id_index",
+            self._table,
+            ["model", "id"],
+        )
+
+    @api.model
+    def _get_versions(self, model_names):
+        """
+        Return the change counters of the models, shared by all the workers
+        """
+        if not model_names:
+            return ()
+        self.env.cr.execute(
+            SQL(
+                """
+                SELECT model, MAX(id) FROM dashboard_chart_cache_version
+                WHERE model IN %s GROUP BY model
+                """,
+                tuple(model_names),
+            )
+        )
+        versions = dict(self.env.cr.fetchall())
+        return tuple(versions.get(model_name, 0) for model_name in model_names)
+
+    @api.model
+    def _bump_versions(self, cr, model_names):
+        """
+        Increment the change counters of the models, the chart data cached by
+        any worker from their records is not served anymore
+        """
+        cr.execute(
+            SQL(
+                """
+                INSERT INTO dashboard_chart_cache_version (model)
+                SELECT UNNEST(%s::varchar[])
+                """,
+                sorted(model_names),
+            )
+        )
+
+    @api.model
+    def _bump_versions_after_commit(self, model_names):
+        """
+        Increment the change counters of the models once, after commit, so
+        that a chart computed meanwhile from old data is not kept either
+        """
+        postcommit = self.env.cr.postcommit
+        bumped_model_names = postcommit.data.get("dashboard_chart_cache")
+        if bumped_model_names is None:
+            bumped_model_names = postcommit.data["dashboard_chart_cache"] = set()
+            dbname, registry = self.env.cr.dbname, self.pool
+
+            @postcommit.add
+            def bump_versions():
+                for model_name in bumped_model_names:
+                    chart_data_cache.invalidate_model(dbname, model_name)
+                with registry.cursor() as cr:
+                    self._bump_versions(cr, bumped_model_names)
+
+        bumped_model_names.update(model_names)
+
+    @api.autovacuum
+    def _gc_versions(self):
+        """
+        Keep the last change of each model only
+        """
+        self.env.cr.execute(
+            """
+            DELETE FROM dashboard_chart_cache_version
+            WHERE id NOT IN (
+                SELECT MAX(id) FROM dashboard_chart_cache_version GROUP BY model
+            )
+            """
+        )
@@ -0,0 +1,26 @@
+from odoo import fields, models
+
+
+class DashboardChartSnapshot(models.Model):
+    _name = "dashboard.chart.snapshot"
+    _description = "Dashboard Chart Snapshot"
+    _order = "generated_at desc"
+
+    chart_id = fields.Many2one(
+        "dashboard.chart",
+        string="Chart",
+        required=True,
+        ondelete="cascade",
+        index=True,
+    )
+    chart_type = fields.Char(string="Chart Type")
+    access_key = fields.Char(
+        string="Access Key",
+        help="Access rights and companies the snapshot was computed with",
+    )
+    data = fields.Json(string="Data")
+    generated_at = fields.Datetime(string="Generated At", default=fields.Datetime.now)
+
+    _sql_constraints = [
+        ("chart_uniq", "unique(chart_id)", "A chart can only have one snapshot!")
+    ]
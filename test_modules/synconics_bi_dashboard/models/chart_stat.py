@@ -0,0 +1,116 @@
+from odoo import api, fields, models, tools
+from odoo.tools import SQL
+
+# Number of renders kept per chart
+STAT_HISTORY_SIZE = 100
+
+
+class DashboardChartStat(models.Model):
+    _name = "dashboard.chart.stat"
+    _description = "Dashboard Chart Render Statistic"
+    _order = "id desc"
+    _log_access = False
+
+    chart_id = fields.Many2one(
+        "dashboard.chart",
+        string="Chart",
+        required=True,
+        ondelete="cascade",
+        index=True,
+    )
+    chart_type = fields.Char(string="Chart Type")
+    duration = fields.Float(string="Render Time (ms)")
+    query_count = fields.Integer(string="Queries")
+    row_count = fields.Integer(string="Rows")
+    payload_size = fields.Integer(string="Payload Size (bytes)")
+    rendered_at = fields.Datetime(string="Rendered At", default=fields.Datetime.now)
+
+    @api.autovacuum
+    def _gc_render_stats(self):
+        """
+        Keep the last renders of each chart only
+        """
+        self.env.cr.execute(
+            SQL(
+                """
+                DELETE FROM dashboard_chart_stat
+                WHERE id IN (
+                    SELECT id FROM (
+                        SELECT id, ROW_NUMBER() OVER (
+                            PARTITION BY chart_id ORDER BY id DESC
+                        ) AS position
+                        FROM dashboard_chart_stat
+                    ) ranked
+                    WHERE position > %s
+                )
+                """,
+                STAT_HISTORY_SIZE,
+            )
+        )
+
+
+class DashboardChartPerformance(models.Model):
+    _name = "dashboard.chart.performance"
+    _description = "Dashboard Chart Performance"
+    _auto = False
+    _order = "p95_duration desc"
+
+    chart_id = fields.Many2one("dashboard.chart", string="Chart", readonly=True)
+    dashboard_id = fields.Many2one(
+        "dashboard.dashboard", string="Dashboard", readonly=True
+    )
+    chart_type = fields.Selection(
+        selection=lambda self: self.env["dashboard.chart"]
+        ._fields["chart_type"]
+        .selection,
+        string="Type",
+        readonly=True,
+    )
+    render_count = fields.Integer(string="Renders", readonly=True)
+    avg_duration = fields.Float(string="Avg Render Time (ms)", readonly=True)
+    p95_duration = fields.Float(string="P95 Render Time (ms)", readonly=True)
+    avg_query_count = fields.Float(string="Avg Queries", readonly=True)
+    max_query_count = fields.Integer(string="Max Queries", readonly=True)
+    avg_row_count = fields.Float(string="Avg Rows", readonly=True)
+    max_payload_size = fields.Integer(string="Max Payload Size (bytes)", readonly=True)
+    last_rendered_at = fields.Datetime(string="Last Rendered At", readonly=True)
+
+    def init(self):
+        tools.drop_view_if_exists(self.env.cr, self._table)
+        self.env.cr.execute(
+            SQL(
+                """
+                CREATE OR REPLACE VIEW %s AS (
+                    SELECT
+                        stat.chart_id AS id,
+                        stat.chart_id,
+                        chart.dashboard_id,
+                        chart.chart_type,
+                        COUNT(*) AS render_count,
+                        AVG(stat.duration) AS avg_duration,
+                        PERCENTILE_CONT(0.95) WITHIN GROUP (
+                            ORDER BY stat.duration
+                        ) AS p95_duration,
+                        AVG(stat.query_count) AS avg_query_count,
+                        MAX(stat.query_count) AS max_query_count,
+                        AVG(stat.row_count) AS avg_row_count,
+                        MAX(stat.payload_size) AS max_payload_size,
+                        MAX(stat.rendered_at) AS last_rendered_at
+                    FROM dashboard_chart_stat stat
+                    JOIN dashboard_chart chart ON chart.id = stat.chart_id
+                    GROUP BY stat.chart_id, chart.dashboard_id, chart.chart_type
+                )
+                """,
+                SQL.identifier(self._table),
+            )
+        )
+
+    def action_open_chart(self):
+        self.ensure_one()
+        return {
+            "type": "ir.actions.act_window",
+            "res_model": "dashboard.chart",
+            "res_id": self.chart_id.id,
+            "view_mode": "form",
+            "target": "current",
+        }
@@ -1,7 +1,21 @@
+import logging
+import threading
+import time
+
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
 from odoo import models, fields, api, _
 from markupsafe import Markup
 from odoo.exceptions import ValidationError
 
+from .chart_cache import chart_data_cache, LRUCache
+
+_logger = logging.getLogger(__name__)
+
+# Number of query results shared by the charts computed together
+SHARED_QUERIES_SIZE = 64
+
 
 class Dashboard(models.Model):
     _name = "dashboard.dashboard"
@@ -12,6 +26,14 @@ class Dashboard(models.Model):
         for dashboard in self:
             dashboard.chart_count = len(dashboard.chart_ids)
 
+    def _compute_chart_cache_stats(self):
+        for dashboard in self:
+            hits, misses = chart_data_cache.get_stats(
+                self.env.cr.dbname, dashboard.chart_ids.ids
+            )
+            dashboard.chart_cache_hit_count = hits
+            dashboard.chart_cache_miss_count = misses
+
     name = fields.Char(string="Name", required=True, tracking=True)
     chart_count = fields.Integer(string="Chart Count", compute="_compute_chart_count")
     chart_ids = fields.One2many(
@@ -50,6 +72,26 @@ class Dashboard(models.Model):
         string="Auto-Refresh Interval",
         tracking=True,
     )
+    cache_ttl = fields.Integer(
+        string="Chart Cache Duration",
+        default=60,
+        help="Number of seconds charts data is served from the cache, set 0 to disable the cache. "
+        "Cached charts are dropped in every worker when their records change through the ORM, "
+        "changes made by SQL queries only show once this duration is over.",
+        tracking=True,
+    )
+    chart_timeout = fields.Integer(
+        string="Chart Timeout",
+        default=30,
+        help="Number of seconds a chart can take to load before an error is shown in its place, set 0 to wait for every chart.",
+        tracking=True,
+    )
+    chart_cache_hit_count = fields.Integer(
+        string="Cache Hits", compute="_compute_chart_cache_stats"
+    )
+    chart_cache_miss_count = fields.Integer(
+        string="Cache Misses", compute="_compute_chart_cache_stats"
+    )
     mail_cron_id = fields.Many2one("ir.cron", string="Mail Cron Job", copy=False)
     dashboard_mail_ids = fields.One2many(
         "dashboard.mail",
@@ -208,85 +250,103 @@ class Dashboard(models.Model):
         dashboard_charts = self.env["dashboard.chart"]
         ir_model = self.env["ir.model"].sudo()
         ir_model_fields = self.env["ir.model.fields"].sudo()
+
+        # Resolve every model and field referenced by the charts with one
+        # query each instead of one search per reference
+        model_names = set()
+        field_names = set()
         for payload in json_payload.get("json_payload"):
-            model_id = ir_model.search([("model", "=", payload.get("model"))])
-            if payload.get("model") and not model_id:
-                unknown_model_list.append(payload.get("model"))
-            group_by_id = ir_model_fields.search(
+            model_names.update([payload.get("model"), payload.get("kpi_model")])
+            field_names.update(
+                payload.get(key)
+                for key in (
+                    "group_by_id",
+                    "map_group_by_id",
+                    "sub_group_by_id",
+                    "sort_field_id",
+                    "measurement_field_id",
+                    "date_filter_field_id",
+                    "kpi_measurement_field_id",
+                    "kpi_date_filter_field_id",
+                )
+            )
+            field_names.update(payload.get("measurement_field_ids") or [])
+            field_names.update(
+                line.get("field_id")
+                for line in payload.get("chart_multiplier_ids") or []
+            )
+            for line in (payload.get("list_measure_ids") or []) + (
+                payload.get("list_field_ids") or []
+            ):
+                field_names.update(
+                    [line.get("list_field_id"), line.get("list_measure_id")]
+                )
+        model_names -= {None, False}
+        field_names -= {None, False}
+        models_by_name = {
+            model.model: model
+            for model in ir_model.search([("model", "in", list(model_names))])
+        }
+        fields_by_name = {
+            (field.model, field.name): field
+            for field in ir_model_fields.search(
                 [
-                    ("model_id", "=", model_id.id),
-                    ("name", "=", payload.get("group_by_id")),
+                    ("model", "in", list(model_names)),
+                    ("name", "in", list(field_names)),
                 ]
             )
+        }
+
+        def get_field(model_id, name):
+            return fields_by_name.get((model_id.model, name), ir_model_fields)
+
+        for payload in json_payload.get("json_payload"):
+            model_id = models_by_name.get(payload.get("model"), ir_model)
+            if payload.get("model") and not model_id:
+                unknown_model_list.append(payload.get("model"))
+            group_by_id = get_field(model_id, payload.get("group_by_id"))
             if payload.get("group_by_id") and not group_by_id:
                 unknown_field_list.append(payload.get("group_by_id"))
-            map_group_by_id = ir_model_fields.search(
-                [
-                    ("model_id", "=", model_id.id),
-                    ("name", "=", payload.get("map_group_by_id")),
-                ]
-            )
+            map_group_by_id = get_field(model_id, payload.get("map_group_by_id"))
             if payload.get("map_group_by_id") and not map_group_by_id:
                 unknown_field_list.append(payload.get("map_group_by_id"))
-            sub_group_by_id = ir_model_fields.search(
-                [
-                    ("model_id", "=", model_id.id),
-                    ("name", "=", payload.get("sub_group_by_id")),
-                ]
-            )
+            sub_group_by_id = get_field(model_id, payload.get("sub_group_by_id"))
             if payload.get("sub_group_by_id") and not sub_group_by_id:
                 unknown_field_list.append(payload.get("sub_group_by_id"))
-            sort_field_id = ir_model_fields.search(
-                [
-                    ("model_id", "=", model_id.id),
-                    ("name", "=", payload.get("sort_field_id")),
-                ]
-            )
+            sort_field_id = get_field(model_id, payload.get("sort_field_id"))
             if payload.get("sort_field_id") and not sort_field_id:
                 unknown_field_list.append(payload.get("sort_field_id"))
-            measurement_field_id = ir_model_fields.search(
-                [
-                    ("model_id", "=", model_id.id),
-                    ("name", "=", payload.get("measurement_field_id")),
-                ]
+            measurement_field_id = get_field(
+                model_id, payload.get("measurement_field_id")
             )
             if payload.get("measurement_field_id") and not measurement_field_id:
                 unknown_field_list.append(payload.get("measurement_field_id"))
-            date_filter_field_id = ir_model_fields.search(
-                [
-                    ("model_id", "=", model_id.id),
-                    ("name", "=", payload.get("date_filter_field_id")),
-                ]
+            date_filter_field_id = get_field(
+                model_id, payload.get("date_filter_field_id")
             )
             if payload.get("date_filter_field_id") and not date_filter_field_id:
                 unknown_field_list.append(payload.get("date_filter_field_id"))
-            measurement_field_ids = ir_model_fields.search(
-                [
-                    ("model_id", "=", model_id.id),
-                    ("name", "in", payload.get("measurement_field_ids")),
-                ]
+            measurement_field_ids = ir_model_fields.concat(
+                *(
+                    get_field(model_id, name)
+                    for name in payload.get("measurement_field_ids") or []
+                )
             )
             if payload.get("measurement_field_ids") and len(
                 measurement_field_ids
             ) != len(payload.get("measurement_field_ids")):
                 unknown_field_list.extend(payload.get("measurement_field_ids"))
 
-            kpi_model_id = ir_model.search([("model", "=", payload.get("kpi_model"))])
+            kpi_model_id = models_by_name.get(payload.get("kpi_model"), ir_model)
             if payload.get("kpi_model") and not kpi_model_id:
                 unknown_model_list.append(payload.get("kpi_model"))
-            kpi_measurement_field_id = ir_model_fields.search(
-                [
-                    ("model_id", "=", kpi_model_id.id),
-                    ("name", "=", payload.get("kpi_measurement_field_id")),
-                ]
+            kpi_measurement_field_id = get_field(
+                kpi_model_id, payload.get("kpi_measurement_field_id")
             )
             if payload.get("kpi_measurement_field_id") and not kpi_measurement_field_id:
                 unknown_field_list.append(payload.get("kpi_measurement_field_id"))
-            kpi_date_filter_field_id = ir_model_fields.search(
-                [
-                    ("model_id", "=", kpi_model_id.id),
-                    ("name", "=", payload.get("kpi_date_filter_field_id")),
-                ]
+            kpi_date_filter_field_id = get_field(
+                kpi_model_id, payload.get("kpi_date_filter_field_id")
             )
             if payload.get("kpi_date_filter_field_id") and not kpi_date_filter_field_id:
                 unknown_field_list.append(payload.get("kpi_date_filter_field_id"))
@@ -392,12 +452,7 @@ class Dashboard(models.Model):
             list_measure_ids_list = []
             list_fields_ids_list = []
             for chart_multiplier in payload.get("chart_multiplier_ids"):
-                multiplier_field = ir_model_fields.search(
-                    [
-                        ("model_id", "=", model_id.id),
-                        ("name", "=", chart_multiplier.get("field_id")),
-                    ]
-                )
+                multiplier_field = get_field(model_id, chart_multiplier.get("field_id"))
                 if chart_multiplier.get("field_id") and not multiplier_field:
                     unknown_field_list.append(chart_multiplier.get("field_id"))
                 multiplier_list.append(
@@ -412,17 +467,11 @@ class Dashboard(models.Model):
                 )
             chart_dict["chart_multiplier_ids"] = multiplier_list
             for chart_list_measure in payload.get("list_measure_ids"):
-                list_field_id = ir_model_fields.search(
-                    [
-                        ("model_id", "=", model_id.id),
-                        ("name", "=", chart_list_measure.get("list_field_id")),
-                    ]
+                list_field_id = get_field(
+                    model_id, chart_list_measure.get("list_field_id")
                 )
-                list_measure_id = ir_model_fields.search(
-                    [
-                        ("model_id", "=", model_id.id),
-                        ("name", "=", chart_list_measure.get("list_measure_id")),
-                    ]
+                list_measure_id = get_field(
+                    model_id, chart_list_measure.get("list_measure_id")
                 )
                 if chart_list_measure.get("list_field_id") and not list_field_id:
                     unknown_field_list.append(chart_list_measure.get("list_field_id"))
@@ -442,17 +491,11 @@ class Dashboard(models.Model):
                 )
             chart_dict["list_measure_ids"] = list_measure_ids_list
             for chart_list_field in payload.get("list_field_ids"):
-                list_field_id = ir_model_fields.search(
-                    [
-                        ("model_id", "=", model_id.id),
-                        ("name", "=", chart_list_field.get("list_field_id")),
-                    ]
+                list_field_id = get_field(
+                    model_id, chart_list_field.get("list_field_id")
                 )
-                list_measure_id = ir_model_fields.search(
-                    [
-                        ("model_id", "=", model_id.id),
-                        ("name", "=", chart_list_field.get("list_measure_id")),
-                    ]
+                list_measure_id = get_field(
+                    model_id, chart_list_field.get("list_measure_id")
                 )
                 if chart_list_field.get("list_field_id") and not list_field_id:
                     unknown_field_list.append(chart_list_field.get("list_field_id"))
@@ -502,35 +545,44 @@ class Dashboard(models.Model):
             )
             if not dashboard_emails:
                 return False
+            chart_items = self._get_mail_chart_items(
+                dashboard_emails.chart_ids, image_types=("kpi", "tile")
+            )
             for mail in dashboard_emails:
-                items = []
-                charts = mail.chart_ids
-                for chart in charts:
-                    chart_dict = {}
-                    if chart.chart_type in ["kpi", "tile"]:
-                        chart_dict = {
-                            "chart_id": chart.id,
-                            "name": chart.name,
-                            "image": chart.html_to_image(),
-                        }
-                    else:
-                        chart_data = chart.get_chart_data(chart.chart_type, chart.name)
-                        chart_dict = {
-                            "chart_id": chart.id,
-                            "chart_type": chart.chart_type,
-                            "name": chart.name,
-                        }
-                        if "default_icon" in chart_data and chart_data.get(
-                            "default_icon"
-                        ):
-                            chart_data.update(
-                                {"kpi_icon": Markup(chart_data.get("default_icon"))}
-                            )
-                        chart_dict.update(chart_data)
-                    items.append(chart_dict)
+                items = [chart_items[chart.id] for chart in mail.chart_ids]
                 self.send_mail_to_users(mail, items)
             return True
 
+    def _get_mail_chart_items(
+        self, charts, image_types=("kpi", "tile", "to_do", "list")
+    ):
+        """
+        Prepare the mail items of the charts, every chart is rendered once and
+        the images in one batch. Returns {chart id: item}
+        """
+        image_charts = charts.filtered(lambda chart: chart.chart_type in image_types)
+        images = image_charts.html_to_image_batch() if image_charts else {}
+        items = {}
+        for chart in charts:
+            if chart.id in images:
+                items[chart.id] = {
+                    "chart_id": chart.id,
+                    "name": chart.name,
+                    "image": images[chart.id],
+                }
+                continue
+            chart_data = chart.get_chart_data(chart.chart_type, chart.name)
+            chart_dict = {
+                "chart_id": chart.id,
+                "chart_type": chart.chart_type,
+                "name": chart.name,
+            }
+            if "default_icon" in chart_data and chart_data.get("default_icon"):
+                chart_data.update({"kpi_icon": Markup(chart_data.get("default_icon"))})
+            chart_dict.update(chart_data)
+            items[chart.id] = chart_dict
+        return items
+
     def send_mail_to_users(self, mail, items):
         """
         Send chart emails to users
@@ -548,7 +600,7 @@ class Dashboard(models.Model):
             url=url,
             email_to=str(emails)[1:-1],
             name=self.name,
-        ).send_mail(self.id, force_send=True)
+        ).send_mail(self.id)
 
     def scheduled_send_email(self, dashboard_id):
         """
@@ -564,6 +616,7 @@ class Dashboard(models.Model):
             "default_email_layout_xmlid": "mail.mail_notification_layout_with_responsible_signature",
             "email_notification_allow_footer": True,
             "emailData": {},
+            "is_dashboard": True,
         }
 
         if len(self) > 1:
@@ -576,13 +629,31 @@ class Dashboard(models.Model):
                 }
             )
         if dashboard:
-            for mail in dashboard.dashboard_mail_ids.filtered(lambda m: m.is_automated):
-                composer_id = composer.with_context(**ctx).create(
-                    {"dashboard_id": dashboard.id}
+            mails = dashboard.dashboard_mail_ids.filtered(lambda m: m.is_automated)
+            # Charts shared by several mails are rendered once
+            charts = mails.chart_ids.filtered(
+                lambda chart: not (
+                    chart.chart_type == "to_do" and chart.todo_layout != "activity"
+                )
+            )
+            chart_items = dashboard._get_mail_chart_items(charts)
+            # Mails are queued and sent by the mail queue, not in this cron
+            ctx["mail_notify_force_send"] = False
+            for mail in mails:
+                mail_charts = mail.chart_ids & charts
+                # The body is rendered from the template with the items of
+                # the charts of the mail
+                composer_id = composer.with_context(
+                    **ctx, data=[chart_items[chart.id] for chart in mail_charts]
+                ).create(
+                    {
+                        "dashboard_id": dashboard.id,
+                        "dashboard_mail_id": mail.id,
+                        "template_id": mail.mail_template_id.id,
+                        "chart_ids": [(6, 0, mail_charts.ids)],
+                        "partner_ids": [(6, 0, mail.recipient_ids.ids)],
+                    }
                 )
-                composer_id.onchange_dashboard_id()
-                composer_id.dashboard_mail_id = mail.id
-                composer_id.onchange_dashboard_mail_id()
                 composer_id.action_send_mail()
 
         return True
@@ -658,16 +729,45 @@ class Dashboard(models.Model):
         action["context"] = context
         return action
 
-    def get_charts_details(self):
-        """
-        This function will return charts details and positioning and based on that
-        charts will show in dashboard's menu
-        """
+    def _check_dashboard_access(self):
         try:
             self.check_access_rights("read")
             if self.company_id and self.env.company.id != self.company_id.id:
-                return [1, [], "", False]
+                return False
         except Exception:
+            return False
+        return True
+
+    def _get_user_charts(self):
+        """
+        Return the charts of the dashboard the current user is allowed to see
+        """
+        user = self.env.user
+        user_groups = user.groups_id
+        kpi_charts = self.chart_ids.filtered(lambda chart: chart.chart_type == "kpi")
+        # Access is resolved once per distinct model of the dashboard
+        readable_models = {
+            model.id
+            for model in self.chart_ids.model_id | kpi_charts.kpi_model_id
+            if user.has_read_access(model)
+        }
+        return self.chart_ids.filtered(
+            lambda chart: (not chart.model_id or chart.model_id.id in readable_models)
+            and (
+                chart.chart_type != "kpi"
+                or not chart.kpi_model_id
+                or chart.kpi_model_id.id in readable_models
+            )
+            and (not chart.group_ids or chart.group_ids & user_groups)
+        )
+
+    def get_charts_details(self, with_data=True):
+        """
+        This function will return charts details and positioning and based on that
+        charts will show in dashboard's menu, without with_data only the layout is
+        returned and the charts data is fetched with get_charts_data
+        """
+        if not self._check_dashboard_access():
             return [1, [], "", False]
         chart_data_list = []
         grid_stack = self.grid_stack_dimensions or []
@@ -681,22 +781,9 @@ class Dashboard(models.Model):
             and not user.has_group("synconics_bi_dashboard.group_dashboard_manager")
         ):
             is_dashboard_user = True
-        user_groups = user.groups_id.ids
-        for chart in self.chart_ids:
-            if (
-                (chart.model_id and not user.has_read_access(chart.model_id))
-                or (
-                    chart.chart_type == "kpi"
-                    and chart.kpi_model_id
-                    and not user.has_read_access(chart.kpi_model_id)
-                )
-                or (
-                    chart.group_ids
-                    and not chart.group_ids.filtered(lambda g: g.id in user_groups)
-                )
-            ):
-                continue
-
+        charts = self._get_user_charts()
+        chart_dims = {}
+        for chart in charts:
             if chart.id not in existing_ids:
                 x, y = self.find_next_position(
                     grid_stack, 4 if chart.chart_type not in ["tile", "kpi"] else 2
@@ -719,17 +806,27 @@ class Dashboard(models.Model):
                     else 0
                 }
             )
-            chart_data_list.append(
-                {
-                    "id": str(chart.id),
-                    "name": chart.name,
-                    "chart_type": chart.chart_type,
-                    "theme": chart.theme,
-                    "recordset": chart.get_chart_data(chart.chart_type, chart.name),
-                    "background_color": chart.background_color,
-                    **{k: dim[k] for k in ("x", "y", "h", "w", "minh")},
-                }
-            )
+            chart_dims[chart.id] = dim
+
+        charts = charts.sorted(
+            key=lambda c: (chart_dims[c.id]["y"] or 0, chart_dims[c.id]["x"] or 0)
+        )
+        charts_data = self._get_charts_data(charts) if with_data else {}
+        for chart in charts:
+            dim = chart_dims[chart.id]
+            chart_details = {
+                "id": str(chart.id),
+                "name": chart.name,
+                "chart_type": chart.chart_type,
+                "theme": chart.theme,
+                "background_color": chart.background_color,
+                "snapshot_generated_at": chart.snapshot_mode
+                and fields.Datetime.to_string(chart.snapshot_generated_at),
+                **{k: dim[k] for k in ("x", "y", "h", "w", "minh")},
+            }
+            if with_data:
+                chart_details["recordset"] = charts_data[chart.id]
+            chart_data_list.append(chart_details)
 
         return [
             int(self.auto_reload_duration),
@@ -738,6 +835,192 @@ class Dashboard(models.Model):
             is_dashboard_user,
         ]
 
+    def get_charts_layout(self):
+        """
+        Return the dashboard layout without computing the charts
+        """
+        return self.get_charts_details(with_data=False)
+
+    def get_charts_data(self, chart_ids):
+        """
+        Return {chart id: chart data} for the given charts of the dashboard
+        """
+        self.ensure_one()
+        if not self._check_dashboard_access():
+            return {}
+        chart_ids = {int(chart_id) for chart_id in chart_ids}
+        charts = self._get_user_charts().filtered(lambda c: c.id in chart_ids)
+        return {
+            str(chart_id): chart_data
+            for chart_id, chart_data in self._get_charts_data(charts).items()
+        }
+
+    def _get_charts_data(self, charts):
+        """
+        Compute charts data concurrently from a bounded pool of threads. Charts
+        querying the same records (see dashboard.chart._get_shared_query_key)
+        are computed together in one cursor and run their identical searches
+        and grouped queries once, each in a savepoint so that a failing chart
+        is replaced by an error without aborting the others. A chart running
+        longer than the dashboard timeout is replaced by an error so it doesn't
+        block the other charts, with the charts of its group not computed yet.
+        The running statement of its cursor is cancelled, and its thread stops
+        before the next chart.
+        Returns a dict of chart id: chart data
+        """
+        registry = self.env.registry
+        max_workers = int(
+            self.env["ir.config_parameter"]
+            .sudo()
+            .get_param("synconics_bi_dashboard.chart_workers", 4)
+        )
+        if max_workers <= 1 or len(charts) <= 1 or registry.in_test_mode():
+            charts = charts.with_context(
+                dashboard_shared_queries=LRUCache(SHARED_QUERIES_SIZE)
+            )
+            return {
+                chart.id: chart.get_chart_data(chart.chart_type, chart.name)
+                for chart in charts
+            }
+
+        chart_groups = defaultdict(list)
+        for chart in charts:
+            key = chart._get_shared_query_key() or ("chart", chart.id)
+            chart_groups[key].append(chart.id)
+
+        dbname = self.env.cr.dbname
+        uid, context, su = self.env.uid, dict(self.env.context), self.env.su
+        timeout = self.chart_timeout
+        # Start time of the running chart and computed charts of each group
+        started = {}
+        computed = {}
+        # Backend pid of the cursor of each running group, and abandoned groups
+        backends = {}
+        backends_lock = threading.Lock()
+        abandoned = set()
+        load_error = {"type": "error", "message": _("This chart could not be loaded!")}
+        timeout_error = {
+            "type": "error",
+            "message": _("This chart took too long to load!"),
+        }
+
+        def compute_charts_data(chart_ids):
+            started[chart_ids] = time.monotonic()
+            threading.current_thread().dbname = dbname
+            with registry.cursor() as cr:
+                cr.execute("SELECT pg_backend_pid()")
+                backends[chart_ids] = cr.fetchone()[0]
+                try:
+                    if timeout:
+                        cr.execute("SET LOCAL statement_timeout = %s", [timeout * 1000])
+                    env = api.Environment(
+                        cr,
+                        uid,
+                        dict(
+                            context,
+                            dashboard_shared_queries=LRUCache(SHARED_QUERIES_SIZE),
+                        ),
+                        su=su,
+                    )
+                    charts_data = computed[chart_ids] = {}
+                    for chart in env["dashboard.chart"].browse(chart_ids):
+                        if chart_ids in abandoned:
+                            break
+                        started[chart_ids] = time.monotonic()
+                        # A failing chart doesn't abort the others of its group
+                        try:
+                            with cr.savepoint():
+                                charts_data[chart.id] = chart.get_chart_data(
+                                    chart.chart_type, chart.name
+                                )
+                        except Exception:
+                            _logger.exception(
+                                "Failed to load dashboard chart %s", chart.id
+                            )
+                            charts_data[chart.id] = dict(load_error)
+                    return charts_data
+                finally:
+                    # The connection goes back to the pool, it must not be
+                    # cancelled anymore
+                    with backends_lock:
+                        backends.pop(chart_ids, None)
+
+        charts_data = {}
+        executor = ThreadPoolExecutor(
+            max_workers=min(max_workers, len(chart_groups)),
+            thread_name_prefix="dashboard_chart",
+        )
+        futures = {
+            executor.submit(compute_charts_data, tuple(chart_ids)): tuple(chart_ids)
+            for chart_ids in chart_groups.values()
+        }
+
+        def deadline(chart_ids):
+            return started[chart_ids] + timeout
+
+        pending = set(futures)
+        try:
+            while pending:
+                wait_time = None
+                if timeout:
+                    running = [
+                        deadline(futures[f]) for f in pending if futures[f] in started
+                    ]
+                    wait_time = max(
+                        (min(running) if running else time.monotonic() + timeout)
+                        - time.monotonic(),
+                        0,
+                    )
+                done, pending = wait(
+                    pending, timeout=wait_time, return_when=FIRST_COMPLETED
+                )
+                for future in done:
+                    chart_ids = futures[future]
+                    try:
+                        charts_data.update(future.result())
+                    except Exception:
+                        _logger.exception(
+                            "Failed to load dashboard charts %s", list(chart_ids)
+                        )
+                        charts_data.update(
+                            {chart_id: dict(load_error) for chart_id in chart_ids}
+                        )
+                if not timeout:
+                    continue
+                now = time.monotonic()
+                for future in list(pending):
+                    chart_ids = futures[future]
+                    if chart_ids in started and now >= deadline(chart_ids):
+                        pending.discard(future)
+                        abandoned.add(chart_ids)
+                        self._cancel_chart_backend(backends, backends_lock, chart_ids)
+                        # The charts computed before the slow one are kept
+                        group_data = dict(computed.get(chart_ids, {}))
+                        charts_data.update(
+                            {
+                                chart_id: group_data.get(chart_id, dict(timeout_error))
+                                for chart_id in chart_ids
+                            }
+                        )
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        return charts_data
+
+    def _cancel_chart_backend(self, backends, backends_lock, chart_ids):
+        """
+        Cancel the running statement of the cursor computing the charts, its
+        transaction is aborted and rolled back. The statement of a cursor
+        sharing the connection of the current one, as in tests, is kept.
+        """
+        with backends_lock:
+            pid = backends.get(chart_ids)
+            if not pid:
+                return
+            self.env.cr.execute(
+                "SELECT pg_cancel_backend(%s) WHERE %s != pg_backend_pid()",
+                [pid, pid],
+            )
+
     def find_next_position(self, items, new_width, grid_columns=12):
         """
         In case of in any charts positioning is not saved then this function will evaluate positioning
@@ -819,7 +1102,18 @@ class Dashboard(models.Model):
                 rec.created_action_id.write({"name": vals["name"]})
             if "parent_menu_id" in vals and rec.created_menu_id:
                 rec.created_menu_id.write({"parent_id": vals["parent_menu_id"]})
-        return super(Dashboard, self).write(vals)
+        res = super(Dashboard, self).write(vals)
+        if "cache_ttl" in vals:
+            self.env["dashboard.chart"]._bump_configuration_version()
+        return res
+
+    def action_clear_chart_cache(self):
+        """
+        Drop cached charts data and reset the cache counters
+        """
+        chart_ids = self.mapped("chart_ids").ids
+        chart_data_cache.invalidate_chart(self.env.cr.dbname, chart_ids)
+        chart_data_cache.reset_stats(self.env.cr.dbname, chart_ids)
 
     def action_delete_menu(self):
         """
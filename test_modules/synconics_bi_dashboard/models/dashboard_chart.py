@@ -1,23 +1,33 @@
 import io
 import csv
+import copy
+import json
 import base64
+import hashlib
+import threading
 import xlsxwriter
 import imgkit
 import logging
+import pytz
+import random
 
 from math import gcd
+from time import perf_counter
 from markupsafe import Markup
 from types import SimpleNamespace
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, date, time
 from dateutil.relativedelta import relativedelta
 
-from odoo import models, fields, api, _
-from odoo.tools import groupby, format_amount
+from odoo import models, fields, api, tools, _
+from odoo.tools import SQL, groupby, format_amount, split_every, date_utils
 from odoo.tools.safe_eval import safe_eval
 from odoo.osv import expression
 from odoo.exceptions import ValidationError
 
+from .chart_cache import chart_data_cache, domain_cache, rendered_image_cache
+
 _logger = logging.getLogger(__name__)
 
 
@@ -37,6 +47,79 @@ def safe_datetime_combine(date_obj, time_obj):
     return UTCDatetime(combined)
 
 
+class OdooSafeDatetime:
+    def __init__(self, dt):
+        self._dt = dt
+
+    def to_utc(self):
+        if hasattr(self._dt, "replace") and self._dt.tzinfo is None:
+            # If datetime is naive, treat as UTC
+            utc_dt = self._dt
+        else:
+            utc_dt = fields.Datetime.to_datetime(self._dt)
+        return OdooSafeDatetime(utc_dt)
+
+    def strftime(self, fmt):
+        return self._dt.strftime(fmt)
+
+
+class OdooDatetimeClass:
+    @staticmethod
+    def combine(date_obj, time_obj):
+        combined = datetime.combine(date_obj, time_obj)
+        return OdooSafeDatetime(combined)
+
+
+class DatetimeModule:
+    datetime = OdooDatetimeClass
+    time = time
+
+
+IMAGE_OPTIONS = {
+    "encoding": "UTF-8",
+    "zoom": "1",
+}
+RENDER_WORKERS = 4
+LIST_PAGE_SIZE = 10
+LIST_MAX_PAGE_SIZE = 500
+_render_pool = None
+_render_pool_lock = threading.Lock()
+
+
+def get_render_pool():
+    """
+    Return the pool of threads shared by the image renderings of the worker
+    """
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is None:
+            _render_pool = ThreadPoolExecutor(
+                max_workers=RENDER_WORKERS, thread_name_prefix="dashboard_render"
+            )
+    return _render_pool
+
+
+def render_html_images(html_pages):
+    """
+    Render html pages to jpeg data urls. Pages are rendered concurrently and
+    cached by content hash, so an unchanged chart is rendered only once
+    """
+    keys = [hashlib.sha256(html.encode()).hexdigest() for html in html_pages]
+    images = {key: rendered_image_cache.get(key) for key in keys}
+    futures = {
+        key: get_render_pool().submit(
+            imgkit.from_string, html, False, options=IMAGE_OPTIONS
+        )
+        for key, html in zip(keys, html_pages)
+        if images[key] is None
+    }
+    for key, future in futures.items():
+        img_base64 = base64.b64encode(future.result()).decode("UTF-8")
+        images[key] = f"data:image/jpeg;base64,{img_base64}"
+        rendered_image_cache.set(key, images[key])
+    return [images[key] for key in keys]
+
+
 def format_date_by_range(value, time_range):
     if not isinstance(value, (date, datetime)):
         return str(value)  # fallback if it's not a date/datetime
@@ -62,6 +145,11 @@ def format_date_by_range(value, time_range):
         return str(value)  # default fallback
 
 
+# Field types the chart handlers can group/aggregate with a single SQL query
+DB_GROUPBY_TYPES = ("many2one", "selection", "char", "boolean", "date", "datetime")
+DB_MEASURE_TYPES = ("integer", "float", "monetary")
+
+
 class DashboardChart(models.Model):
     _name = "dashboard.chart"
     _description = "Dashboard Charts"
@@ -512,6 +600,63 @@ class DashboardChart(models.Model):
         default="600",
     )
     hide_false_value = fields.Boolean(string="Hide False", default=True)
+    snapshot_mode = fields.Boolean(
+        string="Snapshot",
+        help="Serve the chart from a snapshot refreshed by a scheduled job instead of computing it on every load",
+    )
+    snapshot_interval = fields.Integer(
+        string="Snapshot Interval",
+        default=60,
+        help="Minutes between two refreshes of the snapshot",
+    )
+    snapshot_user_id = fields.Many2one(
+        "res.users",
+        string="Snapshot User",
+        default=lambda self: self.env.user,
+        help="The snapshot is computed with the access rights and company of this "
+        "user, the users with other access rights see the chart computed live",
+    )
+    snapshot_ids = fields.One2many(
+        "dashboard.chart.snapshot", "chart_id", string="Snapshots"
+    )
+    snapshot_generated_at = fields.Datetime(
+        string="Snapshot Generated At", compute="_compute_snapshot_generated_at"
+    )
+
+    render_count = fields.Integer(
+        string="Renders",
+        compute="_compute_render_stats",
+        help="Number of sampled renders the statistics are computed from",
+    )
+    avg_render_time = fields.Float(
+        string="Avg Render Time (ms)", compute="_compute_render_stats"
+    )
+    p95_render_time = fields.Float(
+        string="P95 Render Time (ms)", compute="_compute_render_stats"
+    )
+    avg_query_count = fields.Float(
+        string="Avg Queries", compute="_compute_render_stats"
+    )
+
+    @api.depends("snapshot_ids.generated_at")
+    def _compute_snapshot_generated_at(self):
+        for chart in self:
+            chart.snapshot_generated_at = chart.snapshot_ids[:1].generated_at
+
+    def _compute_render_stats(self):
+        chart_ids = [chart_id for chart_id in self.ids if isinstance(chart_id, int)]
+        performances = {
+            performance.chart_id.id: performance
+            for performance in self.env["dashboard.chart.performance"]
+            .sudo()
+            .search([("chart_id", "in", chart_ids)])
+        }
+        for chart in self:
+            performance = performances.get(chart.id)
+            chart.render_count = performance.render_count if performance else 0
+            chart.avg_render_time = performance.avg_duration if performance else 0
+            chart.p95_render_time = performance.p95_duration if performance else 0
+            chart.avg_query_count = performance.avg_query_count if performance else 0
 
     @api.model
     def name_search(self, name="", args=None, operator="ilike", limit=100):
@@ -919,6 +1064,8 @@ class DashboardChart(models.Model):
                     writer.writerow([row["name"], row["value"]])
                 else:
                     writer.writerow([row["category"], row["value"]])
+        elif chart_type == "list" and "total" in data:
+            writer.writerows(self._iter_list_export_rows())
         elif chart_type == "list":
             column_lists = list(map(lambda col: col.get("name"), data["columns"]))
             writer.writerow(column_lists)
@@ -1139,6 +1286,10 @@ class DashboardChart(models.Model):
             records = data["records"]
 
             column_order = [col["column_name"] for col in columns]
+            if "total" in data:
+                rows = self._iter_list_export_rows()
+                next(rows)
+                records = [dict(zip(column_order, row)) for row in rows]
             column_headers = [col["name"] for col in columns]
             write_headers(
                 worksheet,
@@ -1243,42 +1394,23 @@ class DashboardChart(models.Model):
         }
 
     def evaluate_odoo_domain(self, domain_string):
-        class OdooSafeDatetime:
-            def __init__(self, dt):
-                self._dt = dt
-
-            def to_utc(self):
-                if hasattr(self._dt, "replace") and self._dt.tzinfo is None:
-                    # If datetime is naive, treat as UTC
-                    utc_dt = self._dt
-                else:
-                    utc_dt = fields.Datetime.to_datetime(self._dt)
-                return OdooSafeDatetime(utc_dt)
-
-            def strftime(self, fmt):
-                return self._dt.strftime(fmt)
-
-        class OdooDatetimeClass:
-            @staticmethod
-            def combine(date_obj, time_obj):
-                combined = datetime.combine(date_obj, time_obj)
-                return OdooSafeDatetime(combined)
-
-        class DatetimeModule:
-            datetime = OdooDatetimeClass
-            time = time
-
-        def get_context_today():
-            return fields.Datetime.context_timestamp(self, datetime.now()).date()
-
+        """
+        Evaluate the domain string with safe_eval. Only context_today varies
+        between evaluations, so the result is cached per domain string and day
+        """
+        today = fields.Datetime.context_timestamp(self, datetime.now()).date()
         eval_context = {
             "datetime": DatetimeModule(),
-            "context_today": get_context_today,
+            "context_today": lambda: today,
             "relativedelta": relativedelta,
         }
 
         try:
-            return safe_eval(domain_string, eval_context)
+            domain = domain_cache.get(
+                (domain_string, today),
+                lambda key: safe_eval(domain_string, eval_context),
+            )
+            return copy.deepcopy(domain)
         except Exception as e:
             _logger.warning(f"Failed to evaluate domain: {domain_string}, Error: {e}")
             return []
@@ -1299,6 +1431,24 @@ class DashboardChart(models.Model):
         also In case of there is item action and item views are linked to charts then in
         each click on chart this function will redirect action or replace current chart
         """
+        cache_key = False
+        if not (isDirty or extra_action or print_options):
+            snapshot = self._get_snapshot(chart_type)
+            if snapshot:
+                return snapshot.data
+            cache_key = self._get_chart_cache_key(chart_type)
+        if cache_key:
+            # Pending changes are written first, they drop the cached charts
+            for model_name in self._get_cache_model_names():
+                self.env[model_name].flush_model()
+            # Read before computing, changes committed meanwhile drop the entry
+            versions = self.env["dashboard.chart.cache.version"]._get_versions(
+                self._get_cache_model_names()
+            )
+            cached_data = chart_data_cache.get(cache_key, versions)
+            if cached_data is not None:
+                return cached_data
+        start, query_count = perf_counter(), self.env.cr.sql_log_count
         conf, domain = self._init_configuration()
         if isDirty:
             self._handle_dirty_data(conf, data)
@@ -1354,9 +1504,257 @@ class DashboardChart(models.Model):
             "to_do": self.get_todo_data,
         }
         prepared_data = chart_handlers.get(chart_type, lambda x: [])(conf)
-        return self._build_final_response(
+        chart_data = self._build_final_response(
             prepared_data, domain, chart_type, view_item, extra_action
         )
+        if not (isDirty or print_options) and isinstance(self.id, int):
+            self._record_render_stat(
+                chart_type,
+                chart_data,
+                (perf_counter() - start) * 1000,
+                self.env.cr.sql_log_count - query_count,
+            )
+        if cache_key:
+            self._set_chart_cache(cache_key, chart_data, versions)
+        return chart_data
+
+    def _record_render_stat(self, chart_type, chart_data, duration, query_count):
+        """
+        Store render time, query count and size of a computed chart. Only a
+        sample of the renders is stored, the share is set by the
+        synconics_bi_dashboard.render_stat_rate parameter (0 disables them)
+        """
+        rate = float(
+            self.env["ir.config_parameter"]
+            .sudo()
+            .get_param("synconics_bi_dashboard.render_stat_rate", 0.1)
+        )
+        if rate <= 0 or random.random() >= rate:
+            return
+        if isinstance(chart_data, list):
+            row_count = len(chart_data)
+        elif not isinstance(chart_data, dict) or chart_data.get("type") == "error":
+            row_count = 0
+        elif isinstance(chart_data.get("records"), list):
+            row_count = chart_data.get("total", len(chart_data["records"]))
+        else:
+            row_count = 1
+        self.env["dashboard.chart.stat"].sudo().create(
+            {
+                "chart_id": self.id,
+                "chart_type": chart_type,
+                "duration": duration,
+                "query_count": query_count,
+                "row_count": row_count,
+                "payload_size": len(json.dumps(chart_data, default=str)),
+            }
+        )
+
+    @api.model
+    @tools.ormcache("model_name")
+    def _model_rules_depend_on_user(self, model_name):
+        """
+        Check if record rules of the model filter records per user
+        """
+        rules = (
+            self.env["ir.rule"]
+            .sudo()
+            .search([("model_id.model", "=", model_name), ("active", "=", True)])
+        )
+        return any("user" in (rule.domain_force or "") for rule in rules)
+
+    def _get_access_key(self):
+        """
+        Return what decides the records of the chart the current user can
+        read: rights, companies and the user when record rules depend on it
+        """
+        user = self.env.user
+        access_key = (
+            self.env.su,
+            tuple(sorted(user.groups_id.ids)),
+            self.env.company.id,
+            tuple(self.env.companies.ids),
+        )
+        if any(
+            self._model_rules_depend_on_user(model.model)
+            for model in self.model_id | self.kpi_model_id
+        ):
+            access_key += (user.id,)
+        return access_key
+
+    def _get_chart_cache_key(self, chart_type):
+        """
+        Prepare cache key of the chart data, False when cache is disabled
+        """
+        self.ensure_one()
+        ttl = self.dashboard_id.cache_ttl
+        if not ttl or not isinstance(self.id, int):
+            return False
+        return (
+            self.env.cr.dbname,
+            self.id,
+            chart_type,
+            str(self.write_date),
+            repr(self.evaluate_odoo_domain(self.domain) if self.domain else []),
+            repr(self.evaluate_odoo_domain(self.kpi_domain) if self.kpi_domain else []),
+            self._get_access_key(),
+            fields.Date.context_today(self),
+            self.env.lang,
+        )
+
+    def _get_cache_model_names(self):
+        """
+        Return the models the cached data of the chart is computed from
+        """
+        model_names = {
+            model.model for model in self.model_id | self.kpi_model_id if model.model
+        }
+        if self.chart_type == "to_do":
+            model_names.add("mail.activity")
+        return sorted(model_names)
+
+    @api.model
+    def _get_cached_model_names(self):
+        """
+        Return the models of the charts of the dashboards using the cache, in
+        all the workers
+        """
+        pending = self.env.cr.postcommit.data.get("dashboard_chart_cache", ())
+        if self._name in pending:
+            # The charts changed in this transaction, not counted yet
+            return self._read_cached_model_names()
+        [version] = self.env["dashboard.chart.cache.version"]._get_versions(
+            [self._name]
+        )
+        return self._get_cached_model_names_version(version)
+
+    @api.model
+    @tools.ormcache("version")
+    def _get_cached_model_names_version(self, version):
+        """
+        Cached per change counter of the charts configuration
+        """
+        return self._read_cached_model_names()
+
+    @api.model
+    def _read_cached_model_names(self):
+        charts = self.sudo().search([("dashboard_id.cache_ttl", ">", 0)])
+        return frozenset(
+            model_name
+            for chart in charts
+            for model_name in chart._get_cache_model_names()
+        )
+
+    def _set_chart_cache(self, cache_key, chart_data, versions):
+        """
+        Store chart data in cache, it is dropped on any change of the records
+        of the chart models
+        """
+        model_names = self._get_cache_model_names()
+        max_size = (
+            self.env["ir.config_parameter"]
+            .sudo()
+            .get_param("synconics_bi_dashboard.chart_cache_size", 256)
+        )
+        chart_data_cache.set(
+            cache_key,
+            chart_data,
+            model_names,
+            self.dashboard_id.cache_ttl,
+            int(max_size),
+            versions,
+        )
+
+    def write(self, vals):
+        res = super(DashboardChart, self).write(vals)
+        chart_data_cache.invalidate_chart(self.env.cr.dbname, self.ids)
+        if {"model_id", "kpi_model_id", "chart_type", "dashboard_id"} & set(vals):
+            self._bump_configuration_version()
+        if set(vals) - {"snapshot_interval", "snapshot_ids"}:
+            # The configuration changed, snapshots are computed again
+            self.snapshot_ids.sudo().unlink()
+        return res
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        charts = super(DashboardChart, self).create(vals_list)
+        self._bump_configuration_version()
+        return charts
+
+    def unlink(self):
+        chart_data_cache.invalidate_chart(self.env.cr.dbname, self.ids)
+        self._bump_configuration_version()
+        return super(DashboardChart, self).unlink()
+
+    @api.model
+    def _bump_configuration_version(self):
+        """
+        The models whose changes drop cached charts are listed again by all
+        the workers after commit
+        """
+        self.env["dashboard.chart.cache.version"]._bump_versions_after_commit(
+            [self._name]
+        )
+
+    def _get_snapshot(self, chart_type):
+        """
+        Return the snapshot to serve for the chart type, if any. It is only
+        served to the users reading the same records as the snapshot user, the
+        others get the chart computed for them.
+        """
+        if not self.snapshot_mode or self.env.context.get("dashboard_snapshot_refresh"):
+            return self.env["dashboard.chart.snapshot"]
+        access_key = repr(self._get_access_key())
+        return self.snapshot_ids.filtered(
+            lambda s: s.chart_type == chart_type and s.access_key == access_key
+        )[:1]
+
+    def _refresh_snapshot(self):
+        """
+        Compute the charts as their snapshot user and store the result
+        """
+        for chart in self:
+            user = chart.snapshot_user_id or chart.create_uid
+            chart_as_user = chart.with_user(user).with_company(user.company_id)
+            chart_data = chart_as_user.with_context(
+                tz=user.tz, lang=user.lang, dashboard_snapshot_refresh=True
+            ).get_chart_data(chart.chart_type, chart.name)
+            vals = {
+                "chart_type": chart.chart_type,
+                "access_key": repr(chart_as_user._get_access_key()),
+                # Store what the client receives, dates as strings
+                "data": json.loads(json.dumps(chart_data, default=str)),
+                "generated_at": fields.Datetime.now(),
+            }
+            if chart.snapshot_ids:
+                chart.snapshot_ids.sudo().write(vals)
+            else:
+                self.env["dashboard.chart.snapshot"].sudo().create(
+                    dict(vals, chart_id=chart.id)
+                )
+
+    def action_refresh_snapshot(self):
+        self._refresh_snapshot()
+        return True
+
+    @api.model
+    def _cron_refresh_snapshots(self):
+        """
+        Refresh the snapshots older than their chart interval
+        """
+        now = fields.Datetime.now()
+        charts = self.search([("snapshot_mode", "=", True)]).filtered(
+            lambda c: not c.snapshot_generated_at
+            or c.snapshot_generated_at + timedelta(minutes=c.snapshot_interval) <= now
+        )
+        for chart in charts:
+            try:
+                with self.env.cr.savepoint():
+                    chart._refresh_snapshot()
+            except Exception:
+                _logger.exception(
+                    "Failed to refresh the snapshot of chart %s", chart.id
+                )
 
     def _init_configuration(self):
         """
@@ -1450,7 +1848,29 @@ class DashboardChart(models.Model):
         )
         return conf, conf.domain.copy()
 
+    def _get_image_charts(self):
+        """
+        Return the charts sent by email as an image
+        """
+        return self.filtered(
+            lambda c: c.chart_type in ["kpi", "tile", "list"]
+            or (c.chart_type == "to_do" and c.todo_layout == "activity")
+        )
+
     def html_to_image(self):
+        return self.html_to_image_batch()[self.id]
+
+    def html_to_image_batch(self):
+        """
+        Render the charts to images in one batch, returns {chart id: data url}
+        """
+        html_pages = [chart._get_image_html() for chart in self]
+        return dict(zip(self.ids, render_html_images(html_pages)))
+
+    def _get_image_html(self):
+        """
+        Return the html page rendered as the chart image
+        """
         chart_data = self.get_chart_data(self.chart_type, self.name)
         recordsets = {
             "chart_id": self.id,
@@ -1469,13 +1889,18 @@ class DashboardChart(models.Model):
             if records is None:
                 image_height = 500
             else:
+                row_count = recordsets.get("total", len(records))
                 image_height = 200
-                if len(records) > 5:
-                    image_height = 280 * (len(records) / 6)
+                if row_count > 5:
+                    image_height = 280 * (row_count / 6)
                     if image_height < 280:
                         image_height = 280
-                elif len(records) <= 2:
+                elif row_count <= 2:
                     image_height = 150
+                if row_count > len(records) and image_height <= 6000:
+                    recordsets["records"] = self.get_list_page(limit=row_count)[
+                        "records"
+                    ]
             if image_height > 6000:
                 recordsets.update(
                     {
@@ -1627,15 +2052,7 @@ class DashboardChart(models.Model):
             </body>
         </html>
         """
-
-        options = {
-            "encoding": "UTF-8",
-            "zoom": "1",
-        }
-        img_binary = imgkit.from_string(full_html, False, options=options)
-        img_base64 = base64.b64encode(img_binary).decode("UTF-8")
-        img_data_url = f"data:image/jpeg;base64,{img_base64}"
-        return img_data_url
+        return full_html
 
     def _handle_dirty_data(self, conf, data):
         """
@@ -1759,24 +2176,16 @@ class DashboardChart(models.Model):
             )
         return domain
 
-    def get_tile_data(self, conf_obj, previous=0):
+    def _get_tile_domains(self, conf_obj, record_obj, previous=0):
         """
-        Calculate and get data for the Tile view
+        Return (domain, date domain, period message) of the Tile view
         """
-        if not conf_obj.model:
-            return {"type": "error", "message": "Please Select model!"}
-        if not conf_obj.measurement_field_id and conf_obj.data_type in [
-            "sum",
-            "average",
-        ]:
-            return {"type": "error", "message": "Please Select measurement!"}
-        record_obj = self.env[conf_obj.model]
         message = ""
-        today_date = False
         domain = conf_obj.domain.copy()
         if conf_obj.company and "company_id" in record_obj._fields:
             domain.append(("company_id", "in", [conf_obj.company, False]))
 
+        date_domain = []
         if (
             conf_obj.date_filter_field
             and conf_obj.date_filter_option
@@ -1797,44 +2206,46 @@ class DashboardChart(models.Model):
                     start_date.strftime("%d %b, %y"),
                     end_date.strftime("%d %b, %y"),
                 )
-                if (
-                    start_date
-                    and end_date
-                    and start_date.date()
-                    and end_date.date()
-                    and start_date.date() != end_date.date()
-                ):
-                    domain.extend(date_filter_domain["domain"])
-                else:
-                    today_date = start_date.date()
-
-        all_records = record_obj.search(domain)
-        if today_date:
-            all_records = all_records.filtered(
-                lambda record: getattr(record, conf_obj.date_filter_field)
-                and (
-                    getattr(record, conf_obj.date_filter_field).date()
-                    if isinstance(getattr(record, conf_obj.date_filter_field), datetime)
-                    else getattr(record, conf_obj.date_filter_field)
-                )
-                == today_date
-            )
+                date_domain = date_filter_domain["domain"]
+        return domain, date_domain, message
 
-        if conf_obj.sort_order and conf_obj.sort_field:
-            sorted_record = all_records.filtered(
-                lambda arft: getattr(arft, conf_obj.sort_field)
-            ).sorted(
-                key=lambda sr: getattr(sr, conf_obj.sort_field).name
-                if isinstance(getattr(sr, conf_obj.sort_field), models.Model)
-                else getattr(sr, conf_obj.sort_field),
-                reverse=True if conf_obj.sort_order == "desc" else False,
-            )
-            sorted_record |= all_records.filtered(
-                lambda arft: not getattr(arft, conf_obj.sort_field)
-            )
-            all_records = sorted_record
-        if conf_obj.limit_record > 0:
-            all_records = all_records[: conf_obj.limit_record]
+    def get_tile_data(self, conf_obj, previous=0, count=None):
+        """
+        Calculate and get data for the Tile view, count is given when it was
+        already computed with the other KPI values
+        """
+        if not conf_obj.model:
+            return {"type": "error", "message": "Please Select model!"}
+        if not conf_obj.measurement_field_id and conf_obj.data_type in [
+            "sum",
+            "average",
+        ]:
+            return {"type": "error", "message": "Please Select measurement!"}
+        record_obj = self.env[conf_obj.model]
+        domain, date_domain, message = self._get_tile_domains(
+            conf_obj, record_obj, previous
+        )
+        if count is not None:
+            return self._prepare_tile_data(conf_obj, record_obj, count, message)
+        domain.extend(date_domain)
+
+        measures = []
+        if conf_obj.data_type in ["sum", "average"]:
+            measures = [conf_obj.measurement_field_id.name]
+        if self._can_aggregate_in_db(conf_obj, record_obj, measures=measures):
+            count, *totals = self._read_chart_groups(
+                conf_obj, record_obj, domain, [], measures
+            )[0]
+            if totals:
+                total = totals[0] or 0
+                if conf_obj.data_type == "average" and total != 0:
+                    total /= count
+                count = total
+            return self._prepare_tile_data(conf_obj, record_obj, count, message)
+
+        all_records = self._search_chart_records(
+            conf_obj, record_obj, domain, conf_obj.limit_record
+        )
 
         count = 0
         if conf_obj.data_type == "count":
@@ -1847,6 +2258,12 @@ class DashboardChart(models.Model):
             count = sum(count_list)
             if conf_obj.data_type == "average" and count != 0:
                 count /= len(count_list)
+        return self._prepare_tile_data(conf_obj, record_obj, count, message)
+
+    def _prepare_tile_data(self, conf_obj, record_obj, count, message):
+        """
+        Prepare Tile view values from the computed count
+        """
         if conf_obj.is_apply_multiplier and conf_obj.chart_multiplier_ids:
             if conf_obj.data_type in ["count", "sum", "average"]:
                 count *= conf_obj.chart_multiplier_ids[0].get("multiplier")
@@ -1883,6 +2300,148 @@ class DashboardChart(models.Model):
             "message": message,
         }
 
+    def _get_kpi_domain(self, conf_obj, record_obj):
+        """
+        Return the domain of the second KPI model
+        """
+        domain = conf_obj.kpi_domain[:]
+        if conf_obj.company and "company_id" in record_obj._fields:
+            domain.append(("company_id", "in", [conf_obj.company, False]))
+        if (
+            conf_obj.kpi_date_filter_field_id
+            and conf_obj.kpi_date_filter_option
+            and conf_obj.kpi_date_filter_option != "none"
+        ):
+            date_domain = self.get_date_filter_domain(
+                record_obj,
+                conf_obj.kpi_date_filter_field_id,
+                conf_obj.kpi_date_filter_option,
+                conf_obj.kpi_include_periods,
+                conf_obj.kpi_same_period_previous_years,
+            )
+            domain += date_domain["domain"]
+        return domain
+
+    def _get_kpi_values(self, conf_obj):
+        """
+        Compute the current period, previous period and second KPI values in
+        one round-trip. Returns a dict with the "current", "previous" and
+        "secondary" values that could be computed in the database, the
+        missing ones are computed by the Python path.
+        """
+        parts = []
+        keys = []
+        if conf_obj.model and (
+            conf_obj.measurement_field_id or conf_obj.data_type == "count"
+        ):
+            record_obj = self.env[conf_obj.model]
+            measure = False
+            if conf_obj.data_type in ["sum", "average"]:
+                measure = conf_obj.measurement_field_id.name
+            date_field = record_obj._fields.get(conf_obj.date_filter_field or "")
+            if (
+                self._can_aggregate_in_db(
+                    conf_obj, record_obj, measures=[measure] if measure else []
+                )
+                and conf_obj.limit_record <= 0
+                and (not date_field or date_field.store)
+            ):
+                domain, current_domain, __ = self._get_tile_domains(
+                    conf_obj, record_obj
+                )
+                periods = [current_domain]
+                keys.append((conf_obj.data_type, "current"))
+                if conf_obj.previous_period_comparision:
+                    previous_domain = self._get_tile_domains(
+                        conf_obj, record_obj, conf_obj.previous_period_duration
+                    )[1]
+                    periods.append(previous_domain)
+                    keys.append((conf_obj.data_type, "previous"))
+                parts.append((record_obj, domain, measure, periods))
+        if conf_obj.kpi_model and (
+            conf_obj.kpi_measurement_field_id or conf_obj.kpi_data_type == "count"
+        ):
+            record_obj = self.env[conf_obj.kpi_model]
+            measure = False
+            if conf_obj.kpi_data_type in ("sum", "average"):
+                measure = conf_obj.kpi_measurement_field_id.name
+            if (
+                self._can_aggregate_in_db(
+                    conf_obj, record_obj, measures=[measure] if measure else []
+                )
+                and not conf_obj.kpi_limit_record
+            ):
+                domain = self._get_kpi_domain(conf_obj, record_obj)
+                parts.append((record_obj, domain, measure, [[]]))
+                keys.append((conf_obj.kpi_data_type, "secondary"))
+        if not parts:
+            return {}
+
+        totals = iter(self._read_kpi_totals(parts))
+        values = {}
+        for data_type, key in keys:
+            count, total = next(totals)
+            if data_type == "count":
+                values[key] = count
+            elif data_type == "average":
+                values[key] = total / count if count else 0
+            else:
+                values[key] = total
+        return values
+
+    def _read_kpi_totals(self, parts):
+        """
+        Return the (count, measure sum) of every period of the parts, computed
+        with one query. parts is a list of (record_obj, domain, measure,
+        periods), the periods of a part are date domains aggregated with
+        FILTER clauses so that their records are scanned once, even when they
+        overlap. Parts of different models are joined with UNION ALL.
+        """
+        max_periods = max(len(part[3]) for part in parts)
+        queries = []
+        for part_index, (record_obj, domain, measure, periods) in enumerate(parts):
+            # The query reads the columns, pending changes are written first
+            flush_fields = {
+                leaf[0].split(".")[0]
+                for period in periods
+                for leaf in period
+                if expression.is_leaf(leaf) and isinstance(leaf[0], str)
+            }
+            if measure:
+                flush_fields.add(measure)
+            record_obj.flush_model(flush_fields)
+            if all(periods):
+                domain = expression.AND([domain, expression.OR(periods)])
+            query = record_obj._where_calc(domain)
+            record_obj._apply_ir_rules(query, "read")
+            total = False
+            if measure:
+                total = record_obj._read_group_select("%s:sum" % measure, query)
+            columns = [SQL("%s", part_index)]
+            for period in periods:
+                condition = SQL("TRUE")
+                if period:
+                    condition = record_obj._where_calc(
+                        period, active_test=False
+                    ).where_clause
+                columns += [
+                    SQL("COUNT(*) FILTER (WHERE %s)", condition),
+                    SQL("%s FILTER (WHERE %s)", total, condition)
+                    if total
+                    else SQL("0"),
+                ]
+            columns += [SQL("0")] * 2 * (max_periods - len(periods))
+            queries.append(SQL("(%s)", query.select(*columns)))
+        self.env.cr.execute(SQL(" UNION ALL ").join(queries))
+        rows = {row[0]: row[1:] for row in self.env.cr.fetchall()}
+        result = []
+        for part_index, part in enumerate(parts):
+            row = rows[part_index]
+            for period_index in range(len(part[3])):
+                count, total = row[2 * period_index : 2 * period_index + 2]
+                result.append((count, total or 0))
+        return result
+
     def get_kpi_data(self, conf_obj):
         """
         Calculate and get data for KPI view
@@ -1913,13 +2472,16 @@ class DashboardChart(models.Model):
                 )
             return 0
 
-        prepared_data = self.get_tile_data(conf_obj)
+        kpi_values = self._get_kpi_values(conf_obj)
+        prepared_data = self.get_tile_data(conf_obj, count=kpi_values.get("current"))
         if prepared_data and prepared_data.get("type") == "error":
             return prepared_data
 
         if conf_obj.previous_period_comparision:
             updated_data = self.get_tile_data(
-                conf_obj, conf_obj.previous_period_duration
+                conf_obj,
+                conf_obj.previous_period_duration,
+                count=kpi_values.get("previous"),
             )
             if isinstance(updated_data, dict) and "type" in updated_data:
                 updated_data.update(
@@ -2022,70 +2584,17 @@ class DashboardChart(models.Model):
         ):
             return {"type": "error", "message": "Please Select measurement!"}
 
-        record_obj = self.env[conf_obj.kpi_model]
-        domain = conf_obj.kpi_domain[:]
-        kpi_today_date = False
-        if conf_obj.company and "company_id" in record_obj._fields:
-            domain.append(("company_id", "in", [conf_obj.company, False]))
-        if (
-            conf_obj.kpi_date_filter_field_id
-            and conf_obj.kpi_date_filter_option
-            and conf_obj.kpi_date_filter_option != "none"
-        ):
-            date_domain = self.get_date_filter_domain(
+        count = prepared_data.get("calculated_count", 0)
+        count2 = kpi_values.get("secondary")
+        if count2 is None:
+            record_obj = self.env[conf_obj.kpi_model]
+            all_records = self._search_chart_records(
+                conf_obj,
                 record_obj,
-                conf_obj.kpi_date_filter_field_id,
-                conf_obj.kpi_date_filter_option,
-                conf_obj.kpi_include_periods,
-                conf_obj.kpi_same_period_previous_years,
-            )
-            if date_domain.get("domain"):
-                start_date = date_domain.get("start_date")
-                end_date = date_domain.get("end_date")
-
-                if (
-                    start_date
-                    and end_date
-                    and start_date.date()
-                    and end_date.date()
-                    and start_date.date() != end_date.date()
-                ):
-                    domain += date_domain["domain"]
-                else:
-                    kpi_today_date = start_date.date()
-
-        all_records = record_obj.search(domain)
-        if kpi_today_date:
-            all_records = all_records.filtered(
-                lambda record: getattr(record, conf_obj.kpi_date_filter_field_id)
-                and (
-                    getattr(record, conf_obj.kpi_date_filter_field_id).date()
-                    if isinstance(
-                        getattr(record, conf_obj.kpi_date_filter_field_id), datetime
-                    )
-                    else getattr(record, conf_obj.kpi_date_filter_field_id)
-                )
-                == kpi_today_date
-            )
-
-        if conf_obj.sort_order and conf_obj.sort_field:
-            sorted_record = all_records.filtered(
-                lambda arft: getattr(arft, conf_obj.sort_field)
-            ).sorted(
-                key=lambda sr: getattr(sr, conf_obj.sort_field).name
-                if isinstance(getattr(sr, conf_obj.sort_field), models.Model)
-                else getattr(sr, conf_obj.sort_field),
-                reverse=conf_obj.sort_order == "desc",
-            )
-            sorted_record |= all_records.filtered(
-                lambda arft: not getattr(arft, conf_obj.sort_field)
+                self._get_kpi_domain(conf_obj, record_obj),
+                conf_obj.kpi_limit_record,
             )
-            all_records = sorted_record
-        if conf_obj.kpi_limit_record > 0:
-            all_records = all_records[: conf_obj.kpi_limit_record]
-
-        count = prepared_data.get("calculated_count", 0)
-        count2 = get_count2(all_records, conf_obj)
+            count2 = get_count2(all_records, conf_obj)
         compute_count = 0
         symbol = ""
         if conf_obj.show_unit:
@@ -2182,7 +2691,6 @@ class DashboardChart(models.Model):
                 "records": conf_obj.todo_action_ids,
             }
 
-        today_date = False
         domain = conf_obj.domain
         record_obj = self.env[conf_obj.model]
         activities_domain = [("res_model", "=", conf_obj.model)]
@@ -2192,40 +2700,17 @@ class DashboardChart(models.Model):
             and conf_obj.date_filter_option != "none"
         ):
             date_domain = self.get_date_filter_domain(
-                record_obj,
+                self.env["mail.activity"],
                 conf_obj.date_filter_field,
                 conf_obj.date_filter_option,
                 conf_obj.include_periods,
                 conf_obj.same_period_previous_years,
             )
-            # domain.extend(date_domain["domain"])
-            if date_domain.get("domain"):
-                start_date = date_domain.get("start_date")
-                end_date = date_domain.get("end_date")
-                if (
-                    start_date
-                    and end_date
-                    and start_date.date()
-                    and end_date.date()
-                    and start_date.date() != end_date.date()
-                ):
-                    activities_domain.extend(date_domain["domain"])
-                else:
-                    today_date = start_date.date()
+            activities_domain.extend(date_domain["domain"])
 
         records = record_obj.search(
             domain,
         )
-        if today_date:
-            records = records.filtered(
-                lambda record: getattr(record, conf_obj.date_filter_field)
-                and (
-                    getattr(record, conf_obj.date_filter_field).date()
-                    if isinstance(getattr(record, conf_obj.date_filter_field), datetime)
-                    else getattr(record, conf_obj.date_filter_field)
-                )
-                == today_date
-            )
 
         activities_domain.extend([("res_id", "in", records.ids)])
         if conf_obj.limit_record == 0:
@@ -2366,166 +2851,756 @@ class DashboardChart(models.Model):
             check_constraint = {"type": "error", "message": "Please Select Group by!"}
         return check_constraint
 
-    def get_list_view_data(self, conf_obj):
+    def _can_aggregate_in_db(self, conf_obj, record_obj, group_fields=(), measures=()):
         """
-        This function is used in preparing data for List view
+        Check whether the chart can be computed with one grouped query.
+        group_fields is a list of (field name, time range) tuples, measures a
+        list of field names. Non-stored fields keep the Python path.
         """
-        if not conf_obj.model:
-            return {"type": "error", "message": "Please Select Model!"}
-        if (conf_obj.list_type == "standard" and not conf_obj.list_field_ids) or (
-            conf_obj.list_type == "grouped" and not conf_obj.list_measure_ids
-        ):
-            return {"type": "error", "message": "Please configure fields to display!"}
-        if conf_obj.list_type == "grouped" and not conf_obj.group_by:
-            return {"type": "error", "message": "Please Select Group by!"}
-        record_obj = self.env[conf_obj.model]
-        today_date = False
-        domain = conf_obj.domain
-        if conf_obj.company and "company_id" in record_obj._fields:
-            domain.append(("company_id", "in", [conf_obj.company, False]))
+        if self.env.context.get("dashboard_python_aggregate"):
+            return False
         if (
-            conf_obj.date_filter_field
-            and conf_obj.date_filter_option
-            and conf_obj.date_filter_option != "none"
+            conf_obj.limit_record > 0
+            and self._get_sort_order(conf_obj, record_obj) is False
         ):
-            date_domain = self.get_date_filter_domain(
-                record_obj,
-                conf_obj.date_filter_field,
-                conf_obj.date_filter_option,
-                conf_obj.include_periods,
-                conf_obj.same_period_previous_years,
-            )
-            if date_domain.get("domain"):
-                start_date = date_domain.get("start_date")
-                end_date = date_domain.get("end_date")
-                if (
-                    start_date
-                    and end_date
-                    and start_date.date()
-                    and end_date.date()
-                    and start_date.date() != end_date.date()
-                ):
-                    domain.extend(date_domain["domain"])
+            return False
+        for field_name, time_range in group_fields:
+            field = record_obj._fields.get(field_name)
+            if not field or not field.store or field.type not in DB_GROUPBY_TYPES:
+                return False
+            if field.type == "datetime" and not time_range:
+                return False
+        for field_name in measures:
+            field = record_obj._fields.get(field_name)
+            if not field or not field.store or field.type not in DB_MEASURE_TYPES:
+                return False
+        return True
+
+    def _get_sort_order(self, conf_obj, record_obj):
+        """
+        Return the search order of the chart sorting, "" when the chart isn't
+        sorted and False when the sort field can't be ordered by the database.
+        Many2one fields are ordered by the stored name of their comodel, as
+        "<field>.<rec_name>", like the Python sorting on the display name.
+        """
+        if not (conf_obj.sort_order and conf_obj.sort_field):
+            return ""
+        field = record_obj._fields.get(conf_obj.sort_field)
+        if not field:
+            return ""
+        if not (field.store and field.column_type) or field.type == "many2many":
+            return False
+        sort_field = conf_obj.sort_field
+        if field.type == "many2one":
+            comodel = self.env[field.comodel_name]
+            rec_name_field = comodel._fields.get(comodel._rec_name)
+            if not (
+                rec_name_field
+                and rec_name_field.store
+                and rec_name_field.column_type
+                and rec_name_field.type != "many2one"
+            ):
+                return False
+            sort_field = "%s.%s" % (sort_field, comodel._rec_name)
+        return "%s %s nulls last, id" % (sort_field, conf_obj.sort_order)
+
+    def _search_ordered(self, record_obj, domain, order, offset=0, limit=None):
+        """
+        Search the records in the order of _get_sort_order, a many2one field is
+        joined to order by the name of its comodel instead of its _order
+        """
+        sort_field, direction = order.split()[:2] if order else ("", "")
+        field_name, __, rec_name = sort_field.partition(".")
+        if not rec_name:
+            return record_obj.search(
+                domain, offset=offset, limit=limit, order=order or None
+            )
+        comodel = self.env[record_obj._fields[field_name].comodel_name]
+        record_obj.flush_model([field_name])
+        comodel.flush_model([rec_name])
+        query = record_obj._search(domain, offset=offset, limit=limit)
+        alias = query.make_alias(record_obj._table, field_name)
+        query.add_join(
+            "LEFT JOIN",
+            alias,
+            comodel._table,
+            SQL(
+                "%s = %s",
+                SQL.identifier(record_obj._table, field_name),
+                SQL.identifier(alias, "id"),
+            ),
+        )
+        query.order = SQL(
+            "%s %s NULLS LAST, %s",
+            comodel._field_to_sql(alias, rec_name, query),
+            SQL("DESC" if direction == "desc" else "ASC"),
+            SQL.identifier(record_obj._table, "id"),
+        )
+        return record_obj.browse(query)
+
+    def _search_chart_records(self, conf_obj, record_obj, domain, limit=0):
+        """
+        Search the chart records sorted and limited as configured, the sorting
+        is done in Python only for fields the database can't order
+        """
+        order = self._get_sort_order(conf_obj, record_obj)
+
+        def sort_key(record):
+            value = record[conf_obj.sort_field]
+            if isinstance(value, models.Model):
+                return value.display_name or ""
+            return value
+
+        def search():
+            if order is not False:
+                return self._search_ordered(
+                    record_obj, domain, order, limit=limit or None
+                )
+            records = record_obj.search(domain)
+            sorted_records = records.filtered(lambda r: r[conf_obj.sort_field]).sorted(
+                key=sort_key, reverse=conf_obj.sort_order == "desc"
+            )
+            sorted_records |= records.filtered(lambda r: not r[conf_obj.sort_field])
+            return sorted_records[:limit] if limit else sorted_records
+
+        return self._shared_query(
+            (
+                "search",
+                record_obj._name,
+                record_obj.env.su,
+                repr(domain),
+                order if order is not False else conf_obj.sort_field,
+                conf_obj.sort_order,
+                limit,
+            ),
+            search,
+        )
+
+    def _shared_query(self, key, compute):
+        """
+        Return compute(), run once per key for the charts computed together
+        by dashboard.dashboard._get_charts_data
+        """
+        shared_queries = self.env.context.get("dashboard_shared_queries")
+        if shared_queries is None:
+            return compute()
+        return shared_queries.get(key, lambda key: compute())
+
+    def _get_shared_query_key(self):
+        """
+        Return the key of the charts which query the same records: same
+        model, domain, date filter and company. None when the chart has no
+        model.
+        """
+        self.ensure_one()
+        if not self.model_id:
+            return None
+        return (
+            self.model_id.model,
+            self.domain or "[]",
+            self.date_filter_field_id.id,
+            self.date_filter_option,
+            self.include_periods,
+            self.same_period_previous_years,
+            self.company_id.id,
+        )
+
+    def _get_groupby_spec(self, record_obj, field_name, time_range=False):
+        """
+        Return the _read_group groupby spec for a chart group by field.
+        Weeks are read per day and bucketed by label, so week numbers stay
+        the ISO ones used by format_date_by_range.
+        """
+        if record_obj._fields[field_name].type in ("date", "datetime"):
+            granularity = time_range if time_range and time_range != "week" else "day"
+            return "%s:%s" % (field_name, granularity)
+        return field_name
+
+    def _get_group_category(self, record_obj, field_name, value, time_range=False):
+        """
+        Return (category, record_id) of a group value, labelled the same way
+        the Python handlers label a record value
+        """
+        field = record_obj._fields[field_name]
+        if hasattr(field, "selection"):
+            record_selections = field.selection
+            if isinstance(record_selections, str):
+                record_selections = dict(getattr(record_obj, record_selections)())
+            else:
+                record_selections = dict(record_selections)
+            label = record_selections.get(value)
+            return label, label
+        if isinstance(value, models.Model):
+            return value.display_name, value.id
+        if isinstance(value, (date, datetime)) and time_range:
+            label = format_date_by_range(value, time_range)
+            return label, label
+        return value, value
+
+    def _get_multiplier(self, conf_obj, field_id):
+        """
+        Return configured multiplier of the measurement field
+        """
+        if conf_obj.is_apply_multiplier:
+            for multiplier in conf_obj.chart_multiplier_ids:
+                if multiplier.get("field_id") == field_id:
+                    return multiplier.get("multiplier", 1)
+        return 1
+
+    def _read_chart_groups(self, conf_obj, record_obj, domain, groupby, measures):
+        """
+        Run the grouped query of a chart. Record limit is applied first on the
+        ids, sorted as configured, the same records the Python path groups.
+        Returns rows of (group values..., count, measure sums...)
+        """
+        if conf_obj.limit_record > 0:
+            records = self._search_chart_records(
+                conf_obj, record_obj, domain, conf_obj.limit_record
+            )
+            domain = [("id", "in", records.ids)]
+        aggregates = ["__count"] + ["%s:sum" % measure for measure in measures]
+        # Group dates on UTC values, as the Python path reads them
+        return self._shared_query(
+            (
+                "read_group",
+                record_obj._name,
+                record_obj.env.su,
+                repr(domain),
+                tuple(groupby),
+                tuple(aggregates),
+            ),
+            lambda: record_obj.with_context(tz=False)._read_group(
+                domain, groupby, aggregates
+            ),
+        )
+
+    def _fill_measurement_keys(self, conf_obj, result):
+        """
+        Set missing measurement keys on rows so every serie has a value
+        """
+        if not result:
+            return {"type": "error", "message": "No Data to display!"}
+
+        value_keys = set()
+        for row in result:
+            value_keys.update(k for k in row if k not in ("category", "record_id"))
+        if conf_obj.chart_type != "bar_chart":
+            for row in result:
+                for key in value_keys:
+                    if key not in row:
+                        row[key] = 0.0
+        return result
+
+    def _get_measurement_group_data_db(self, conf_obj, record_obj, domain):
+        """
+        get_measurement_group_data computed with a single grouped query
+        """
+        group_names = [conf_obj.group_by]
+        groupby = [
+            self._get_groupby_spec(record_obj, conf_obj.group_by, conf_obj.time_range)
+        ]
+        if conf_obj.sub_group_by:
+            group_names.append(conf_obj.sub_group_by)
+            groupby.append(
+                self._get_groupby_spec(
+                    record_obj, conf_obj.sub_group_by, conf_obj.sub_time_range
+                )
+            )
+        measurements = conf_obj.measurement_field_ids
+        if conf_obj.data_type not in ["sum", "average"]:
+            measurements = self.env["ir.model.fields"]
+        if conf_obj.hide_false_value:
+            domain = domain + [(name, "!=", False) for name in group_names]
+        groups = self._read_chart_groups(
+            conf_obj, record_obj, domain, groupby, measurements.mapped("name")
+        )
+
+        grouped_data = defaultdict(dict)
+        for group in groups:
+            group_values = group[: len(groupby)]
+            count, *totals = group[len(groupby) :]
+            if conf_obj.hide_false_value and not all(group_values):
+                continue
+            group_key = self._get_group_category(
+                record_obj, conf_obj.group_by, group_values[0], conf_obj.time_range
+            )
+            prefix = ""
+            if conf_obj.sub_group_by:
+                prefix = self._get_group_category(
+                    record_obj,
+                    conf_obj.sub_group_by,
+                    group_values[1],
+                    conf_obj.sub_time_range,
+                )[0]
+            metrics = grouped_data[group_key]
+            if conf_obj.data_type == "count":
+                key = f"{prefix} - count"
+                metrics[key] = metrics.get(key, 0.0) + count
+            for measurement, total in zip(measurements, totals):
+                total = total or 0.0
+                key = f"{prefix} - {measurement.field_description}"
+                if conf_obj.data_type == "sum":
+                    total *= self._get_multiplier(conf_obj, measurement.id)
+                    metrics[key] = metrics.get(key, 0.0) + total
                 else:
-                    today_date = start_date.date()
-
-        records = record_obj.search(domain)
-        if today_date:
-            records = records.filtered(
-                lambda record: getattr(record, conf_obj.date_filter_field)
-                and (
-                    getattr(record, conf_obj.date_filter_field).date()
-                    if isinstance(getattr(record, conf_obj.date_filter_field), datetime)
-                    else getattr(record, conf_obj.date_filter_field)
+                    value_sum, value_count = metrics.get(key, (0.0, 0))
+                    metrics[key] = (value_sum + total, value_count + count)
+
+        result = []
+        for (category, record_id), metrics in grouped_data.items():
+            row = {
+                "category": category,
+                "isSubGroupBy": conf_obj.sub_group_by,
+                "record_id": record_id,
+            }
+            for key, value in metrics.items():
+                if isinstance(value, tuple):
+                    value = value[0] / value[1] if value[1] else 0
+                row[key] = value
+            result.append(row)
+        return self._fill_measurement_keys(conf_obj, result)
+
+    def _get_category_value_data_db(self, conf_obj, record_obj, domain):
+        """
+        get_category_value_data computed with a single grouped query
+        """
+        measures = []
+        if conf_obj.data_type in ["sum", "average"]:
+            measures = [conf_obj.measurement_field_id.name]
+        if conf_obj.hide_false_value:
+            domain = domain + [(conf_obj.group_by, "!=", False)]
+            if conf_obj.sub_group_by:
+                domain.append((conf_obj.sub_group_by, "!=", False))
+        groups = self._read_chart_groups(
+            conf_obj,
+            record_obj,
+            domain,
+            [self._get_groupby_spec(record_obj, conf_obj.group_by)],
+            measures,
+        )
+
+        data_list = []
+        for group_value, count, *totals in groups:
+            category_value = count
+            if conf_obj.data_type in ["sum", "average"]:
+                category_value = totals[0] or 0
+                if conf_obj.data_type == "average" and category_value:
+                    category_value /= count
+                category_value *= self._get_multiplier(
+                    conf_obj, conf_obj.measurement_field_id.id
                 )
-                == today_date
+            if conf_obj.is_apply_multiplier and conf_obj.chart_multiplier_ids:
+                category_value *= conf_obj.chart_multiplier_ids[0].get("multiplier")
+            category_instance, record_id = self._get_group_category(
+                record_obj, conf_obj.group_by, group_value
             )
+            if conf_obj.hide_false_value and not category_instance:
+                continue
+            data_list.append(
+                {
+                    "category": category_instance,
+                    "record_id": record_id,
+                    "value": category_value,
+                }
+            )
+        if not data_list:
+            return {"type": "error", "message": "No Data to display!"}
+        return sorted(
+            data_list,
+            key=lambda data: data.get("value"),
+            reverse=conf_obj.sort_order == "desc",
+        )
 
-        if not records:
+    def _get_map_chart_data_db(self, conf_obj, record_obj, domain):
+        """
+        get_map_chart_data computed with a single grouped query, the groups
+        are folded into countries afterwards
+        """
+        measures = []
+        if conf_obj.data_type in ["sum", "average"]:
+            measures = [conf_obj.measurement_field_id.name]
+        groups = self._read_chart_groups(
+            conf_obj, record_obj, domain, [conf_obj.map_group_by], measures
+        )
+
+        country_data = {}
+        for group_value, count, *totals in groups:
+            country_count, country_total = country_data.get(
+                group_value.country_id, (0, 0)
+            )
+            country_data[group_value.country_id] = (
+                country_count + count,
+                country_total + (totals[0] or 0 if totals else 0),
+            )
+
+        data_list = []
+        for country_id, (count, total) in country_data.items():
+            category_value = count
+            if conf_obj.data_type in ["sum", "average"]:
+                category_value = total
+                if conf_obj.data_type == "average" and total != 0:
+                    category_value = total / count
+                category_value *= self._get_multiplier(
+                    conf_obj, conf_obj.measurement_field_id.id
+                )
+            if conf_obj.hide_false_value and (category_value == 0 or not country_id):
+                continue
+            data_list.append(
+                {
+                    "id": country_id.code,
+                    "name": country_id.name,
+                    "value": category_value,
+                    "record_id": country_id.id,
+                }
+            )
+        if not data_list:
             return {"type": "error", "message": "No Data to display!"}
+        return data_list
 
-        if conf_obj.sort_order and conf_obj.sort_field:
-            sorted_record = records.filtered(
-                lambda rft: getattr(rft, conf_obj.sort_field)
-            ).sorted(
-                key=lambda sr: getattr(sr, conf_obj.sort_field).name
-                if isinstance(getattr(sr, conf_obj.sort_field), models.Model)
-                else getattr(sr, conf_obj.sort_field),
-                reverse=True if conf_obj.sort_order == "desc" else False,
+    def _get_list_domain(self, conf_obj, record_obj):
+        """
+        Return the domain of the list chart records
+        """
+        domain = conf_obj.domain
+        if conf_obj.company and "company_id" in record_obj._fields:
+            domain.append(("company_id", "in", [conf_obj.company, False]))
+        if (
+            conf_obj.date_filter_field
+            and conf_obj.date_filter_option
+            and conf_obj.date_filter_option != "none"
+        ):
+            date_domain = self.get_date_filter_domain(
+                record_obj,
+                conf_obj.date_filter_field,
+                conf_obj.date_filter_option,
+                conf_obj.include_periods,
+                conf_obj.same_period_previous_years,
             )
-            sorted_record |= records.filtered(
-                lambda rft: not getattr(rft, conf_obj.sort_field)
+            domain.extend(date_domain["domain"])
+        return domain
+
+    def _get_list_columns(self, conf_obj, record_obj):
+        """
+        Return the columns of the standard list chart in sequence order
+        """
+        ir_model_fields_obj = self.env["ir.model.fields"].sudo()
+        list_field_ids = sorted(
+            conf_obj.list_field_ids, key=lambda x: x.get("sequence")
+        )
+        columns = []
+        for column in list_field_ids:
+            column_rec = ir_model_fields_obj.browse(column.get("list_field_id"))
+            field = record_obj._fields.get(column_rec.name)
+            columns.append(
+                {
+                    "id": column_rec.id,
+                    "column_name": column_rec.name,
+                    "name": column_rec.field_description,
+                    "sortable": bool(
+                        field
+                        and field.store
+                        and field.column_type
+                        and field.type != "many2many"
+                    ),
+                }
             )
-            records = sorted_record
-        if conf_obj.limit_record > 0:
-            records = records[: conf_obj.limit_record]
+        return columns
+
+    def _format_list_rows(self, record_obj, columns, rows):
+        """
+        Convert the rows returned by read() to the displayed values, names of
+        the x2many columns are read once for all the rows
+        """
+        x2many_names = {}
+        for column in columns:
+            field = record_obj._fields[column["column_name"]]
+            if field.type in ("one2many", "many2many"):
+                comodel_records = self.env[field.comodel_name].browse(
+                    {value for row in rows for value in row[field.name]}
+                )
+                x2many_names[field.name] = {
+                    record.id: record.display_name for record in comodel_records
+                }
+        list_rows = []
+        for row in rows:
+            list_row = {"id": row["id"]}
+            for column in columns:
+                column_name = column["column_name"]
+                value = row[column_name]
+                if column_name in x2many_names:
+                    value = ", ".join(
+                        x2many_names[column_name][value_id] for value_id in value
+                    )
+                elif record_obj._fields[column_name].type == "many2one":
+                    value = value and value[1]
+                list_row[column_name] = value or ""
+            list_rows.append(list_row)
+        return list_rows
+
+    def _read_list_page(
+        self,
+        conf_obj,
+        record_obj,
+        domain,
+        columns,
+        offset=0,
+        limit=LIST_PAGE_SIZE,
+        sort_column=False,
+        sort_order="asc",
+    ):
+        """
+        Return one page of the standard list chart and the total number of
+        rows, the page is read with one search_read of the displayed columns
+        """
+        field_names = [column["column_name"] for column in columns]
+        column_order = False
+        if any(
+            column["column_name"] == sort_column and column["sortable"]
+            for column in columns
+        ):
+            column_order = "%s %s nulls last, id" % (
+                sort_column,
+                "desc" if sort_order == "desc" else "asc",
+            )
+        order = self._get_sort_order(conf_obj, record_obj)
+        if order is False or (conf_obj.limit_record and column_order):
+            records = self._search_chart_records(
+                conf_obj, record_obj, domain, conf_obj.limit_record
+            )
+            total = len(records)
+            if column_order:
+                records = record_obj.search(
+                    [("id", "in", records.ids)],
+                    order=column_order,
+                    offset=offset,
+                    limit=limit,
+                )
+            else:
+                records = records[offset : offset + limit]
+            rows = records.read(field_names)
+        else:
+            total = record_obj.search_count(domain, limit=conf_obj.limit_record or None)
+            limit = min(limit, total - offset)
+            rows = []
+            if limit > 0:
+                rows = self._search_ordered(
+                    record_obj,
+                    domain,
+                    column_order or order,
+                    offset=offset,
+                    limit=limit,
+                ).read(field_names)
+        list_rows = self._format_list_rows(record_obj, columns, rows)
+        return {"records": list_rows, "total": total, "offset": offset}
+
+    def get_list_page(
+        self,
+        offset=0,
+        limit=LIST_PAGE_SIZE,
+        sort_column=False,
+        sort_order="asc",
+        isDirty=False,
+        data=False,
+    ):
+        """
+        Called from the list chart when changing page or sorting a column
+        """
+        conf, __ = self._init_configuration()
+        if isDirty:
+            self._handle_dirty_data(conf, data)
+        if not (conf.model and conf.list_field_ids):
+            return {"type": "error", "message": "Please configure fields to display!"}
+        record_obj = self.env[conf.model]
+        return self._read_list_page(
+            conf,
+            record_obj,
+            self._get_list_domain(conf, record_obj),
+            self._get_list_columns(conf, record_obj),
+            offset=max(int(offset), 0),
+            limit=max(min(int(limit), LIST_MAX_PAGE_SIZE), 1),
+            sort_column=sort_column,
+            sort_order=sort_order,
+        )
+
+    def _get_list_group_key(self, conf_obj, record):
+        """
+        Return the JSON key of the group of the record in a grouped list,
+        dates grouped by time range are keyed by the start of their period and
+        the start of the next one
+        """
+        value = record[conf_obj.group_by]
+        field = record._fields[conf_obj.group_by]
+        if field.type == "many2one":
+            return value.id
+        if field.type in ("one2many", "many2many"):
+            return value.ids
+        if isinstance(value, (date, datetime)):
+            if conf_obj.time_range:
+                start = date_utils.start_of(value, conf_obj.time_range)
+                if conf_obj.time_range == "quarter":
+                    step = relativedelta(months=3)
+                else:
+                    step = relativedelta(**{conf_obj.time_range + "s": 1})
+                return [field.to_string(start), field.to_string(start + step)]
+            return field.to_string(value)
+        return value
+
+    def get_list_drill_domain(self, group_key, isDirty=False, data=False):
+        """
+        Expand the drill key of a grouped list row into the domain of its
+        records, called when the user opens the records of a group. Limited
+        lists are only aggregated from their first records, the domain is
+        restricted to them.
+        """
+        conf, __ = self._init_configuration()
+        if isDirty:
+            self._handle_dirty_data(conf, data)
+        record_obj = self.env[conf.model]
+        domain = self._get_list_domain(conf, record_obj)
+        if conf.limit_record > 0:
+            records = self._search_chart_records(
+                conf, record_obj, domain, conf.limit_record
+            )
+            domain = [("id", "in", records.ids)]
+        field = record_obj._fields[conf.group_by]
+        if isinstance(group_key, list) and field.type in ("date", "datetime"):
+            group_domain = [
+                (conf.group_by, ">=", group_key[0]),
+                (conf.group_by, "<", group_key[1]),
+            ]
+        elif isinstance(group_key, list) and group_key:
+            group_domain = [(conf.group_by, "in", group_key)]
+        elif isinstance(group_key, list):
+            group_domain = [(conf.group_by, "=", False)]
+        else:
+            group_domain = [(conf.group_by, "=", group_key)]
+        return expression.AND([domain, group_domain])
+
+    def _is_streamed_export(self, chart_type, print_vals=False):
+        """
+        Standard list charts are exported row by row instead of through
+        get_chart_data, so that unlimited lists don't have to fit in memory
+        """
+        self.ensure_one()
+        return (
+            chart_type == "list"
+            and self.list_type == "standard"
+            and bool(self.model_id and self.list_field_ids)
+            and not (print_vals or {}).get("breadcrump_ids")
+        )
+
+    def _iter_list_export_rows(self, batch_size=1000):
+        """
+        Yield the header and the rows of the standard list chart, records are
+        read by batches and evicted from the cache once written
+        """
+        self.ensure_one()
+        conf, __ = self._init_configuration()
+        record_obj = self.env[conf.model]
+        columns = self._get_list_columns(conf, record_obj)
+        field_names = [column["column_name"] for column in columns]
+        yield [column["name"] for column in columns]
+        domain = self._get_list_domain(conf, record_obj)
+        records = self._search_chart_records(
+            conf, record_obj, domain, conf.limit_record
+        )
+        for record_ids in split_every(batch_size, records.ids):
+            batch = record_obj.browse(record_ids)
+            rows = self._format_list_rows(record_obj, columns, batch.read(field_names))
+            for row in rows:
+                yield [row[field_name] for field_name in field_names]
+            batch.invalidate_recordset()
+
+    def get_list_view_data(self, conf_obj):
+        """
+        This function is used in preparing data for List view, standard lists
+        only contain their first page, the next ones are read with get_list_page
+        """
+        if not conf_obj.model:
+            return {"type": "error", "message": "Please Select Model!"}
+        if (conf_obj.list_type == "standard" and not conf_obj.list_field_ids) or (
+            conf_obj.list_type == "grouped" and not conf_obj.list_measure_ids
+        ):
+            return {"type": "error", "message": "Please configure fields to display!"}
+        if conf_obj.list_type == "grouped" and not conf_obj.group_by:
+            return {"type": "error", "message": "Please Select Group by!"}
+        record_obj = self.env[conf_obj.model]
+        domain = self._get_list_domain(conf_obj, record_obj)
+        if conf_obj.list_type == "standard":
+            columns = self._get_list_columns(conf_obj, record_obj)
+            page = self._read_list_page(conf_obj, record_obj, domain, columns)
+            if not page["total"]:
+                return {"type": "error", "message": "No Data to display!"}
+            return {
+                "columns": columns,
+                "name": conf_obj.name,
+                "model": conf_obj.model,
+                "page_size": LIST_PAGE_SIZE,
+                **page,
+            }
+        records = self._search_chart_records(
+            conf_obj, record_obj, domain, conf_obj.limit_record
+        )
+
+        if not records:
+            return {"type": "error", "message": "No Data to display!"}
+
         columns = []
         # column_names = []
         record_list = []
         ir_model_fields_obj = self.env["ir.model.fields"].sudo()
-        if conf_obj.list_type == "standard":
-            list_field_ids = sorted(
-                conf_obj.list_field_ids, key=lambda x: x.get("sequence")
+        group_by_field = ir_model_fields_obj.search(
+            [("name", "=", conf_obj.group_by), ("model", "=", conf_obj.model)],
+            limit=1,
+        )
+        if group_by_field:
+            columns.append(
+                {
+                    "id": group_by_field.id,
+                    "column_name": group_by_field.name,
+                    "name": group_by_field.field_description,
+                }
             )
-            column_ids = [column.get("list_field_id") for column in list_field_ids]
-            for column in column_ids:
-                column_rec = ir_model_fields_obj.browse(column)
-                columns.append(
-                    {
-                        "id": column_rec.id,
-                        "column_name": column_rec.name,
-                        "name": column_rec.field_description,
-                    }
-                )
-            for record in records:
-                record_set = {"id": record.id}
-                for column in columns:
-                    record_column_value = getattr(record, column.get("column_name"))
-                    if isinstance(record_column_value, models.Model):
-                        record_column_value = record_column_value.display_name
-                    record_set.update(
-                        {column.get("column_name"): record_column_value or ""}
-                    )
-                record_set["currentIds"] = [record.id]
-                record_list.append(record_set)
-        else:
-            group_by_field = ir_model_fields_obj.search(
-                [("name", "=", conf_obj.group_by), ("model", "=", conf_obj.model)],
-                limit=1,
+        for column in conf_obj.list_measure_ids:
+            column_rec = ir_model_fields_obj.browse(column.get("list_measure_id"))
+            columns.append(
+                {
+                    "id": column_rec.id,
+                    "column_name": column_rec.name,
+                    "name": column_rec.field_description,
+                    "value_type": column.get("value_type"),
+                }
             )
-            if group_by_field:
-                columns.append(
-                    {
-                        "id": group_by_field.id,
-                        "column_name": group_by_field.name,
-                        "name": group_by_field.field_description,
-                    }
-                )
-            for column in conf_obj.list_measure_ids:
-                column_rec = ir_model_fields_obj.browse(column.get("list_measure_id"))
-                columns.append(
-                    {
-                        "id": column_rec.id,
-                        "column_name": column_rec.name,
-                        "name": column_rec.field_description,
-                        "value_type": column.get("value_type"),
-                    }
-                )
-            grouped_by_records = groupby(
-                records,
-                key=lambda record: format_date_by_range(
-                    getattr(record, conf_obj.group_by), conf_obj.time_range
-                )
-                if (
-                    isinstance(getattr(record, conf_obj.group_by), (date, datetime))
-                    and conf_obj.time_range
-                )
-                else getattr(record, conf_obj.group_by),
+        grouped_by_records = groupby(
+            records,
+            key=lambda record: format_date_by_range(
+                getattr(record, conf_obj.group_by), conf_obj.time_range
             )
-            for group, grouped_records in grouped_by_records:
-                record_set = {"id": group}
-                for column in columns:
-                    if column.get("column_name") == conf_obj.group_by:
-                        record_value = group
-                        if isinstance(record_value, models.Model):
-                            record_value = group.display_name
-                        record_set.update({column.get("column_name"): record_value})
-                        continue
-                    final_value = 0
-                    for grouped_record in grouped_records:
-                        final_value += getattr(
-                            grouped_record, column.get("column_name")
-                        )
-                    if column.get("value_type") == "average" and final_value != 0:
-                        final_value = final_value / len(grouped_records)
-                    record_set.update(
-                        {column.get("column_name"): round(final_value, 2)}
-                    )
-                currentIds = []
-                for grouped_id in grouped_records:
-                    currentIds.append(grouped_id.id)
-                record_set["currentIds"] = currentIds
-                record_list.append(record_set)
+            if (
+                isinstance(getattr(record, conf_obj.group_by), (date, datetime))
+                and conf_obj.time_range
+            )
+            else getattr(record, conf_obj.group_by),
+        )
+        for group, grouped_records in grouped_by_records:
+            record_set = {"id": group}
+            for column in columns:
+                if column.get("column_name") == conf_obj.group_by:
+                    record_value = group
+                    if isinstance(record_value, models.Model):
+                        record_value = group.display_name
+                    record_set.update({column.get("column_name"): record_value})
+                    continue
+                final_value = 0
+                for grouped_record in grouped_records:
+                    final_value += getattr(grouped_record, column.get("column_name"))
+                if column.get("value_type") == "average" and final_value != 0:
+                    final_value = final_value / len(grouped_records)
+                record_set.update({column.get("column_name"): round(final_value, 2)})
+            record_set["drill_key"] = self._get_list_group_key(
+                conf_obj, grouped_records[0]
+            )
+            record_list.append(record_set)
         return {
             "columns": columns,
             "records": record_list,
@@ -2546,20 +3621,11 @@ class DashboardChart(models.Model):
         Scatter Chart
         """
 
-        def _sort_key(sr):
-            val = getattr(sr, conf_obj.sort_field)
-            if isinstance(val, models.Model):
-                return val.name or ""
-            if val is None:
-                return 0
-            return val
-
         check_constraint = self.check_conf_obj(conf_obj)
         if check_constraint:
             return check_constraint
 
         record_obj = self.env[conf_obj.model]
-        today_date = False
         domain = conf_obj.domain
         if conf_obj.company and "company_id" in record_obj._fields:
             domain.append(("company_id", "in", [conf_obj.company, False]))
@@ -2575,32 +3641,24 @@ class DashboardChart(models.Model):
                 conf_obj.include_periods,
                 conf_obj.same_period_previous_years,
             )
-            if date_domain.get("domain"):
-                start_date = date_domain.get("start_date")
-                end_date = date_domain.get("end_date")
-
-                if (
-                    start_date
-                    and end_date
-                    and start_date.date()
-                    and end_date.date()
-                    and start_date.date() != end_date.date()
-                ):
-                    domain.extend(date_domain["domain"])
-                else:
-                    today_date = start_date.date()
-
-        records = record_obj.search(domain)
-        if today_date:
-            records = records.filtered(
-                lambda record: getattr(record, conf_obj.date_filter_field)
-                and (
-                    getattr(record, conf_obj.date_filter_field).date()
-                    if isinstance(getattr(record, conf_obj.date_filter_field), datetime)
-                    else getattr(record, conf_obj.date_filter_field)
-                )
-                == today_date
-            )
+            domain.extend(date_domain["domain"])
+
+        group_fields = [(conf_obj.group_by, conf_obj.time_range)]
+        if conf_obj.sub_group_by:
+            group_fields.append((conf_obj.sub_group_by, conf_obj.sub_time_range))
+        measures = []
+        if conf_obj.data_type in ["sum", "average"]:
+            measures = conf_obj.measurement_field_ids.mapped("name")
+        if self._can_aggregate_in_db(conf_obj, record_obj, group_fields, measures):
+            return self._get_measurement_group_data_db(conf_obj, record_obj, domain)
+
+        # False values are hidden before the limit is applied
+        records = self._search_chart_records(
+            conf_obj,
+            record_obj,
+            domain,
+            0 if conf_obj.hide_false_value else conf_obj.limit_record,
+        )
 
         if not records:
             return {"type": "error", "message": "No Data to display!"}
@@ -2609,25 +3667,6 @@ class DashboardChart(models.Model):
 
         grouped_data = defaultdict(lambda: defaultdict(float))
 
-        if conf_obj.sort_order and conf_obj.sort_field:
-            # sorted_record = records.filtered(
-            #     lambda rft: getattr(rft, conf_obj.sort_field)
-            # ).sorted(
-            #     key=lambda sr: getattr(sr, conf_obj.sort_field).name
-            #     if isinstance(getattr(sr, conf_obj.sort_field), models.Model)
-            #     else getattr(sr, conf_obj.sort_field),
-            #     reverse=conf_obj.sort_order == "desc",
-            # )
-            sorted_record = records.filtered(
-                lambda rft: getattr(rft, conf_obj.sort_field) is not None
-            ).sorted(
-                key=_sort_key,
-                reverse=(conf_obj.sort_order == "desc"),
-            )
-            sorted_record |= records.filtered(
-                lambda rft: not getattr(rft, conf_obj.sort_field)
-            )
-            records = sorted_record
         if conf_obj.hide_false_value:
             records = records.filtered(lambda nonz: getattr(nonz, conf_obj.group_by))
             if conf_obj.sub_group_by:
@@ -2740,19 +3779,7 @@ class DashboardChart(models.Model):
                         else:
                             row.update({key: 0})
             result.append(row)
-
-        if not result:
-            return {"type": "error", "message": "No Data to display!"}
-
-        value_keys = set()
-        for row in result:
-            value_keys.update(k for k in row if k not in ("category", "record_id"))
-        if conf_obj.chart_type != "bar_chart":
-            for row in result:
-                for key in value_keys:
-                    if key not in row:
-                        row[key] = 0.0
-        return result
+        return self._fill_measurement_keys(conf_obj, result)
 
     def check_category_config_type(self, conf_obj, records):
         """
@@ -2786,7 +3813,6 @@ class DashboardChart(models.Model):
             return check_constraint
 
         record_obj = self.env[conf_obj.model]
-        today_date = False
         domain = conf_obj.domain
         if conf_obj.company and "company_id" in record_obj._fields:
             domain.append(("company_id", "in", [conf_obj.company, False]))
@@ -2802,53 +3828,28 @@ class DashboardChart(models.Model):
                 conf_obj.include_periods,
                 conf_obj.same_period_previous_years,
             )
-            if date_domain.get("domain"):
-                start_date = date_domain.get("start_date")
-                end_date = date_domain.get("end_date")
-
-                if (
-                    start_date
-                    and end_date
-                    and start_date.date()
-                    and end_date.date()
-                    and start_date.date() != end_date.date()
-                ):
-                    domain.extend(date_domain["domain"])
-                else:
-                    today_date = start_date.date()
+            domain.extend(date_domain["domain"])
 
-        all_records = record_obj.search(domain)
+        measures = []
+        if conf_obj.data_type in ["sum", "average"]:
+            measures = [conf_obj.measurement_field_id.name]
+        if self._can_aggregate_in_db(
+            conf_obj, record_obj, [(conf_obj.group_by, False)], measures
+        ):
+            return self._get_category_value_data_db(conf_obj, record_obj, domain)
 
-        if today_date:
-            all_records = all_records.filtered(
-                lambda record: getattr(record, conf_obj.date_filter_field)
-                and (
-                    getattr(record, conf_obj.date_filter_field).date()
-                    if isinstance(getattr(record, conf_obj.date_filter_field), datetime)
-                    else getattr(record, conf_obj.date_filter_field)
-                )
-                == today_date
-            )
+        # False values are hidden before the limit is applied
+        all_records = self._search_chart_records(
+            conf_obj,
+            record_obj,
+            domain,
+            0 if conf_obj.hide_false_value else conf_obj.limit_record,
+        )
 
         if not all_records:
             return {"type": "error", "message": "No Data to display!"}
 
         data_list = []
-        if conf_obj.sort_order and conf_obj.sort_field:
-            sort_records = self.env[conf_obj.model]
-            sort_records |= all_records.filtered(
-                lambda arft: getattr(arft, conf_obj.sort_field)
-            ).sorted(
-                key=lambda rc: getattr(rc, conf_obj.sort_field)
-                if not isinstance(getattr(rc, conf_obj.sort_field), models.Model)
-                else getattr(rc, conf_obj.sort_field).display_name,
-                reverse=True if conf_obj.sort_order == "desc" else False,
-            )
-            sort_records |= all_records.filtered(
-                lambda arft: not getattr(arft, conf_obj.sort_field)
-            )
-            all_records = sort_records
-
         if conf_obj.hide_false_value:
             all_records = all_records.filtered(
                 lambda nonz: getattr(nonz, conf_obj.group_by)
@@ -2913,7 +3914,6 @@ class DashboardChart(models.Model):
             return check_constraint
 
         record_obj = self.env[conf_obj.model]
-        today_date = False
         domain = conf_obj.domain
         if conf_obj.company and "company_id" in record_obj._fields:
             domain.append(("company_id", "in", [conf_obj.company, False]))
@@ -2929,53 +3929,30 @@ class DashboardChart(models.Model):
                 conf_obj.include_periods,
                 conf_obj.same_period_previous_years,
             )
-            if date_domain.get("domain"):
-                start_date = date_domain.get("start_date")
-                end_date = date_domain.get("end_date")
-
-            if (
-                start_date
-                and end_date
-                and start_date.date()
-                and end_date.date()
-                and start_date.date() != end_date.date()
-            ):
-                domain.extend(date_domain["domain"])
-            else:
-                today_date = start_date.date()
+            domain.extend(date_domain["domain"])
 
-        all_records = record_obj.search(domain)
-        if today_date:
-            all_records = all_records.filtered(
-                lambda record: getattr(record, conf_obj.date_filter_field)
-                and (
-                    getattr(record, conf_obj.date_filter_field).date()
-                    if isinstance(getattr(record, conf_obj.date_filter_field), datetime)
-                    else getattr(record, conf_obj.date_filter_field)
-                )
-                == today_date
+        map_field = record_obj._fields.get(conf_obj.map_group_by)
+        measures = []
+        if conf_obj.data_type in ["sum", "average"]:
+            measures = [conf_obj.measurement_field_id.name]
+        if (
+            map_field
+            and map_field.type == "many2one"
+            and "country_id" in self.env[map_field.comodel_name]._fields
+            and self._can_aggregate_in_db(
+                conf_obj, record_obj, [(conf_obj.map_group_by, False)], measures
             )
+        ):
+            return self._get_map_chart_data_db(conf_obj, record_obj, domain)
+
+        all_records = self._search_chart_records(
+            conf_obj, record_obj, domain, conf_obj.limit_record
+        )
 
         if not all_records:
             return {"type": "error", "message": "No Data to display!"}
 
         data_list = []
-        if conf_obj.sort_order and conf_obj.sort_field:
-            sorted_record = self.env[conf_obj.model]
-            sorted_record |= all_records.filtered(
-                lambda arft: getattr(arft, conf_obj.sort_field)
-            ).sorted(
-                key=lambda rc: getattr(rc, conf_obj.sort_field).name
-                if isinstance(getattr(rc, conf_obj.sort_field), models.Model)
-                else getattr(rc, conf_obj.sort_field),
-                reverse=True if conf_obj.sort_order == "desc" else False,
-            )
-            sorted_record |= all_records.filtered(
-                lambda arft: not getattr(arft, conf_obj.sort_field)
-            )
-            all_records = sorted_record
-        if conf_obj.limit_record > 0:
-            all_records = all_records[: conf_obj.limit_record]
         if conf_obj.measurement_field_id:
             all_records = sorted(
                 all_records,
@@ -3048,7 +4025,6 @@ class DashboardChart(models.Model):
             return check_constraint
 
         record_obj = self.env[conf_obj.model]
-        today_date = False
         domain = conf_obj.domain
         if conf_obj.company and "company_id" in record_obj._fields:
             domain.append(("company_id", "in", [conf_obj.company, False]))
@@ -3064,52 +4040,15 @@ class DashboardChart(models.Model):
                 conf_obj.include_periods,
                 conf_obj.same_period_previous_years,
             )
-            if date_domain.get("domain"):
-                start_date = date_domain.get("start_date")
-                end_date = date_domain.get("end_date")
-
-            if (
-                start_date
-                and end_date
-                and start_date.date()
-                and end_date.date()
-                and start_date.date() != end_date.date()
-            ):
-                domain.extend(date_domain["domain"])
-            else:
-                today_date = start_date.date()
+            domain.extend(date_domain["domain"])
 
-        all_records = record_obj.search(domain)
-        if today_date:
-            all_records = all_records.filtered(
-                lambda record: getattr(record, conf_obj.date_filter_field)
-                and (
-                    getattr(record, conf_obj.date_filter_field).date()
-                    if isinstance(getattr(record, conf_obj.date_filter_field), datetime)
-                    else getattr(record, conf_obj.date_filter_field)
-                )
-                == today_date
-            )
+        all_records = self._search_chart_records(
+            conf_obj, record_obj, domain, conf_obj.limit_record
+        )
 
         if not all_records:
             return {"type": "error", "message": "No Data to display!"}
 
-        if conf_obj.sort_order and conf_obj.sort_field:
-            sorted_record = self.env[conf_obj.model]
-            sorted_record |= all_records.filtered(
-                lambda arft: getattr(arft, conf_obj.sort_field)
-            ).sorted(
-                key=lambda rc: getattr(rc, conf_obj.sort_field).name
-                if isinstance(getattr(rc, conf_obj.sort_field), models.Model)
-                else getattr(rc, conf_obj.sort_field),
-                reverse=True if conf_obj.sort_order == "desc" else False,
-            )
-            sorted_record |= all_records.filtered(
-                lambda arft: not getattr(arft, conf_obj.sort_field)
-            )
-            all_records = sorted_record
-        if conf_obj.limit_record > 0:
-            all_records = all_records[: conf_obj.limit_record]
         if conf_obj.measurement_field_id:
             all_records = sorted(
                 all_records,
@@ -3147,7 +4086,6 @@ class DashboardChart(models.Model):
             ]
             and conf_obj.previous_period_comparision
         ):
-            today_date = False
             domain = conf_obj.domain
             if conf_obj.company and "company_id" in record_obj._fields:
                 domain.append(("company_id", "in", [conf_obj.company, False]))
@@ -3164,54 +4102,15 @@ class DashboardChart(models.Model):
                     conf_obj.same_period_previous_years,
                     conf_obj.previous_period_duration,
                 )
-                if date_domain.get("domain"):
-                    start_date = date_domain.get("start_date")
-                    end_date = date_domain.get("end_date")
-
-                if (
-                    start_date
-                    and end_date
-                    and start_date.date()
-                    and end_date.date()
-                    and start_date.date() != end_date.date()
-                ):
-                    domain.extend(date_domain["domain"])
-                else:
-                    today_date = start_date.date()
+                domain.extend(date_domain["domain"])
 
-            all_records = record_obj.search(domain)
-            if today_date:
-                all_records = all_records.filtered(
-                    lambda record: getattr(record, conf_obj.date_filter_field)
-                    and (
-                        getattr(record, conf_obj.date_filter_field).date()
-                        if isinstance(
-                            getattr(record, conf_obj.date_filter_field), datetime
-                        )
-                        else getattr(record, conf_obj.date_filter_field)
-                    )
-                    == today_date
-                )
+            all_records = self._search_chart_records(
+                conf_obj, record_obj, domain, conf_obj.limit_record
+            )
 
             if not all_records:
                 return {"type": "error", "message": "Target is not valid!"}
 
-            if conf_obj.sort_order and conf_obj.sort_field:
-                sorted_record = self.env[conf_obj.model]
-                sorted_record |= all_records.filtered(
-                    lambda arft: getattr(arft, conf_obj.sort_field)
-                ).sorted(
-                    key=lambda rc: getattr(rc, conf_obj.sort_field).name
-                    if isinstance(getattr(rc, conf_obj.sort_field), models.Model)
-                    else getattr(rc, conf_obj.sort_field),
-                    reverse=True if conf_obj.sort_order == "desc" else False,
-                )
-                sorted_record |= all_records.filtered(
-                    lambda arft: not getattr(arft, conf_obj.sort_field)
-                )
-                all_records = sorted_record
-            if conf_obj.limit_record > 0:
-                all_records = all_records[: conf_obj.limit_record]
             if conf_obj.measurement_field_id:
                 all_records = sorted(
                     all_records,
@@ -3239,6 +4138,37 @@ class DashboardChart(models.Model):
             "target": target,
         }
 
+    def _get_date_range_domain(self, model_obj, date_filter_field, start, end):
+        """
+        Domain of the records from start to end included, both in the user's
+        timezone. An end at midnight or at the second before it covers its
+        whole day. Datetime fields are bounded by the UTC values of the
+        bounds, datetime.min and datetime.max leave the range open.
+        """
+        field = model_obj._fields.get(date_filter_field)
+        domain = []
+        if field and field.type == "date":
+            if start != datetime.min:
+                domain.append((date_filter_field, ">=", start.date()))
+            if end != datetime.max:
+                domain.append((date_filter_field, "<=", end.date()))
+            return domain
+        tz = pytz.timezone(self.env.context.get("tz") or self.env.user.tz or "UTC")
+
+        def to_utc(local_datetime):
+            return tz.localize(local_datetime).astimezone(pytz.utc).replace(tzinfo=None)
+
+        if start != datetime.min:
+            domain.append((date_filter_field, ">=", to_utc(start)))
+        if end == datetime.max:
+            pass
+        elif end.time() in (time.min, time(23, 59, 59)):
+            next_day = datetime.combine(end.date() + timedelta(days=1), time.min)
+            domain.append((date_filter_field, "<", to_utc(next_day)))
+        else:
+            domain.append((date_filter_field, "<=", to_utc(end)))
+        return domain
+
     def get_date_filter_domain(
         self,
         model_obj,
@@ -3251,8 +4181,10 @@ class DashboardChart(models.Model):
         """
         Prepare date filters domain based on configuration
         """
-        today = datetime.today().replace(hour=0, minute=0, second=0, microsecond=0)
-        now = datetime.now()
+        today = datetime.combine(fields.Date.context_today(self), time.min)
+        now = fields.Datetime.context_timestamp(self, datetime.now()).replace(
+            tzinfo=None
+        )
 
         def start_end(dt, period, delta=relativedelta()):
             if period == "week":
@@ -3387,16 +4319,27 @@ class DashboardChart(models.Model):
         if include_periods > 0:
             base_end += (base_end - base_start) * include_periods
 
-        domain = [
-            (date_filter_field, ">=", base_start),
-            (date_filter_field, "<=", base_end),
-        ]
-        for i in range(1, same_period_previous_years + 1):
-            domain += [
-                "|",
-                (date_filter_field, ">=", base_start.replace(year=base_start.year - i)),
-                (date_filter_field, "<=", base_end.replace(year=base_end.year - i)),
-            ]
+        def shift(bound, years):
+            if bound in (datetime.min, datetime.max):
+                return bound
+            return bound - relativedelta(years=years)
+
+        domain = self._get_date_range_domain(
+            model_obj, date_filter_field, base_start, base_end
+        )
+        if same_period_previous_years:
+            domain = expression.OR(
+                [domain]
+                + [
+                    self._get_date_range_domain(
+                        model_obj,
+                        date_filter_field,
+                        shift(base_start, i),
+                        shift(base_end, i),
+                    )
+                    for i in range(1, same_period_previous_years + 1)
+                ]
+            )
         return {
             "domain": domain,
             "start_date": base_start,
@@ -10,15 +10,15 @@ class Users(models.Model):
     @api.depends("groups_id")
     def _compute_model_access(self):
         """
-        Calculate model access base on user
+        Calculate model access base on user, the global access controls are
+        searched once for the whole batch and the ORM only writes the
+        relation rows that changed
         """
+        access_ids = (
+            self.env["ir.model.access"].sudo().search([("group_id", "=", False)])
+        )
         for record in self:
-            access_ids = (
-                self.env["ir.model.access"].sudo().search([("group_id", "=", False)])
-            )
-            record.model_access = [(5,)]
-            if access_ids:
-                record.model_access = [(4, access_id) for access_id in access_ids.ids]
+            record.model_access = access_ids
 
     model_access = fields.Many2many(
         "ir.model.access",
@@ -31,16 +31,6 @@ class Users(models.Model):
         store=True,
     )
 
-    @api.model_create_multi
-    def create(self, vals_list):
-        """
-        User creation time set model access
-        """
-        records = super(Users, self).create(vals_list)
-        if records:
-            records._compute_model_access()
-        return records
-
     @api.model
     def name_search(self, name="", args=None, operator="ilike", limit=100):
         """
@@ -67,13 +57,11 @@ class Users(models.Model):
 
     def has_read_access(self, model_id):
         """
-        Check user has read access for the object or not
+        Check user has read access for the object or not, the access rights
+        are cached by the ORM per user groups and model
         """
-        # return self.env[model_id.model].with_user(self.id).has_access("read")
-        # check_access_rule :return: None if the operation is allowed
-        has_access = (
-            self.env[model_id.model].with_user(self.id).check_access_rule("read")
+        return (
+            self.env[model_id.model]
+            .with_user(self)
+            .check_access_rights("read", raise_exception=False)
         )
-        if not has_access:
-            return True
-        return False
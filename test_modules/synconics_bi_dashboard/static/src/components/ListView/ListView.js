@@ -17,6 +17,7 @@ export class ListView extends Component {
 
   setup() {
     this.action = useService("action");
+    this.orm = useService("orm");
     this.state = useState({
       columns: [],
       data: [],
@@ -29,8 +30,13 @@ export class ListView extends Component {
       totalRecords: 0,
       totalPages: 0,
       dataModel: "",
+      serverPaging: false,
+      pageSize: 10,
     });
     this.sortTable = (ev, column) => {
+      if (this.state.serverPaging && !column.sortable) {
+        return;
+      }
       let current_order = this.state.columns_order[column["column_name"]];
       this.state.columns_order = this.state.columns.reduce((acc, item) => {
         acc[item.column_name] = undefined;
@@ -42,25 +48,49 @@ export class ListView extends Component {
           : current_order == "desc"
             ? "asc"
             : "asc";
+      if (this.state.serverPaging) {
+        this.load_page(1);
+      }
     };
 
-    this.openRecords = async (ev, currentIds) => {
+    this.openRecords = async (ev, record) => {
+      let domain = [["id", "=", record.id]];
+      if (record.drill_key !== undefined) {
+        domain = await this.orm.call(
+          "dashboard.chart",
+          "get_list_drill_domain",
+          [this.chartIds()],
+          {
+            group_key: record.drill_key,
+            isDirty: this.props.isDirty || false,
+            data: this.props.data || false,
+          },
+        );
+      }
       this.action.doAction({
         type: "ir.actions.act_window",
         name: this.state.chartName,
         res_model: this.state.dataModel,
         views: [[false, "list"]],
-        domain: [["id", "in", Object.values(currentIds)]],
+        domain: domain,
         target: "current",
       });
     };
 
     this.goToPage = (ev) => {
-      this.state.currentPage = parseInt(ev.target.value);
+      const page = parseInt(ev.target.value);
+      if (this.state.serverPaging) {
+        return this.load_page(page);
+      }
+      this.state.currentPage = page;
     };
 
     this.changePage = (updateIndex) => {
-      this.state.currentPage = this.state.currentPage + updateIndex;
+      const page = this.state.currentPage + updateIndex;
+      if (this.state.serverPaging) {
+        return this.load_page(page);
+      }
+      this.state.currentPage = page;
     };
 
     useEffect(
@@ -77,6 +107,9 @@ export class ListView extends Component {
 
     useEffect(
       () => {
+        if (this.state.serverPaging) {
+          return;
+        }
         const sortKeys = Object.entries(this.state.columns_order).filter(
           ([_, dir]) => dir === "asc" || dir === "desc",
         );
@@ -94,6 +127,9 @@ export class ListView extends Component {
 
     useEffect(
       () => {
+        if (this.state.serverPaging) {
+          return;
+        }
         const start = (this.state.currentPage - 1) * 10;
         const end = start + 10;
         this.state.currentRecords = this.state.data.slice(start, end);
@@ -129,8 +165,57 @@ export class ListView extends Component {
     }, {});
 
     this.state.data = data.records;
+    this.state.dataModel = data.model;
+    this.state.currentPage = 1;
+    // Standard lists only come with their first page, next ones are read
+    // from the server
+    this.state.serverPaging = data.total !== undefined;
+    if (this.state.serverPaging) {
+      this.state.pageSize = data.page_size || 10;
+      this.state.currentRecords = data.records;
+      this.state.totalRecords = data.total;
+      this.state.totalPages = Math.ceil(data.total / this.state.pageSize);
+      return;
+    }
     this.state.totalRecords = data.records.length;
     this.state.totalPages = Math.ceil(data.records.length / 10);
-    this.state.dataModel = data.model;
+  }
+
+  chartIds() {
+    // Form previews use "edit_<id>" ids, unsaved charts have no id
+    const chartId = parseInt(String(this.props.chartId).replace("edit_", ""));
+    return isNaN(chartId) ? [] : [chartId];
+  }
+
+  async load_page(page) {
+    if (!page || page < 1 || page > this.state.totalPages) {
+      return;
+    }
+    const [sortColumn, sortOrder] = Object.entries(this.state.columns_order).find(
+      ([_, dir]) => dir === "asc" || dir === "desc",
+    ) || [false, "asc"];
+    const result = await this.orm.call(
+      "dashboard.chart",
+      "get_list_page",
+      [this.chartIds()],
+      {
+        offset: (page - 1) * this.state.pageSize,
+        limit: this.state.pageSize,
+        sort_column: sortColumn,
+        sort_order: sortOrder,
+        isDirty: this.props.isDirty || false,
+        data: this.props.data || false,
+      },
+    );
+    if (result.type) {
+      this.state.isError = true;
+      this.state.errorMessage = result.message;
+      return;
+    }
+    this.state.currentPage = page;
+    this.state.data = result.records;
+    this.state.currentRecords = result.records;
+    this.state.totalRecords = result.total;
+    this.state.totalPages = Math.ceil(result.total / this.state.pageSize);
   }
 }
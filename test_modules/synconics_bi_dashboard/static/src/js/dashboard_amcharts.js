@@ -1,6 +1,13 @@
 /** @odoo-module **/
 
-import { Component, onWillStart, onMounted, useState, useRef } from "@odoo/owl";
+import {
+  Component,
+  onWillStart,
+  onMounted,
+  onWillUnmount,
+  useState,
+  useRef,
+} from "@odoo/owl";
 import { registry } from "@web/core/registry";
 import { _t } from "@web/core/l10n/translation";
 import { useService } from "@web/core/utils/hooks";
@@ -28,6 +35,8 @@ export class DashboardAmcharts extends Component {
     });
     this.reloadKey = useState({ value: 0 });
     this.grid = false;
+    this.chartObserver = false;
+    this.requestedCharts = new Set();
 
     onWillStart(async () => {
       await loadJS("/synconics_bi_dashboard/static/src/lib/jspdf.js");
@@ -50,9 +59,16 @@ export class DashboardAmcharts extends Component {
       if (isMobileOS()) {
         this.grid.column(1);
       }
+      this.observe_charts();
       this.update_timer();
     });
 
+    onWillUnmount(() => {
+      if (this.chartObserver) {
+        this.chartObserver.disconnect();
+      }
+    });
+
     this.onUpdateExport = (chartId, chartDetails) => {
       this.state.downloadDetails[chartId] = chartDetails;
     };
@@ -313,7 +329,7 @@ export class DashboardAmcharts extends Component {
     // [this.auto_reload_duration, this.state.charts, this.state.name] =
     var datas = await this.orm.call(
       "dashboard.dashboard",
-      "get_charts_details",
+      "get_charts_layout",
       [this.props.action.params.record],
     );
     this.auto_reload_duration = datas[0];
@@ -322,6 +338,44 @@ export class DashboardAmcharts extends Component {
     this.dashboard_user = datas[3];
   }
 
+  observe_charts() {
+    // Charts are loaded once they get near the visible part of the dashboard,
+    // the ones above the fold are requested together right after the layout.
+    this.chartObserver = new IntersectionObserver(
+      (entries) => {
+        const chartIds = [];
+        for (const entry of entries) {
+          const chartId = entry.target.getAttribute("data-chart-id");
+          if (entry.isIntersecting && !this.requestedCharts.has(chartId)) {
+            this.requestedCharts.add(chartId);
+            this.chartObserver.unobserve(entry.target);
+            chartIds.push(chartId);
+          }
+        }
+        if (chartIds.length) {
+          this.load_charts_data(chartIds);
+        }
+      },
+      { rootMargin: "200px" },
+    );
+    document
+      .querySelectorAll(".grid-stack .grid-stack-item")
+      .forEach((el) => this.chartObserver.observe(el));
+  }
+
+  async load_charts_data(chartIds) {
+    const chartsData = await this.orm.call(
+      "dashboard.dashboard",
+      "get_charts_data",
+      [this.props.action.params.record, chartIds],
+    );
+    for (const chart of this.state.charts) {
+      if (chart.id in chartsData) {
+        chart.recordset = chartsData[chart.id];
+      }
+    }
+  }
+
   update_timer() {
     var self = this;
     self.timer = setTimeout(() => {
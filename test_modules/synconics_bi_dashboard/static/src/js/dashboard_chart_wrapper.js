@@ -2,6 +2,7 @@
 
 import { Component, useState, onWillUpdateProps } from "@odoo/owl";
 import { useService } from "@web/core/utils/hooks";
+import { download } from "@web/core/network/download";
 import { AreaChart } from "../components/AreaChart/AreaChart";
 import { BarChart } from "../components/BarChart/BarChart";
 import { ColumnChart } from "../components/ColumnChart/ColumnChart";
@@ -21,6 +22,7 @@ import { TileView } from "../components/TileView/TileView";
 import { KPIView } from "../components/KPIView/KPIView";
 import { TodoView } from "../components/TodoView/TodoView";
 import { WarningDialog } from "@web/core/errors/error_dialogs";
+import { deserializeDateTime } from "@web/core/l10n/dates";
 import { _t } from "@web/core/l10n/translation";
 
 export class DashboardChartWrapper extends Component {
@@ -30,10 +32,11 @@ export class DashboardChartWrapper extends Component {
     theme: String,
     chart_type: String,
     editChart: Function,
-    recordSets: Object,
+    recordSets: { optional: true, type: Object },
     background_color: String,
     dashboard_user: Boolean,
     reloadKey: Number,
+    snapshot_generated_at: { optional: true },
     onUpdateExport: { optional: true, type: Function },
   };
 
@@ -48,25 +51,26 @@ export class DashboardChartWrapper extends Component {
       current_group_by: false,
       isKpiError: false,
       recordSets: this.props.recordSets,
+      loading: this.props.recordSets === undefined,
       exporting: false,
       background_color: this.props.background_color,
+      snapshotGeneratedAt: this.props.snapshot_generated_at,
     });
-    if (
-      ["kpi", "tile"].includes(this.props.chart_type) &&
-      typeof this.props.recordSets === "object" &&
-      this.props.recordSets !== null &&
-      !Array.isArray(this.props.recordSets) &&
-      "type" in this.props.recordSets
-    ) {
-      this.state.isKpiError = true;
-    } else {
-      this.state.isKpiError = false;
+    if (!this.state.loading) {
+      this.set_record_sets(this.props.chart_type, this.props.recordSets);
     }
 
     this.orm = useService("orm");
     this.action = useService("action");
     this.dialog = useService("dialog");
     onWillUpdateProps((nextprops) => {
+      if (this.state.loading) {
+        // Not loaded yet, the dashboard pushes the data once it is visible
+        if (nextprops.recordSets !== undefined) {
+          this.set_record_sets(nextprops.chart_type, nextprops.recordSets);
+        }
+        return;
+      }
       this.update_record_sets(
         nextprops.chartId,
         nextprops.chart_type,
@@ -76,6 +80,19 @@ export class DashboardChartWrapper extends Component {
       );
     });
 
+    this.onRefreshSnapshot = async (ev) => {
+      await this.orm.call("dashboard.chart", "action_refresh_snapshot", [
+        parseInt(this.state.chartId),
+      ]);
+      await this.update_record_sets(
+        this.state.chartId,
+        this.state.chart_type,
+        false,
+        this.state.name,
+        Object,
+      );
+    };
+
     this.onEditChart = (ev, chartId) => {
       this.props.editChart(chartId, this.state.name, this.onHandleEdit);
     };
@@ -91,89 +108,39 @@ export class DashboardChartWrapper extends Component {
       }
     };
 
-    this.onDownloadCSV = (ev) => {
-      return this.orm
-        .call("dashboard.chart", "export_csv", [
-          parseInt(this.state.chartId),
-          this.state.name,
-          this.state.chart_type,
-          {
+    this.downloadExport = (fileType, message) => {
+      return download({
+        url: `/synconics_bi_dashboard/export/${fileType}`,
+        data: {
+          chart_id: parseInt(this.state.chartId),
+          name: this.state.name,
+          chart_type: this.state.chart_type,
+          print_vals: JSON.stringify({
             breadcrump_ids: this.state.breadcrump_ids,
             prev_domains: this.state.prev_domains,
-          },
-        ])
-        .then((response) => {
-          if (response.error) {
-            return this.dialog.add(WarningDialog, {
-              title: _t("Warning"),
-              message:
-                _t(
-                  "No data is available for downloading the CSV file at this time!",
-                ) || "",
-            });
-          }
-          const base64Content = response.file_content;
-          const fileName = response.file_name || "download.csv";
-
-          const byteCharacters = atob(base64Content);
-          const byteArray = new Uint8Array(byteCharacters.length);
-          for (let i = 0; i < byteCharacters.length; i++) {
-            byteArray[i] = byteCharacters.charCodeAt(i);
-          }
-
-          const blob = new Blob([byteArray], {
-            type: "text/csv;charset=utf-8;",
-          });
-
-          const link = document.createElement("a");
-          link.href = URL.createObjectURL(blob);
-          link.download = fileName;
-          link.click();
-        })
-        .catch((error) => {
-          console.error("Error downloading CSV:", error);
+          }),
+        },
+      }).catch((error) => {
+        console.error("Error downloading export:", error);
+        this.dialog.add(WarningDialog, {
+          title: _t("Warning"),
+          message: message || "",
         });
+      });
+    };
+
+    this.onDownloadCSV = (ev) => {
+      return this.downloadExport(
+        "csv",
+        _t("No data is available for downloading the CSV file at this time!"),
+      );
     };
 
     this.onDownloadExcel = (ev) => {
-      return this.orm
-        .call("dashboard.chart", "export_excel", [
-          parseInt(this.state.chartId),
-          this.state.name,
-          this.state.chart_type,
-          {
-            breadcrump_ids: this.state.breadcrump_ids,
-            prev_domains: this.state.prev_domains,
-          },
-        ])
-        .then((response) => {
-          if (response.error) {
-            return this.dialog.add(WarningDialog, {
-              title: _t("Warning"),
-              message:
-                _t(
-                  "No data is available for downloading the Excel file at this time!",
-                ) || "",
-            });
-          }
-          const base64Content = response.file_content;
-          const fileName = response.file_name || "download.xlsx";
-          const byteCharacters = atob(base64Content);
-          const byteArray = new Uint8Array(byteCharacters.length);
-          for (let i = 0; i < byteCharacters.length; i++) {
-            byteArray[i] = byteCharacters.charCodeAt(i);
-          }
-          const blob = new Blob([byteArray], {
-            type: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-          });
-          const link = document.createElement("a");
-          link.href = URL.createObjectURL(blob);
-          link.download = fileName;
-          link.click();
-        })
-        .catch((error) => {
-          console.error("Error downloading Excel:", error);
-        });
+      return this.downloadExport(
+        "xlsx",
+        _t("No data is available for downloading the Excel file at this time!"),
+      );
     };
 
     this.onDownloadImage = async (ev) => {
@@ -343,6 +310,10 @@ export class DashboardChartWrapper extends Component {
     };
   }
 
+  get snapshotAge() {
+    return deserializeDateTime(this.state.snapshotGeneratedAt).toRelative();
+  }
+
   dataUrlToBlob(dataUrl) {
     const parts = dataUrl.split(",");
     const mimeMatch = parts[0].match(/:(.*?);/);
@@ -355,13 +326,7 @@ export class DashboardChartWrapper extends Component {
     return new Blob([array], { type: mime });
   }
 
-  async update_record_sets(recordId, chart_type, isDirty, name, data) {
-    let recordSets = await this.orm.call(
-      "dashboard.chart",
-      "get_chart_data",
-      [parseInt(recordId)],
-      { chart_type, name, isDirty, data },
-    );
+  set_record_sets(chart_type, recordSets) {
     if (
       ["kpi", "tile"].includes(chart_type) &&
       typeof recordSets === "object" &&
@@ -374,13 +339,27 @@ export class DashboardChartWrapper extends Component {
       this.state.isKpiError = false;
     }
     this.state.recordSets = recordSets;
+    this.state.loading = false;
+  }
+
+  async update_record_sets(recordId, chart_type, isDirty, name, data) {
+    let recordSets = await this.orm.call(
+      "dashboard.chart",
+      "get_chart_data",
+      [parseInt(recordId)],
+      { chart_type, name, isDirty, data },
+    );
+    this.set_record_sets(chart_type, recordSets);
     let chart_color_id = await this.orm.searchRead(
       "dashboard.chart",
       [["id", "=", parseInt(recordId)]],
-      ["background_color"],
+      ["background_color", "snapshot_mode", "snapshot_generated_at"],
     );
     if (chart_color_id.length) {
       this.state.background_color = chart_color_id[0].background_color;
+      this.state.snapshotGeneratedAt =
+        chart_color_id[0].snapshot_mode &&
+        chart_color_id[0].snapshot_generated_at;
     }
   }
 }
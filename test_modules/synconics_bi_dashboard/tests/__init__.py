@@ -0,0 +1,12 @@
+from . import (
+    test_chart_aggregation,
+    test_chart_benchmark,
+    test_chart_cache,
+    test_chart_image,
+    test_chart_snapshot,
+    test_chart_stat,
+    test_dashboard_import,
+    test_dashboard_loading,
+    test_dashboard_mail,
+    test_user_model_access,
+)
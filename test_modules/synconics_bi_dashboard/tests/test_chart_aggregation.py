@@ -0,0 +1,435 @@
+from datetime import date, datetime
+
+from odoo import fields
+from odoo.tests.common import TransactionCase, tagged
+
+
+@tagged("post_install", "-at_install", "synconics_bi_dashboard")
+class TestChartAggregation(TransactionCase):
+    """
+    Charts computed with a grouped query must match the Python path
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.dashboard = cls.env["dashboard.dashboard"].create(
+            {"name": "Aggregation Dashboard", "cache_ttl": 0}
+        )
+        cls.partner_model = cls.env["ir.model"]._get("res.partner")
+        countries = [
+            cls.env.ref("base.in"),
+            cls.env.ref("base.us"),
+            cls.env["res.country"],
+        ]
+        parents = cls.env["res.partner"].create(
+            [
+                {
+                    "name": "Aggregation Parent %s" % index,
+                    "ref": "bi-aggregation",
+                    "country_id": country.id,
+                }
+                for index, country in enumerate(countries)
+            ]
+        )
+        partner_types = ["contact", "invoice", "delivery"]
+        cls.env["res.partner"].create(
+            [
+                {
+                    "name": "Aggregation Partner %s" % index,
+                    "ref": "bi-aggregation",
+                    "type": partner_types[index % 3],
+                    "color": index % 7,
+                    "partner_latitude": index * 1.5,
+                    "date": date(2024, 1 + index % 12, 1 + index % 28),
+                    "country_id": countries[index % 3].id,
+                    "parent_id": parents[index % 3].id if index % 4 else False,
+                }
+                for index in range(40)
+            ]
+        )
+
+    def _field(self, name):
+        return self.env["ir.model.fields"]._get("res.partner", name)
+
+    def _create_chart(self, chart_type, **vals):
+        return self.env["dashboard.chart"].create(
+            {
+                "name": "Aggregation Chart",
+                "dashboard_id": self.dashboard.id,
+                "chart_type": chart_type,
+                "model_id": self.partner_model.id,
+                "domain": "[('ref', '=', 'bi-aggregation')]",
+                "limit_record": 0,
+                "date_filter_option": "none",
+                **vals,
+            }
+        )
+
+    def _normalize(self, data):
+        if not isinstance(data, list):
+            return data
+        rows = [
+            {
+                key: round(value, 2) if isinstance(value, float) else value
+                for key, value in row.items()
+            }
+            for row in data
+        ]
+        return sorted(rows, key=lambda row: str(row.get("category", row.get("name"))))
+
+    def assertSameChartData(self, chart):
+        db_data = chart.get_chart_data(chart.chart_type, chart.name)
+        python_data = chart.with_context(
+            dashboard_python_aggregate=True
+        ).get_chart_data(chart.chart_type, chart.name)
+        self.assertEqual(self._normalize(db_data), self._normalize(python_data))
+
+    def test_measurement_group_data(self):
+        measurements = self._field("color") | self._field("partner_latitude")
+        for data_type in ["count", "sum", "average"]:
+            for hide_false_value in [True, False]:
+                chart = self._create_chart(
+                    "column_chart",
+                    data_type=data_type,
+                    group_by_id=self._field("country_id").id,
+                    sub_group_by_id=self._field("type").id,
+                    measurement_field_ids=[(6, 0, measurements.ids)],
+                    hide_false_value=hide_false_value,
+                )
+                self.assertSameChartData(chart)
+
+    def test_measurement_group_time_range(self):
+        for time_range in ["day", "week", "month", "quarter", "year"]:
+            chart = self._create_chart(
+                "line_chart",
+                data_type="sum",
+                group_by_id=self._field("date").id,
+                time_range=time_range,
+                measurement_field_ids=[(6, 0, self._field("color").ids)],
+            )
+            self.assertSameChartData(chart)
+
+    def test_measurement_group_limit(self):
+        chart = self._create_chart(
+            "bar_chart",
+            data_type="count",
+            group_by_id=self._field("type").id,
+            limit_record=10,
+        )
+        self.assertSameChartData(chart)
+
+    def test_sorted_limit(self):
+        record_obj = self.env["res.partner"]
+        for sort_field in ["partner_latitude", "country_id"]:
+            for sort_order in ["asc", "desc"]:
+                chart = self._create_chart(
+                    "bar_chart",
+                    data_type="sum",
+                    group_by_id=self._field("type").id,
+                    measurement_field_ids=[(6, 0, self._field("color").ids)],
+                    sort_field_id=self._field(sort_field).id,
+                    sort_order=sort_order,
+                    limit_record=10,
+                )
+                conf, __ = chart._init_configuration()
+                self.assertTrue(
+                    chart._can_aggregate_in_db(conf, record_obj, [("type", False)])
+                )
+                self.assertSameChartData(chart)
+
+        chart.sort_field_id = self._field("partner_latitude")
+        conf, __ = chart._init_configuration()
+        records = chart._search_chart_records(
+            conf, record_obj, [("ref", "=", "bi-aggregation")], 3
+        )
+        self.assertEqual(records.mapped("partner_latitude"), [58.5, 57.0, 55.5])
+
+    def test_sorted_by_many2one_name(self):
+        # States are ordered by code, the chart sorts them by name
+        country = self.env["res.country"].create({"name": "Sort Land", "code": "ZZ"})
+        states = self.env["res.country.state"].create(
+            [
+                {"name": "Sort State %s" % name, "code": code, "country_id": country.id}
+                for name, code in [("A", "Z"), ("B", "Y"), ("C", "X")]
+            ]
+        )
+        self.env["res.partner"].create(
+            [
+                {
+                    "name": "Sort Partner %s" % index,
+                    "ref": "bi-sort",
+                    "state_id": state.id,
+                }
+                for index, state in enumerate([*states, states.browse()])
+            ]
+        )
+        chart = self._create_chart(
+            "bar_chart",
+            sort_field_id=self._field("state_id").id,
+            sort_order="desc",
+        )
+        conf, __ = chart._init_configuration()
+        self.assertEqual(
+            chart._get_sort_order(conf, self.env["res.partner"]),
+            "state_id.name desc nulls last, id",
+        )
+        records = chart._search_chart_records(
+            conf, self.env["res.partner"], [("ref", "=", "bi-sort")], 2
+        )
+        self.assertEqual(
+            records.mapped("state_id.name"), ["Sort State C", "Sort State B"]
+        )
+
+        # res.users are named by their partner, not stored
+        chart.sort_field_id = self._field("user_id")
+        conf, __ = chart._init_configuration()
+        self.assertIs(chart._get_sort_order(conf, self.env["res.partner"]), False)
+
+    def test_list_export_rows(self):
+        chart = self._create_chart(
+            "list",
+            list_type="standard",
+            list_field_ids=[
+                (0, 0, {"sequence": 1, "list_field_id": self._field("name").id}),
+                (0, 0, {"sequence": 2, "list_field_id": self._field("country_id").id}),
+            ],
+            sort_field_id=self._field("name").id,
+            sort_order="asc",
+        )
+        self.assertTrue(chart._is_streamed_export("list"))
+        data = chart.get_chart_data("list", chart.name)
+        self.assertEqual(data["total"], 43)
+        self.assertEqual(len(data["records"]), 10)
+        records = chart.get_list_page(limit=100)["records"]
+        rows = list(chart._iter_list_export_rows(batch_size=7))
+        self.assertEqual(rows[0], [column["name"] for column in data["columns"]])
+        self.assertEqual(
+            rows[1:],
+            [[record["name"], record["country_id"]] for record in records],
+        )
+        self.assertEqual(len(rows), 44)
+
+    def test_list_page(self):
+        chart = self._create_chart(
+            "list",
+            list_type="standard",
+            list_field_ids=[
+                (0, 0, {"sequence": 1, "list_field_id": self._field("name").id}),
+                (0, 0, {"sequence": 2, "list_field_id": self._field("country_id").id}),
+            ],
+            sort_field_id=self._field("partner_latitude").id,
+            sort_order="desc",
+            limit_record=25,
+        )
+        partners = self.env["res.partner"].search(
+            [("ref", "=", "bi-aggregation")],
+            order="partner_latitude desc nulls last, id",
+            limit=25,
+        )
+        page = chart.get_list_page(offset=20, limit=10)
+        self.assertEqual(page["total"], 25)
+        self.assertEqual([row["id"] for row in page["records"]], partners[20:].ids)
+        self.assertEqual(
+            page["records"][0]["country_id"],
+            partners[20].country_id.display_name or "",
+        )
+
+        page = chart.get_list_page(limit=5, sort_column="name", sort_order="desc")
+        by_name = self.env["res.partner"].search(
+            [("id", "in", partners.ids)], order="name desc, id", limit=5
+        )
+        self.assertEqual([row["id"] for row in page["records"]], by_name.ids)
+        # non stored columns can't be sorted by the database
+        page = chart.get_list_page(limit=5, sort_column="display_name")
+        self.assertEqual([row["id"] for row in page["records"]], partners[:5].ids)
+
+    def test_list_drill_domain(self):
+        partner_obj = self.env["res.partner"]
+        for group_by, time_range, limit, count in [
+            ("country_id", False, 0, 43),
+            ("date", "month", 0, 43),
+            ("date", "quarter", 0, 43),
+            ("date", "month", 10, 10),
+        ]:
+            chart = self._create_chart(
+                "list",
+                list_type="grouped",
+                group_by_id=self._field(group_by).id,
+                time_range=time_range,
+                limit_record=limit,
+                sort_field_id=self._field("name").id,
+                sort_order="desc",
+                list_measure_ids=[
+                    (
+                        0,
+                        0,
+                        {
+                            "list_measure_id": self._field("color").id,
+                            "value_type": "sum",
+                        },
+                    )
+                ],
+            )
+            data = chart.get_chart_data("list", chart.name)
+            for row in data["records"]:
+                self.assertNotIn("currentIds", row)
+                records = partner_obj.search(
+                    chart.get_list_drill_domain(row["drill_key"])
+                )
+                self.assertTrue(records)
+                self.assertEqual(sum(records.mapped("color")), row["color"])
+            self.assertEqual(
+                sum(
+                    partner_obj.search_count(
+                        chart.get_list_drill_domain(row["drill_key"])
+                    )
+                    for row in data["records"]
+                ),
+                count,
+            )
+
+    def test_category_value_data(self):
+        for data_type in ["count", "sum", "average"]:
+            chart = self._create_chart(
+                "pie_chart",
+                data_type=data_type,
+                group_by_id=self._field("parent_id").id,
+                measurement_field_id=self._field("partner_latitude").id,
+                sort_order="desc",
+            )
+            self.assertSameChartData(chart)
+
+    def test_map_chart_data(self):
+        for data_type in ["count", "sum", "average"]:
+            chart = self._create_chart(
+                "map_chart",
+                data_type=data_type,
+                map_group_by_id=self._field("parent_id").id,
+                measurement_field_id=self._field("color").id,
+            )
+            self.assertSameChartData(chart)
+
+    def test_tile_data(self):
+        for data_type in ["count", "sum", "average"]:
+            for limit_record in [0, 15]:
+                chart = self._create_chart(
+                    "tile",
+                    data_type=data_type,
+                    measurement_field_id=self._field("partner_latitude").id,
+                    limit_record=limit_record,
+                )
+                self.assertSameChartData(chart)
+
+    def test_kpi_data(self):
+        # The previous period is the year of the partner dates
+        previous_years = fields.Date.today().year - 2024
+        for data_type in ["count", "sum", "average"]:
+            chart = self._create_chart(
+                "kpi",
+                data_type=data_type,
+                measurement_field_id=self._field("partner_latitude").id,
+                date_filter_field_id=self._field("date").id,
+                date_filter_option="this_year",
+                previous_period_comparision=True,
+                previous_period_duration=previous_years,
+                previous_period_type="value",
+                kpi_model_id=self.partner_model.id,
+                kpi_domain="[('ref', '=', 'bi-aggregation')]",
+                kpi_data_type="sum",
+                kpi_measurement_field_id=self._field("color").id,
+                kpi_comparison_type="ratio",
+            )
+            conf, __ = chart._init_configuration()
+            self.assertEqual(
+                set(chart._get_kpi_values(conf)), {"current", "previous", "secondary"}
+            )
+            self.assertSameChartData(chart)
+
+    def test_kpi_totals_pending_changes(self):
+        chart = self._create_chart("tile", data_type="count")
+        partner_obj = self.env["res.partner"]
+        domain = [("ref", "=", "bi-aggregation")]
+        partners = partner_obj.search(domain)
+        # Not flushed yet when the totals are read
+        partners.partner_latitude = 1.0
+        partners[:4].date = date(2030, 1, 1)
+        totals = chart._read_kpi_totals(
+            [
+                (
+                    partner_obj,
+                    domain,
+                    "partner_latitude",
+                    [[("date", ">=", "2030-01-01")]],
+                )
+            ]
+        )
+        self.assertEqual(totals, [(4, 4.0)])
+
+    def test_non_stored_field_fallback(self):
+        chart = self._create_chart(
+            "bar_chart",
+            data_type="count",
+            group_by_id=self._field("same_vat_partner_id").id,
+        )
+        conf, __ = chart._init_configuration()
+        record_obj = self.env["res.partner"]
+        self.assertFalse(
+            chart._can_aggregate_in_db(conf, record_obj, [(conf.group_by, False)])
+        )
+        conf.group_by = "country_id"
+        self.assertTrue(
+            chart._can_aggregate_in_db(conf, record_obj, [(conf.group_by, False)])
+        )
+
+    def test_date_range_domain(self):
+        chart = self._create_chart("tile", data_type="count")
+        partner_obj = self.env["res.partner"]
+        day = datetime(2024, 3, 1)
+        self.assertEqual(
+            chart._get_date_range_domain(partner_obj, "date", day, day),
+            [("date", ">=", date(2024, 3, 1)), ("date", "<=", date(2024, 3, 1))],
+        )
+        chart = chart.with_context(tz="Asia/Kolkata")
+        self.assertEqual(
+            chart._get_date_range_domain(partner_obj, "create_date", day, day),
+            [
+                ("create_date", ">=", datetime(2024, 2, 29, 18, 30)),
+                ("create_date", "<", datetime(2024, 3, 1, 18, 30)),
+            ],
+        )
+        # Several days are converted the same way
+        self.assertEqual(
+            chart._get_date_range_domain(
+                partner_obj, "create_date", day, datetime(2024, 3, 7, 23, 59, 59)
+            ),
+            [
+                ("create_date", ">=", datetime(2024, 2, 29, 18, 30)),
+                ("create_date", "<", datetime(2024, 3, 7, 18, 30)),
+            ],
+        )
+        self.assertEqual(
+            chart._get_date_range_domain(
+                partner_obj, "create_date", datetime.min, datetime(2024, 3, 7, 12)
+            ),
+            [("create_date", "<=", datetime(2024, 3, 7, 6, 30))],
+        )
+
+    def test_today_filter(self):
+        today = fields.Date.context_today(self.env["res.partner"])
+        self.env["res.partner"].create(
+            {"name": "Aggregation Today", "ref": "bi-aggregation", "date": today}
+        )
+        chart = self._create_chart(
+            "tile",
+            data_type="count",
+            date_filter_field_id=self._field("date").id,
+            date_filter_option="today",
+        )
+        self.assertEqual(
+            chart.get_chart_data("tile", chart.name)["calculated_count"], 1
+        )
+        chart.date_filter_field_id = self._field("create_date")
+        self.assertEqual(
+            chart.get_chart_data("tile", chart.name)["calculated_count"], 44
+        )
@@ -0,0 +1,194 @@
+import logging
+import os
+import time
+import tracemalloc
+from datetime import date
+
+from odoo.tests.common import TransactionCase, tagged
+
+_logger = logging.getLogger(__name__)
+
+# Number of seeded partners, raise it to benchmark larger datasets
+BENCHMARK_RECORDS = int(os.environ.get("BI_DASHBOARD_BENCHMARK_RECORDS", "300"))
+
+# Maximum number of queries of get_chart_data per chart type, on a cold
+# ORM cache. They must not depend on the number of records.
+QUERY_BUDGETS = {
+    "area_chart": 25,
+    "bar_chart": 25,
+    "column_chart": 25,
+    "doughnut_chart": 25,
+    "line_chart": 25,
+    "stackedcolumn_chart": 25,
+    "radial_chart": 25,
+    "scatter_chart": 25,
+    "funnel_chart": 25,
+    "pyramid_chart": 25,
+    "pie_chart": 25,
+    "radar_chart": 25,
+    "map_chart": 25,
+    "meter_chart": 25,
+    "list": 30,
+    "tile": 20,
+    "kpi": 25,
+    "to_do": 30,
+}
+
+
+@tagged("post_install", "-at_install", "synconics_bi_dashboard")
+class TestChartBenchmark(TransactionCase):
+    """
+    Time every chart type through get_chart_data and check its query budget
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # The sampled render statistics would make the query budgets random
+        cls.env["ir.config_parameter"].set_param(
+            "synconics_bi_dashboard.render_stat_rate", 0
+        )
+        cls.dashboard = cls.env["dashboard.dashboard"].create(
+            {"name": "Benchmark Dashboard", "cache_ttl": 0}
+        )
+        cls.partner_model = cls.env["ir.model"]._get("res.partner")
+        countries = cls.env["res.country"].search([], limit=10)
+        partners = cls.env["res.partner"].create(
+            [
+                {
+                    "name": "Benchmark Partner %s" % index,
+                    "ref": "bi-benchmark",
+                    "type": ["contact", "invoice", "delivery"][index % 3],
+                    "color": index % 11,
+                    "partner_latitude": index / 7,
+                    "date": date(2024, 1 + index % 12, 1 + index % 28),
+                    "country_id": countries[index % len(countries)].id,
+                }
+                for index in range(BENCHMARK_RECORDS)
+            ]
+        )
+        activity_type = cls.env.ref("mail.mail_activity_data_todo")
+        cls.env["mail.activity"].create(
+            [
+                {
+                    "res_model_id": cls.partner_model.id,
+                    "res_id": partner.id,
+                    "activity_type_id": activity_type.id,
+                    "summary": "Benchmark activity",
+                    "date_deadline": partner.date,
+                    "user_id": cls.env.uid,
+                }
+                for partner in partners[::10]
+            ]
+        )
+
+    def _field(self, name, model="res.partner"):
+        return self.env["ir.model.fields"]._get(model, name)
+
+    def _get_chart_vals(self, chart_type):
+        measures = self._field("color") | self._field("partner_latitude")
+        vals = {
+            "name": "Benchmark %s" % chart_type,
+            "dashboard_id": self.dashboard.id,
+            "chart_type": chart_type,
+            "model_id": self.partner_model.id,
+            "domain": "[('ref', '=', 'bi-benchmark')]",
+            "limit_record": 0,
+            "date_filter_option": "none",
+            "data_type": "sum",
+            "group_by_id": self._field("country_id").id,
+            "measurement_field_id": self._field("color").id,
+            "measurement_field_ids": [(6, 0, measures.ids)],
+        }
+        if chart_type in ("line_chart", "area_chart"):
+            vals.update({"group_by_id": self._field("date").id, "time_range": "month"})
+        elif chart_type in ("stackedcolumn_chart", "column_chart"):
+            vals["sub_group_by_id"] = self._field("type").id
+        elif chart_type == "map_chart":
+            vals["map_group_by_id"] = self._field("country_id").id
+        elif chart_type == "meter_chart":
+            vals["meter_target"] = 1000
+        elif chart_type == "list":
+            vals.update(
+                {
+                    "list_type": "standard",
+                    "list_field_ids": [
+                        (
+                            0,
+                            0,
+                            {"sequence": 1, "list_field_id": self._field("name").id},
+                        ),
+                        (
+                            0,
+                            0,
+                            {
+                                "sequence": 2,
+                                "list_field_id": self._field("country_id").id,
+                            },
+                        ),
+                    ],
+                }
+            )
+        elif chart_type == "kpi":
+            vals.update(
+                {
+                    "date_filter_field_id": self._field("date").id,
+                    "date_filter_option": "this_year",
+                    "previous_period_comparision": True,
+                    "kpi_model_id": self.partner_model.id,
+                    "kpi_domain": "[('ref', '=', 'bi-benchmark')]",
+                    "kpi_data_type": "count",
+                    "kpi_comparison_type": "ratio",
+                }
+            )
+        elif chart_type == "to_do":
+            vals.update(
+                {
+                    "todo_layout": "activity",
+                    "date_filter_field_id": self._field(
+                        "date_deadline", "mail.activity"
+                    ).id,
+                    "sort_order": "asc",
+                }
+            )
+        return vals
+
+    def _measure(self, chart):
+        self.env.invalidate_all()
+        queries = self.env.cr.sql_log_count
+        tracemalloc.start()
+        start = time.perf_counter()
+        data = chart.get_chart_data(chart.chart_type, chart.name)
+        duration = time.perf_counter() - start
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return data, self.env.cr.sql_log_count - queries, duration, peak_memory
+
+    def test_chart_types_budget(self):
+        charts = self.env["dashboard.chart"].create(
+            [self._get_chart_vals(chart_type) for chart_type in QUERY_BUDGETS]
+        )
+        results = []
+        for chart in charts:
+            data, queries, duration, peak_memory = self._measure(chart)
+            self.assertFalse(
+                isinstance(data, dict) and data.get("type") == "error",
+                "%s chart failed: %s" % (chart.chart_type, data),
+            )
+            results.append((chart.chart_type, queries, duration, peak_memory))
+
+        _logger.info(
+            "Chart benchmark on %s records:\n%s",
+            BENCHMARK_RECORDS,
+            "\n".join(
+                "%-20s %4d queries %8.1f ms %8.1f KiB"
+                % (chart_type, queries, duration * 1000, peak_memory / 1024)
+                for chart_type, queries, duration, peak_memory in results
+            ),
+        )
+        for chart_type, queries, __, __ in results:
+            self.assertLessEqual(
+                queries,
+                QUERY_BUDGETS[chart_type],
+                "%s chart exceeds its query budget" % chart_type,
+            )
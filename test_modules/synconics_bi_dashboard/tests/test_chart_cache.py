@@ -0,0 +1,114 @@
+from dateutil.relativedelta import relativedelta
+from odoo import fields
+from odoo.tests.common import TransactionCase, tagged
+
+from ..models.chart_cache import domain_cache
+
+
+@tagged("post_install", "-at_install", "synconics_bi_dashboard")
+class TestChartCache(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.dashboard = cls.env["dashboard.dashboard"].create(
+            {"name": "Cache Dashboard", "cache_ttl": 300}
+        )
+        cls.env["res.partner"].create(
+            [
+                {"name": "Cache Partner %s" % index, "ref": "bi-cache"}
+                for index in range(3)
+            ]
+        )
+        cls.chart = cls.env["dashboard.chart"].create(
+            {
+                "name": "Cached Tile",
+                "dashboard_id": cls.dashboard.id,
+                "chart_type": "tile",
+                "data_type": "count",
+                "model_id": cls.env["ir.model"]._get("res.partner").id,
+                "domain": "[('ref', '=', 'bi-cache')]",
+                "limit_record": 0,
+            }
+        )
+
+    def _get_count(self):
+        return self.chart.get_chart_data("tile", self.chart.name)["calculated_count"]
+
+    def _get_stats(self):
+        self.dashboard.invalidate_recordset(
+            ["chart_cache_hit_count", "chart_cache_miss_count"]
+        )
+        return (
+            self.dashboard.chart_cache_hit_count,
+            self.dashboard.chart_cache_miss_count,
+        )
+
+    def test_cache_hit_and_model_invalidation(self):
+        self.assertEqual(self._get_count(), 3)
+        self.assertEqual(self._get_count(), 3)
+        self.assertEqual(self._get_stats(), (1, 1))
+
+        self.env["res.partner"].create({"name": "Cache Partner", "ref": "bi-cache"})
+        self.assertEqual(self._get_count(), 4)
+        self.assertEqual(self._get_stats(), (1, 2))
+
+    def test_change_in_other_worker(self):
+        self.assertEqual(self._get_count(), 3)
+        self.assertEqual(self._get_count(), 3)
+        # Another worker committed a change of partners
+        self.env["dashboard.chart.cache.version"]._bump_versions(
+            self.env.cr, ["res.partner"]
+        )
+        self.assertEqual(self._get_count(), 3)
+        self.assertEqual(self._get_stats(), (1, 2))
+
+    def test_flushed_change(self):
+        partner = self.env["res.partner"].create({"name": "Cache Partner"})
+        self.assertEqual(self._get_count(), 3)
+        # Low level write, as done when flushing recomputed stored fields
+        partner._write({"ref": "bi-cache"})
+        self.assertEqual(self._get_count(), 4)
+        self.assertEqual(self._get_stats(), (0, 2))
+
+    def test_pending_change(self):
+        partner = self.env["res.partner"].create({"name": "Cache Partner"})
+        self.assertEqual(self._get_count(), 3)
+        # Not flushed yet when the chart is read again
+        partner.ref = "bi-cache"
+        self.assertEqual(self._get_count(), 4)
+        self.assertEqual(self._get_stats(), (0, 2))
+
+    def test_cache_disabled(self):
+        self.dashboard.cache_ttl = 0
+        self._get_count()
+        self._get_count()
+        self.assertEqual(self._get_stats(), (0, 0))
+
+    def test_cached_data_is_copied(self):
+        self.chart.get_chart_data("tile", self.chart.name).update({"count": "changed"})
+        self.assertNotEqual(
+            self.chart.get_chart_data("tile", self.chart.name)["count"], "changed"
+        )
+
+    def test_evaluated_domain(self):
+        domain = (
+            "[('ref', '=', 'bi-cache'), ('create_date', '>=', "
+            "(context_today() - relativedelta(days=1)).strftime('%Y-%m-%d'))]"
+        )
+        self.chart.domain = domain
+        today = fields.Date.context_today(self.chart)
+        expected = [
+            ("ref", "=", "bi-cache"),
+            ("create_date", ">=", fields.Date.to_string(today - relativedelta(days=1))),
+        ]
+        evaluated_domain = self.chart.evaluate_odoo_domain(domain)
+        self.assertEqual(evaluated_domain, expected)
+        # The cached domain is not changed by the caller
+        evaluated_domain.append(("id", "=", 0))
+        self.assertIn((domain, today), domain_cache._entries)
+        self.assertEqual(self.chart.evaluate_odoo_domain(domain), expected)
+        self.assertEqual(self.chart.evaluate_odoo_domain("[('id', '=', ["), [])
+        # Same restrictions as safe_eval
+        self.assertEqual(
+            self.chart.evaluate_odoo_domain("[('id', '=', ().__class__)]"), []
+        )
@@ -0,0 +1,96 @@
+import base64
+from unittest.mock import patch
+
+from odoo.tests.common import TransactionCase, tagged
+
+from ..models import dashboard_chart
+from ..models.chart_cache import LRUCache
+
+
+@tagged("post_install", "-at_install", "synconics_bi_dashboard")
+class TestChartImage(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.dashboard = cls.env["dashboard.dashboard"].create(
+            {"name": "Image Dashboard", "cache_ttl": 0}
+        )
+        cls.env["res.partner"].create({"name": "Image Partner", "ref": "bi-image"})
+        cls.charts = cls.env["dashboard.chart"].create(
+            [
+                {
+                    "name": name,
+                    "dashboard_id": cls.dashboard.id,
+                    "chart_type": "tile",
+                    "data_type": "count",
+                    "model_id": cls.env["ir.model"]._get("res.partner").id,
+                    "domain": "[('ref', '=', 'bi-image')]",
+                    "limit_record": 0,
+                }
+                for name in ["Image Tile", "Other Image Tile"]
+            ]
+        )
+
+    def setUp(self):
+        super().setUp()
+        self.image_cache = LRUCache(max_size=128)
+        self.startPatcher(
+            patch.object(dashboard_chart, "rendered_image_cache", self.image_cache)
+        )
+        self.from_string = self.startPatcher(
+            patch.object(
+                dashboard_chart.imgkit,
+                "from_string",
+                side_effect=lambda html, output_path, options=None: html.encode(),
+            )
+        )
+
+    def _decode(self, image):
+        prefix = "data:image/jpeg;base64,"
+        self.assertTrue(image.startswith(prefix))
+        return base64.b64decode(image[len(prefix) :]).decode()
+
+    def test_render_batch(self):
+        images = dashboard_chart.render_html_images(
+            ["<p>1</p>", "<p>2</p>", "<p>1</p>"]
+        )
+        self.assertEqual(
+            [self._decode(image) for image in images],
+            ["<p>1</p>", "<p>2</p>", "<p>1</p>"],
+        )
+        # Same page rendered once
+        self.assertEqual(self.from_string.call_count, 2)
+
+        images = dashboard_chart.render_html_images(["<p>2</p>", "<p>3</p>"])
+        self.assertEqual(
+            [self._decode(image) for image in images], ["<p>2</p>", "<p>3</p>"]
+        )
+        self.assertEqual(self.from_string.call_count, 3)
+
+    def test_chart_images_cached(self):
+        images = self.charts.html_to_image_batch()
+        self.assertEqual(set(images), set(self.charts.ids))
+        self.assertIn("Image Tile", self._decode(images[self.charts[0].id]))
+        self.assertEqual(self.from_string.call_count, 2)
+
+        # Unchanged charts are not rendered again
+        self.assertEqual(self.charts.html_to_image_batch(), images)
+        self.assertEqual(self.from_string.call_count, 2)
+
+        self.env["res.partner"].create({"name": "Image Partner", "ref": "bi-image"})
+        self.assertNotEqual(self.charts[0].html_to_image(), images[self.charts[0].id])
+        self.assertEqual(self.from_string.call_count, 3)
+
+    def test_cache_size_limit(self):
+        cache = LRUCache(max_size=10, max_bytes=10)
+        cache.set("a", "x" * 4)
+        cache.set("b", "x" * 4)
+        cache.set("c", "x" * 4)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.size_bytes, 8)
+        cache.set("b", "x" * 2)
+        self.assertEqual(cache.size_bytes, 6)
+        # Larger than the whole cache, not kept
+        cache.set("d", "x" * 11)
+        self.assertIsNone(cache.get("d"))
+        self.assertEqual(cache.get("c"), "x" * 4)
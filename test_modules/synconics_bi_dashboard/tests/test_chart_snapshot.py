@@ -0,0 +1,87 @@
+from odoo.tests.common import TransactionCase, new_test_user, tagged
+
+
+@tagged("post_install", "-at_install", "synconics_bi_dashboard")
+class TestChartSnapshot(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = new_test_user(
+            cls.env,
+            login="bi_snapshot_user",
+            groups="base.group_user,synconics_bi_dashboard.group_dashboard_manager",
+        )
+        cls.dashboard = cls.env["dashboard.dashboard"].create(
+            {"name": "Snapshot Dashboard", "cache_ttl": 0}
+        )
+        cls.env["res.partner"].create(
+            [
+                {"name": "Snapshot Partner %s" % index, "ref": "bi-snapshot"}
+                for index in range(2)
+            ]
+        )
+        cls.chart = cls.env["dashboard.chart"].create(
+            {
+                "name": "Snapshot Tile",
+                "dashboard_id": cls.dashboard.id,
+                "chart_type": "tile",
+                "data_type": "count",
+                "model_id": cls.env["ir.model"]._get("res.partner").id,
+                "domain": "[('ref', '=', 'bi-snapshot')]",
+                "limit_record": 0,
+                "snapshot_mode": True,
+                "snapshot_user_id": cls.user.id,
+            }
+        )
+
+    def _get_count(self, user=None):
+        user = user or self.user
+        chart = self.chart.with_user(user).with_company(user.company_id)
+        return chart.get_chart_data("tile", chart.name)["calculated_count"]
+
+    def test_snapshot_served_until_refresh(self):
+        self.assertFalse(self.chart.snapshot_generated_at)
+        self.env["dashboard.chart"]._cron_refresh_snapshots()
+        self.assertTrue(self.chart.snapshot_generated_at)
+        self.assertEqual(self._get_count(), 2)
+
+        self.env["res.partner"].create(
+            {"name": "Snapshot Partner", "ref": "bi-snapshot"}
+        )
+        self.assertEqual(self._get_count(), 2)
+        # Not due yet
+        self.env["dashboard.chart"]._cron_refresh_snapshots()
+        self.assertEqual(self._get_count(), 2)
+
+        self.chart.action_refresh_snapshot()
+        self.assertEqual(self._get_count(), 3)
+
+    def test_snapshot_dropped_on_configuration_change(self):
+        self.chart.action_refresh_snapshot()
+        self.assertTrue(self.chart.snapshot_ids)
+        self.chart.domain = "[('ref', '=', 'bi-snapshot'), ('id', '<', 0)]"
+        self.assertFalse(self.chart.snapshot_ids)
+        self.assertEqual(self._get_count(), 0)
+
+    def test_snapshot_served_to_same_access(self):
+        colleague = new_test_user(
+            self.env,
+            login="bi_snapshot_colleague",
+            groups="base.group_user,synconics_bi_dashboard.group_dashboard_manager",
+        )
+        partner_manager = new_test_user(
+            self.env,
+            login="bi_snapshot_partner_manager",
+            groups="base.group_user,base.group_partner_manager,"
+            "synconics_bi_dashboard.group_dashboard_manager",
+        )
+        self.chart.action_refresh_snapshot()
+        self.env["res.partner"].create(
+            {"name": "Snapshot Partner", "ref": "bi-snapshot"}
+        )
+        self.assertEqual(self._get_count(colleague), 2)
+        # Other access rights, computed for the user instead
+        self.assertEqual(self._get_count(partner_manager), 3)
+        self.assertEqual(
+            self.chart.get_chart_data("tile", self.chart.name)["calculated_count"], 3
+        )
@@ -0,0 +1,90 @@
+from unittest.mock import patch
+
+from odoo.tests.common import TransactionCase, tagged
+
+
+@tagged("post_install", "-at_install", "synconics_bi_dashboard")
+class TestChartStat(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.dashboard = cls.env["dashboard.dashboard"].create(
+            {"name": "Stat Dashboard", "cache_ttl": 0}
+        )
+        cls.env["res.partner"].create(
+            [
+                {"name": "Stat Partner %s" % index, "ref": "bi-stat"}
+                for index in range(3)
+            ]
+        )
+        cls.chart = cls.env["dashboard.chart"].create(
+            {
+                "name": "Stat Tile",
+                "dashboard_id": cls.dashboard.id,
+                "chart_type": "tile",
+                "data_type": "count",
+                "model_id": cls.env["ir.model"]._get("res.partner").id,
+                "domain": "[('ref', '=', 'bi-stat')]",
+                "limit_record": 0,
+            }
+        )
+
+    def setUp(self):
+        super().setUp()
+        self.env["ir.config_parameter"].set_param(
+            "synconics_bi_dashboard.render_stat_rate", 1
+        )
+
+    def test_render_recorded(self):
+        self.chart.get_chart_data("tile", self.chart.name)
+        self.chart.get_chart_data("tile", self.chart.name)
+        stats = self.env["dashboard.chart.stat"].search(
+            [("chart_id", "=", self.chart.id)]
+        )
+        self.assertEqual(len(stats), 2)
+        self.assertTrue(all(stat.query_count > 0 for stat in stats))
+        self.assertTrue(all(stat.payload_size > 0 for stat in stats))
+        self.assertEqual(stats[0].row_count, 1)
+
+        self.env.invalidate_all()
+        self.assertEqual(self.chart.render_count, 2)
+        self.assertGreater(self.chart.p95_render_time, 0)
+        self.assertGreaterEqual(self.chart.p95_render_time, self.chart.avg_render_time)
+        performance = self.env["dashboard.chart.performance"].search(
+            [("chart_id", "=", self.chart.id)]
+        )
+        self.assertEqual(performance.render_count, 2)
+
+    def test_render_sampling(self):
+        self.env["ir.config_parameter"].set_param(
+            "synconics_bi_dashboard.render_stat_rate", 0
+        )
+        self.chart.get_chart_data("tile", self.chart.name)
+        self.env["ir.config_parameter"].set_param(
+            "synconics_bi_dashboard.render_stat_rate", 0.5
+        )
+        with patch(
+            "odoo.addons.synconics_bi_dashboard.models.dashboard_chart.random.random",
+            side_effect=[0.7, 0.2],
+        ):
+            self.chart.get_chart_data("tile", self.chart.name)
+            self.chart.get_chart_data("tile", self.chart.name)
+        self.assertEqual(
+            self.env["dashboard.chart.stat"].search_count(
+                [("chart_id", "=", self.chart.id)]
+            ),
+            1,
+        )
+
+    def test_gc_render_stats(self):
+        self.env["dashboard.chart.stat"].create(
+            [{"chart_id": self.chart.id, "duration": index} for index in range(5)]
+        )
+        with patch(
+            "odoo.addons.synconics_bi_dashboard.models.chart_stat.STAT_HISTORY_SIZE", 2
+        ):
+            self.env["dashboard.chart.stat"]._gc_render_stats()
+        stats = self.env["dashboard.chart.stat"].search(
+            [("chart_id", "=", self.chart.id)]
+        )
+        self.assertEqual(stats.mapped("duration"), [4, 3])
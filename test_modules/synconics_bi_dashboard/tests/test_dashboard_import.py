@@ -0,0 +1,75 @@
+from odoo.tests.common import TransactionCase, tagged
+
+
+@tagged("post_install", "-at_install", "synconics_bi_dashboard")
+class TestDashboardImport(TransactionCase):
+    def _field(self, name):
+        return self.env["ir.model.fields"]._get("res.partner", name)
+
+    def _export_dashboard(self, chart_count):
+        dashboard = self.env["dashboard.dashboard"].create({"name": "Export Dashboard"})
+        partner_model = self.env["ir.model"]._get("res.partner")
+        self.env["dashboard.chart"].create(
+            [
+                {
+                    "name": "Export Chart %s" % index,
+                    "dashboard_id": dashboard.id,
+                    "chart_type": "bar_chart",
+                    "data_type": "sum",
+                    "model_id": partner_model.id,
+                    "group_by_id": self._field("country_id").id,
+                    "sort_field_id": self._field("name").id,
+                    "measurement_field_ids": [(6, 0, self._field("color").ids)],
+                    "kpi_model_id": partner_model.id,
+                    "kpi_measurement_field_id": self._field("color").id,
+                }
+                for index in range(chart_count)
+            ]
+        )
+        return dashboard
+
+    def _count_import_queries(self, payload):
+        imported = self.env["dashboard.dashboard"].create({"name": "Import Dashboard"})
+        self.env.flush_all()
+        query_count = self.env.cr.sql_log_count
+        self.assertEqual(
+            imported.dashboard_import_json({"json_payload": payload}),
+            {"type": "success"},
+        )
+        self.env.flush_all()
+        return self.env.cr.sql_log_count - query_count
+
+    def test_import_exported_dashboard(self):
+        dashboard = self._export_dashboard(10)
+        payload = dashboard.dashboard_export_json()
+
+        imported = self.env["dashboard.dashboard"].create({"name": "Import Dashboard"})
+        self.assertEqual(
+            imported.dashboard_import_json({"json_payload": payload}),
+            {"type": "success"},
+        )
+        self.assertEqual(
+            imported.chart_ids.mapped("name"), dashboard.chart_ids.mapped("name")
+        )
+        for chart in imported.chart_ids:
+            self.assertEqual(chart.group_by_id, self._field("country_id"))
+            self.assertEqual(chart.sort_field_id, self._field("name"))
+            self.assertEqual(chart.measurement_field_ids, self._field("color"))
+            self.assertEqual(chart.kpi_measurement_field_id, self._field("color"))
+
+        payload[0]["group_by_id"] = "bi_unknown_field"
+        result = imported.dashboard_import_json({"json_payload": payload})
+        self.assertEqual(result["type"], "error")
+        self.assertIn("bi_unknown_field", result["message"])
+
+    def test_import_query_count(self):
+        payloads = [
+            self._export_dashboard(chart_count).dashboard_export_json()
+            for chart_count in [2, 2, 20]
+        ]
+        # The first import fills the caches of the ORM
+        self._count_import_queries(payloads[0])
+        self.assertEqual(
+            self._count_import_queries(payloads[1]),
+            self._count_import_queries(payloads[2]),
+        )
@@ -0,0 +1,184 @@
+import threading
+from unittest.mock import patch
+
+from odoo.tests.common import TransactionCase, tagged
+
+
+@tagged("post_install", "-at_install", "synconics_bi_dashboard")
+class TestDashboardLoading(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.dashboard = cls.env["dashboard.dashboard"].create(
+            {"name": "Loading Dashboard", "cache_ttl": 0}
+        )
+        cls.env["res.partner"].create({"name": "Loading Partner", "ref": "bi-loading"})
+        partner_model = cls.env["ir.model"]._get("res.partner")
+        cls.tile = cls.env["dashboard.chart"].create(
+            {
+                "name": "Loading Tile",
+                "dashboard_id": cls.dashboard.id,
+                "chart_type": "tile",
+                "data_type": "count",
+                "model_id": partner_model.id,
+                "domain": "[('ref', '=', 'bi-loading')]",
+                "limit_record": 0,
+            }
+        )
+        cls.restricted_tile = cls.env["dashboard.chart"].create(
+            {
+                "name": "Restricted Tile",
+                "dashboard_id": cls.dashboard.id,
+                "chart_type": "tile",
+                "data_type": "count",
+                "model_id": partner_model.id,
+                "limit_record": 0,
+                "group_ids": [(6, 0, cls.env.ref("base.group_no_one").ids)],
+            }
+        )
+
+    def test_layout_then_chart_data(self):
+        details = self.dashboard.get_charts_details()
+        layout = self.dashboard.get_charts_layout()
+        self.assertEqual(
+            [chart["id"] for chart in layout[1]],
+            [chart["id"] for chart in details[1]],
+        )
+        self.assertFalse(any("recordset" in chart for chart in layout[1]))
+
+        charts_data = self.dashboard.get_charts_data([str(self.tile.id)])
+        self.assertEqual(list(charts_data), [str(self.tile.id)])
+        self.assertEqual(charts_data[str(self.tile.id)]["calculated_count"], 1)
+        self.assertEqual(
+            charts_data[str(self.tile.id)],
+            next(c["recordset"] for c in details[1] if c["id"] == str(self.tile.id)),
+        )
+
+    def test_chart_data_access(self):
+        self.env.user.groups_id -= self.env.ref("base.group_no_one")
+        self.assertFalse(self.dashboard.get_charts_data([str(self.restricted_tile.id)]))
+
+    def test_user_charts_access_cache(self):
+        charts = self.dashboard._get_user_charts()
+        with self.assertQueryCount(0):
+            self.assertEqual(self.dashboard._get_user_charts(), charts)
+        # Group changes clear the cached access
+        self.env.user.groups_id -= self.env.ref("base.group_no_one")
+        self.assertEqual(
+            self.dashboard._get_user_charts(), charts - self.restricted_tile
+        )
+
+    def test_shared_queries(self):
+        second_tile = self.tile.copy({"name": "Loading Tile Copy"})
+        self.assertEqual(
+            second_tile._get_shared_query_key(), self.tile._get_shared_query_key()
+        )
+        self.assertNotEqual(
+            self.restricted_tile._get_shared_query_key(),
+            self.tile._get_shared_query_key(),
+        )
+        charts = self.tile | second_tile
+        expected = {
+            chart.id: chart.get_chart_data(chart.chart_type, chart.name)
+            for chart in charts
+        }
+        partner_class = type(self.env["res.partner"])
+        with patch.object(
+            partner_class,
+            "_read_group",
+            autospec=True,
+            side_effect=partner_class._read_group,
+        ) as read_group:
+            self.assertEqual(self.dashboard._get_charts_data(charts), expected)
+        # Both tiles count the same records with one grouped query
+        self.assertEqual(read_group.call_count, 1)
+
+    def _get_charts_data_in_threads(self, charts, get_chart_data):
+        """
+        Load the charts from the pool of threads, as outside of tests
+        """
+        with patch.object(
+            self.registry, "in_test_mode", return_value=False
+        ), patch.object(
+            type(self.tile),
+            "get_chart_data",
+            autospec=True,
+            side_effect=get_chart_data,
+        ):
+            return self.dashboard._get_charts_data(charts)
+
+    def test_chart_error(self):
+        # Computed together with the failing chart
+        second_tile = self.tile.copy({"name": "Loading Tile Copy"})
+        get_chart_data = type(self.tile).get_chart_data
+
+        def failing_chart_data(chart, chart_type, name):
+            if chart.id == second_tile.id:
+                chart.env.cr.execute("SELECT 1 / 0")
+            return get_chart_data(chart, chart_type, name)
+
+        with self.assertLogs(
+            "odoo.addons.synconics_bi_dashboard.models.dashboard", "ERROR"
+        ):
+            charts_data = self._get_charts_data_in_threads(
+                second_tile | self.tile | self.restricted_tile, failing_chart_data
+            )
+        self.assertEqual(charts_data[self.tile.id]["calculated_count"], 1)
+        self.assertEqual(
+            charts_data[second_tile.id],
+            {"type": "error", "message": "This chart could not be loaded!"},
+        )
+        self.assertIn(self.restricted_tile.id, charts_data)
+
+    def test_chart_timeout(self):
+        self.dashboard.chart_timeout = 1
+        second_tile = self.tile.copy({"name": "Loading Tile Copy"})
+        third_tile = self.tile.copy({"name": "Loading Tile Last"})
+        get_chart_data = type(self.tile).get_chart_data
+        release = threading.Event()
+
+        def slow_chart_data(chart, chart_type, name):
+            if chart.id == second_tile.id:
+                release.wait(10)
+                return {}
+            return get_chart_data(chart, chart_type, name)
+
+        try:
+            charts_data = self._get_charts_data_in_threads(
+                self.tile | second_tile | third_tile, slow_chart_data
+            )
+        finally:
+            release.set()
+            for thread in threading.enumerate():
+                if thread.name.startswith("dashboard_chart"):
+                    thread.join()
+        # The tiles are computed together, the one computed before the slow
+        # one is kept and the next one is abandoned
+        error = {"type": "error", "message": "This chart took too long to load!"}
+        self.assertEqual(charts_data[self.tile.id]["calculated_count"], 1)
+        self.assertEqual(charts_data[second_tile.id], error)
+        self.assertEqual(charts_data[third_tile.id], error)
+
+    def test_user_charts_model_access(self):
+        parameter_tile = self.env["dashboard.chart"].create(
+            {
+                "name": "Parameter Tile",
+                "dashboard_id": self.dashboard.id,
+                "chart_type": "tile",
+                "data_type": "count",
+                "model_id": self.env["ir.model"]._get("ir.config_parameter").id,
+                "limit_record": 0,
+            }
+        )
+        user = self.env["res.users"].create(
+            {
+                "name": "Dashboard User",
+                "login": "bi-dashboard-user",
+                "groups_id": [(6, 0, self.env.ref("base.group_user").ids)],
+            }
+        )
+        # Only the settings group reads the system parameters
+        self.assertNotIn(
+            parameter_tile, self.dashboard.with_user(user)._get_user_charts()
+        )
+        self.assertIn(parameter_tile, self.dashboard._get_user_charts())
@@ -0,0 +1,83 @@
+from unittest.mock import patch
+
+from odoo.tests.common import TransactionCase, tagged
+
+from ..models import dashboard_chart
+from ..models.chart_cache import LRUCache
+
+
+@tagged("post_install", "-at_install", "synconics_bi_dashboard")
+class TestDashboardMail(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.dashboard = cls.env["dashboard.dashboard"].create(
+            {"name": "Mail Dashboard", "cache_ttl": 0}
+        )
+        cls.charts = cls.env["dashboard.chart"].create(
+            [
+                {
+                    "name": name,
+                    "dashboard_id": cls.dashboard.id,
+                    "chart_type": "tile",
+                    "data_type": "count",
+                    "model_id": cls.env["ir.model"]._get("res.partner").id,
+                    "limit_record": 0,
+                }
+                for name in ["Mail Tile", "Other Mail Tile"]
+            ]
+        )
+        cls.recipients = cls.env["res.partner"].create(
+            [
+                {"name": "Mail Recipient", "email": "recipient@example.com"},
+                {"name": "Other Mail Recipient", "email": "other@example.com"},
+            ]
+        )
+        cls.mails = cls.env["dashboard.mail"].create(
+            [
+                {
+                    "name": "Both Charts",
+                    "dashboard_id": cls.dashboard.id,
+                    "chart_ids": [(6, 0, cls.charts.ids)],
+                    "recipient_ids": [(6, 0, cls.recipients.ids)],
+                    "is_automated": True,
+                },
+                {
+                    "name": "One Chart",
+                    "dashboard_id": cls.dashboard.id,
+                    "chart_ids": [(6, 0, cls.charts[0].ids)],
+                    "recipient_ids": [(6, 0, cls.recipients[0].ids)],
+                    "is_automated": True,
+                },
+            ]
+        )
+
+    def test_scheduled_mails(self):
+        Chart = type(self.env["dashboard.chart"])
+        with patch.object(
+            dashboard_chart, "rendered_image_cache", LRUCache(max_size=128)
+        ), patch.object(
+            Chart,
+            "_get_image_html",
+            autospec=True,
+            side_effect=lambda chart: "<p>%s</p>" % chart.name,
+        ) as get_image_html, patch.object(
+            dashboard_chart.imgkit,
+            "from_string",
+            side_effect=lambda html, output_path, options=None: html.encode(),
+        ):
+            self.env["dashboard.dashboard"].scheduled_send_email(self.dashboard.id)
+        # Charts shared by the mails are rendered once
+        self.assertEqual(get_image_html.call_count, 2)
+
+        mails = self.env["mail.mail"].search(
+            [("model", "=", "dashboard.dashboard"), ("res_id", "=", self.dashboard.id)]
+        )
+        self.assertEqual(len(mails), 2)
+        self.assertEqual(set(mails.mapped("state")), {"outgoing"})
+        for dashboard_mail, image_count in zip(self.mails, [2, 1]):
+            mail = mails.filtered(
+                lambda m, dm=dashboard_mail: m.recipient_ids == dm.recipient_ids
+            )
+            self.assertEqual(len(mail), 1)
+            self.assertEqual(mail.mail_message_id.body.count("<img"), image_count)
@@ -0,0 +1,18 @@
+from odoo.tests.common import TransactionCase, tagged
+
+
+@tagged("post_install", "-at_install", "synconics_bi_dashboard")
+class TestUserModelAccess(TransactionCase):
+    def test_batch_model_access(self):
+        global_access = self.env["ir.model.access"].search([("group_id", "=", False)])
+        users = self.env["res.users"].create(
+            [
+                {"name": "Access User %s" % index, "login": "bi-access-%s" % index}
+                for index in range(5)
+            ]
+        )
+        for user in users:
+            self.assertEqual(user.model_access, global_access)
+
+        users[0].groups_id |= self.env.ref("base.group_no_one")
+        self.assertEqual(users[0].model_access, global_access)
@@ -1,5 +1,4 @@
 from odoo import models, fields, api
-from markupsafe import Markup
 
 
 class MailComposeMessage(models.TransientModel):
@@ -69,26 +68,13 @@ class MailComposeMessage(models.TransientModel):
         charts = charts._origin.filtered(
             lambda cid: cid._origin.id not in chart_id_list
         )
-        for chart in charts:
-            chart_dict = {}
-            if chart.chart_type == "to_do" and chart.todo_layout != "activity":
-                continue
-            if chart.chart_type in ["kpi", "tile", "to_do", "list"]:
-                image = chart.html_to_image()
-                chart_dict = {"chart_id": chart.id, "name": chart.name, "image": image}
-            else:
-                chart_data = chart.get_chart_data(chart.chart_type, chart.name)
-                chart_dict = {
-                    "chart_id": chart.id,
-                    "chart_type": chart.chart_type,
-                    "name": chart.name,
-                }
-                if "default_icon" in chart_data and chart_data.get("default_icon"):
-                    chart_data.update(
-                        {"kpi_icon": Markup(chart_data.get("default_icon"))}
-                    )
-                chart_dict.update(chart_data)
-            items.append(chart_dict)
+        charts = charts.filtered(
+            lambda cid: not (
+                cid.chart_type == "to_do" and cid.todo_layout != "activity"
+            )
+        )
+        chart_items = self.env["dashboard.dashboard"]._get_mail_chart_items(charts)
+        items.extend(chart_items[chart.id] for chart in charts)
         context.update({"data": items})
         self.env.context = context
 
@@ -108,25 +94,12 @@ class MailComposeMessage(models.TransientModel):
                 chart_dict.update(value)
                 items.append(chart_dict)
         charts = charts.filtered(lambda cid: cid._origin.id not in chart_id_list)
-        for chart in charts:
-            chart_dict = {}
-            if chart.chart_type == "to_do" and chart.todo_layout != "activity":
-                continue
-            if chart.chart_type in ["kpi", "tile", "to_do", "list"]:
-                image = chart.html_to_image()
-                chart_dict = {"chart_id": chart.id, "name": chart.name, "image": image}
-            else:
-                chart_data = chart.get_chart_data(chart.chart_type, chart.name)
-                chart_dict = {
-                    "chart_id": chart.id,
-                    "chart_type": chart.chart_type,
-                    "name": chart.name,
-                }
-                if "default_icon" in chart_data and chart_data.get("default_icon"):
-                    chart_data.update(
-                        {"kpi_icon": Markup(chart_data.get("default_icon"))}
-                    )
-                chart_dict.update(chart_data)
-            items.append(chart_dict)
+        charts = charts.filtered(
+            lambda cid: not (
+                cid.chart_type == "to_do" and cid.todo_layout != "activity"
+            )
+        )
+        chart_items = self.env["dashboard.dashboard"]._get_mail_chart_items(charts)
+        items.extend(chart_items[chart.id] for chart in charts)
         context.update({"data": items})
         self.env.context = context